@@ -1,164 +1,137 @@
 #!/usr/bin/env python3
-"""Audit all skills for quality, identifying boilerplate and low-effort content."""
+"""Audit all skills for quality, identifying boilerplate and low-effort content.
 
-import os
-import re
-import sys
-import yaml
+Metrics are gathered in one pass per SKILL.md body (see skilllib/audit.py) into
+a column-oriented table. Use --csv to export every metric for trend tracking.
 
-SKILLS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "skills"))
+Metrics can also be recorded per commit into an append-only SQLite store
+(.cache/audit-trends.sqlite by default) and compared between commits.
 
-BOILERPLATE_PHRASES = [
-    "use appropriate",
-    "configure as needed",
-    "follow best practices",
-    "leverage built-in",
-    "extend as needed",
-    "use conventions",
-    "keep tests focused",
-    "use health checks",
-    "implement circuit breakers",
-    "configure timeout policies",
-    "add custom middleware",
-    "monitor proxy metrics",
-    "monitor metrics",
-    "choose appropriate",
-    "as needed",
-]
-
-
-def analyze_skill(skill_dir):
-    path = os.path.join(skill_dir, "SKILL.md")
-    with open(path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    m = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)", content, re.DOTALL)
-    if not m:
-        return None
-
-    fm_text, body = m.group(1), m.group(2)
-    try:
-        fm = yaml.safe_load(fm_text) or {}
-    except yaml.YAMLError:
-        fm = {}
-
-    body_len = len(body)
-    code_blocks = len(re.findall(r"```\w+", body))
-    tables = len(re.findall(r"\|.*\|.*\|", body))
-    sections = len(re.findall(r"^## ", body, re.MULTILINE))
-
-    # Count generic/boilerplate phrases
-    body_lower = body.lower()
-    generic = 0
-    generic_found = []
-    for phrase in BOILERPLATE_PHRASES:
-        count = body_lower.count(phrase)
-        if count:
-            generic += count
-            generic_found.append(phrase)
-
-    # Best practices items
-    bp_match = re.search(r"## Best Practices\s*\n(.*?)(?=\n## |\Z)", body, re.DOTALL)
-    bp_items = 0
-    bp_text = ""
-    if bp_match:
-        bp_text = bp_match.group(1)
-        bp_items = len(re.findall(r"^- ", bp_text, re.MULTILINE))
-
-    # Check BP quality: are they specific or generic?
-    bp_generic = 0
-    if bp_text:
-        for phrase in BOILERPLATE_PHRASES:
-            bp_generic += bp_text.lower().count(phrase)
-
-    # Quality score
-    score = code_blocks * 3 + tables * 2 + sections * 2 + bp_items - generic * 2
-    if body_len < 500:
-        score -= 20
-    elif body_len < 1000:
-        score -= 10
-    elif body_len < 2000:
-        score -= 5
-
-    # Specific checks for truly thin skills
-    has_overview = bool(re.search(r"^## Overview", body, re.MULTILINE))
-    has_example = bool(re.search(r"^## Example", body, re.MULTILINE))
-
-    # Check if Best Practices are just "Use X", "Configure Y", "Monitor Z" one-liners
-    thin_bp = 0
-    if bp_text:
-        for line in bp_text.splitlines():
-            stripped = line.strip()
-            if stripped.startswith("- ") and len(stripped) < 40:
-                thin_bp += 1
-
-    rel = os.path.relpath(skill_dir, SKILLS_ROOT).replace("\\", "/")
-
-    return {
-        "path": rel,
-        "body_len": body_len,
-        "code_blocks": code_blocks,
-        "tables": tables,
-        "sections": sections,
-        "bp_items": bp_items,
-        "generic": generic,
-        "generic_found": generic_found,
-        "bp_generic": bp_generic,
-        "thin_bp": thin_bp,
-        "score": score,
-        "has_overview": has_overview,
-        "has_example": has_example,
-    }
+Usage:
+    python scripts/audit-quality.py
+    python scripts/audit-quality.py --csv audit.csv     # report + CSV export
+    python scripts/audit-quality.py --csv -             # CSV only, to stdout
+    python scripts/audit-quality.py --record HEAD~5     # store metrics for a commit
+    python scripts/audit-quality.py --compare HEAD~5 HEAD
+    python scripts/audit-quality.py --profile 10 --trace audit-trace.json
+"""
 
+import argparse
+import os
+import sys
+import time
 
-def main():
-    skill_dirs = []
-    for root, dirs, files in os.walk(SKILLS_ROOT):
-        if "SKILL.md" in files:
-            skill_dirs.append(root)
-    skill_dirs.sort()
+from skilllib import profile, save_cache
+from skilllib.audit import MetricTable, audit_skills
+from skilllib.changes import GitError, resolve_commit
+from skilllib.index import discover_skill_dirs
+from skilllib.trends import TrendStore
 
-    results = []
-    for sd in skill_dirs:
-        r = analyze_skill(sd)
-        if r:
-            results.append(r)
+SKILLS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "skills"))
 
-    results.sort(key=lambda x: x["score"])
 
+def print_report(results: MetricTable) -> None:
     print(f"Total skills analyzed: {len(results)}")
 
+    body_len, bp_items, thin_bp = results["body_len"], results["bp_items"], results["thin_bp"]
+
     print(f"\nBOTTOM 60 (lowest quality scores):")
     print(f"{'Path':<60} {'Len':>5} {'Code':>4} {'Tbl':>4} {'Sec':>4} {'BP':>3} {'Gen':>3} {'TBP':>3} {'Score':>5}")
     print("-" * 100)
-    for r in results[:60]:
+    for i in range(min(60, len(results))):
+        r = results.row(i)
         print(f"{r['path']:<60} {r['body_len']:>5} {r['code_blocks']:>4} {r['tables']:>4} {r['sections']:>4} {r['bp_items']:>3} {r['generic']:>3} {r['thin_bp']:>3} {r['score']:>5}")
 
     print(f"\nScore distribution:")
-    brackets = [
-        (float("-inf"), 0, "CRITICAL (<0)"),
-        (0, 10, "LOW (0-9)"),
-        (10, 25, "MEDIUM (10-24)"),
-        (25, 50, "GOOD (25-49)"),
-        (50, float("inf"), "EXCELLENT (50+)"),
-    ]
-    for lo, hi, label in brackets:
-        count = sum(1 for r in results if lo <= r["score"] < hi)
+    for label, count in results.bracket_counts("score"):
         print(f"  {label}: {count}")
 
     # Skills with very thin best practices (all items < 40 chars)
-    thin = [r for r in results if r["thin_bp"] >= 3 and r["bp_items"] > 0 and r["thin_bp"] / r["bp_items"] > 0.5]
-    if thin:
+    thin = results.where(t >= 3 and n > 0 and t / n > 0.5 for t, n in zip(thin_bp, bp_items))
+    if len(thin):
         print(f"\nSkills with THIN best practices (>50% one-liners under 40 chars): {len(thin)}")
-        for r in thin:
-            print(f"  {r['path']} ({r['thin_bp']}/{r['bp_items']} thin)")
+        for p, t, n in zip(thin["path"], thin["thin_bp"], thin["bp_items"]):
+            print(f"  {p} ({t}/{n} thin)")
 
     # Skills with body < 1000 chars
-    short = [r for r in results if r["body_len"] < 1000]
-    if short:
+    short = results.where(n < 1000 for n in body_len)
+    if len(short):
         print(f"\nSkills with VERY SHORT body (<1000 chars): {len(short)}")
-        for r in short:
-            print(f"  {r['path']} ({r['body_len']} chars, {r['code_blocks']} code blocks)")
+        for p, n, c in zip(short["path"], short["body_len"], short["code_blocks"]):
+            print(f"  {p} ({n} chars, {c} code blocks)")
+
+
+def record_commits(store: TrendStore, refs: list[str]) -> None:
+    for ref in refs:
+        started = time.perf_counter()
+        commit, skills, measured = store.record(ref)
+        elapsed = time.perf_counter() - started
+        print(f"Recorded {commit[:12]} ({ref}): {skills} skills, "
+              f"{measured} new SKILL.md versions measured in {elapsed:.2f}s")
+
+
+def print_deltas(store: TrendStore, old_ref: str, new_ref: str) -> None:
+    old, new = resolve_commit(old_ref), resolve_commit(new_ref)
+    for ref, commit in ((old_ref, old), (new_ref, new)):
+        if not store.has_commit(commit):
+            raise GitError(f"{ref} ({commit[:12]}) is not recorded; run --record {ref}")
+    changes = store.deltas(old, new)
+    added = sum(1 for _, a, _ in changes if a is None)
+    removed = sum(1 for _, _, b in changes if b is None)
+    print(f"Score changes {old[:12]} -> {new[:12]}: {len(changes) - added - removed} changed, "
+          f"{added} added, {removed} removed")
+    if not changes:
+        return
+    # Regressions first, then improvements; additions and removals last.
+    changes.sort(key=lambda c: (c[1] is None or c[2] is None, (c[2] or 0) - (c[1] or 0), c[0]))
+    print(f"{'Path':<60} {'Old':>5} {'New':>5} {'Delta':>6}")
+    print("-" * 79)
+    for path, a, b in changes:
+        delta = f"{b - a:+d}" if a is not None and b is not None else ("new" if a is None else "gone")
+        print(f"{path:<60} {'-' if a is None else a:>5} {'-' if b is None else b:>5} {delta:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit skills for low-effort content.")
+    parser.add_argument("--csv", metavar="PATH",
+                        help="also export all metrics as CSV ('-' writes only the CSV to stdout)")
+    parser.add_argument("--record", metavar="REV", nargs="*",
+                        help="record metrics for commits (default: HEAD) in the trend store")
+    parser.add_argument("--compare", metavar=("OLD", "NEW"), nargs=2,
+                        help="show score changes between two recorded commits")
+    parser.add_argument("--db", metavar="PATH",
+                        help="trend store location (default: .cache/audit-trends.sqlite)")
+    profile.add_arguments(parser)
+    args = parser.parse_args()
+    profile.configure(args)
+
+    if args.record is not None or args.compare:
+        try:
+            with TrendStore(args.db) as store:
+                if args.record is not None:
+                    record_commits(store, args.record or ["HEAD"])
+                if args.compare:
+                    print_deltas(store, *args.compare)
+        except GitError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    with profile.span("discovery"):
+        skill_dirs = discover_skill_dirs(SKILLS_ROOT)
+    results = audit_skills(skill_dirs, SKILLS_ROOT).sort_by("score")
+    with profile.span("save"):
+        save_cache()
+
+    with profile.span("report"):
+        if args.csv == "-":
+            results.to_csv(sys.stdout)
+        else:
+            print_report(results)
+            if args.csv:
+                with open(args.csv, "w", encoding="utf-8", newline="") as f:
+                    results.to_csv(f)
+    profile.finish(args)
 
 
 if __name__ == "__main__":
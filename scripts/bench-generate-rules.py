@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark generate-rules.py serial vs. parallel (--jobs) wall time.
+
+Copies scripts/ and the real skills/ tree into a temporary directory, then runs
+generate-rules.py there for each --jobs value so the checkout is never touched.
+Each run's console output and the resulting rules/ files are compared against
+the serial run to confirm the parallel path is byte-identical.
+
+Usage:
+    python scripts/bench-generate-rules.py [--jobs 1,2,4] [--repeat 3] [--warm-cache]
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def tree_digest(root: str) -> str:
+    """Hash every rules/ file under root (path + bytes) in sorted order."""
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if os.path.basename(dirpath) != "rules":
+            continue
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            digest.update(os.path.relpath(path, root).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def run_once(workdir: str, jobs: int, env: dict) -> tuple[float, bytes]:
+    script = os.path.join(workdir, "scripts", "generate-rules.py")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, script, "--jobs", str(jobs)],
+        env=env, stdout=subprocess.PIPE, check=True,
+    )
+    return time.perf_counter() - start, proc.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    cpus = os.cpu_count() or 1
+    default_jobs = sorted({1, 2, 4, cpus})
+    parser.add_argument("--jobs", default=",".join(str(j) for j in default_jobs),
+                        help="comma-separated --jobs values to compare")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per --jobs value")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="keep the SKILL.md parse cache between runs")
+    args = parser.parse_args()
+    job_values = [int(j) for j in args.jobs.split(",") if j.strip()]
+    if 1 not in job_values:
+        job_values.insert(0, 1)
+
+    with tempfile.TemporaryDirectory(prefix="bench-rules-") as workdir:
+        shutil.copytree(os.path.join(REPO_ROOT, "scripts"), os.path.join(workdir, "scripts"),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        shutil.copytree(os.path.join(REPO_ROOT, "skills"), os.path.join(workdir, "skills"))
+
+        env = dict(os.environ)
+        env["SKILLS_CACHE_DIR"] = os.path.join(workdir, ".cache")
+        if not args.warm_cache:
+            env["SKILLS_NO_CACHE"] = "1"
+
+        skills_root = os.path.join(workdir, "skills")
+        baseline_out = None
+        baseline_tree = None
+        rows = []
+        for jobs in job_values:
+            times = []
+            for _ in range(args.repeat):
+                elapsed, out = run_once(workdir, jobs, env)
+                times.append(elapsed)
+            tree = tree_digest(skills_root)
+            if baseline_out is None:
+                baseline_out, baseline_tree = out, tree
+            identical = out == baseline_out and tree == baseline_tree
+            rows.append((jobs, min(times), statistics.median(times), identical))
+
+    serial_median = rows[0][2]
+    print(f"generate-rules.py on {os.path.join(REPO_ROOT, 'skills')} "
+          f"({args.repeat} runs each, {'warm' if args.warm_cache else 'cold'} parse cache, "
+          f"{cpus} CPUs)")
+    print(f"{'Jobs':>4} {'Min (s)':>8} {'Median (s)':>10} {'Speedup':>8}  Identical")
+    for jobs, best, median, identical in rows:
+        print(f"{jobs:>4} {best:>8.3f} {median:>10.3f} {serial_median / median:>7.2f}x  "
+              f"{'yes' if identical else 'NO'}")
+
+    if not all(row[3] for row in rows):
+        print("ERROR: parallel output differs from the serial run", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Microbenchmark the impact classifier over every best-practice bullet.
+
+Compares the compiled single-scan classifier (skilllib.impact) against the
+previous per-keyword substring loop, and lists bullets whose classification
+changed because a keyword only matched inside another word. --scale pads the
+keyword tables with synthetic non-matching words to show how each approach
+grows with table size (the substring loop is O(keywords) per bullet).
+
+Usage:
+    python scripts/bench-impact.py [--repeat 20] [--scale 1,10,50] [--show-changes]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+from skilllib import load_skill, save_cache
+from skilllib.impact import DEFAULT_TABLES, ImpactClassifier
+
+
+SKILLS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "skills"))
+
+
+def substring_classifier(tables):
+    """The original O(bullets x keywords) substring classifier."""
+    def classify(text: str) -> str:
+        text_lower = text.lower()
+        for level, keywords in tables:
+            for kw in keywords:
+                if kw in text_lower:
+                    return level
+        return "MEDIUM"
+    return classify
+
+
+def scaled_tables(factor: int, seed: int = 0):
+    """Pad each table to ``factor`` times its size with random 8-letter words."""
+    rng = random.Random(seed)
+    tables = []
+    for level, keywords in DEFAULT_TABLES:
+        padding = ["".join(rng.choices(string.ascii_lowercase, k=8))
+                   for _ in range(len(keywords) * (factor - 1))]
+        tables.append((level, list(keywords) + padding))
+    return tuple(tables)
+
+
+def collect_bullets() -> list:
+    bullets = []
+    for root, dirs, files in os.walk(SKILLS_ROOT):
+        dirs.sort()
+        if "SKILL.md" in files:
+            rel = os.path.relpath(root, SKILLS_ROOT).replace("\\", "/")
+            for bullet in load_skill(os.path.join(root, "SKILL.md")).bp_bullets:
+                bullets.append((rel, bullet))
+    save_cache()
+    return bullets
+
+
+def best_of(fn, bullets, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, bullet in bullets:
+            fn(bullet)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timing repetitions (best is reported)")
+    parser.add_argument("--scale", default="1,10,50",
+                        help="comma-separated keyword-table size multipliers")
+    parser.add_argument("--show-changes", action="store_true",
+                        help="list bullets classified differently by the two classifiers")
+    args = parser.parse_args()
+
+    bullets = collect_bullets()
+    if not bullets:
+        print("No best-practice bullets found", file=sys.stderr)
+        sys.exit(1)
+
+    n = len(bullets)
+    print(f"Bullets: {n}")
+    print(f"{'Scale':>5} {'Keywords':>8} {'Compile ms':>10} {'Substring ms':>12} "
+          f"{'Compiled ms':>11} {'Speedup':>8}")
+    for factor in [int(f) for f in args.scale.split(",") if f.strip()]:
+        tables = scaled_tables(factor)
+        keywords = sum(len(kws) for _, kws in tables)
+        build_start = time.perf_counter()
+        classifier = ImpactClassifier(tables)
+        build_time = time.perf_counter() - build_start
+        legacy = best_of(substring_classifier(tables), bullets, args.repeat)
+        compiled = best_of(classifier.classify, bullets, args.repeat)
+        print(f"{factor:>5} {keywords:>8} {build_time * 1e3:>10.2f} {legacy * 1e3:>12.2f} "
+              f"{compiled * 1e3:>11.2f} {legacy / compiled:>7.2f}x")
+
+    substring = substring_classifier(DEFAULT_TABLES)
+    classifier = ImpactClassifier()
+    changes = []
+    for rel, bullet in bullets:
+        old = substring(bullet)
+        new = classifier.classify(bullet)
+        if old != new.level:
+            changes.append((rel, old, new, bullet))
+
+    print(f"Reclassified by word-boundary matching: {len(changes)}")
+    if args.show_changes:
+        for rel, old, new, bullet in changes:
+            print(f"  {rel}: {old} -> {new.level} ({new.keyword or 'no keyword'}): {bullet[:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""Benchmark the scripts pipeline end to end on synthetic skill trees.
+
+For each requested size, generates a synthetic skills/ tree (configurable
+depth, body size and Best Practices bullets) in a temporary directory next to
+a copy of scripts/, then runs generate-skill-files.py, generate-rules.py,
+validate-skills.py, audit-quality.py, dedup-skills.py and check-consistency.py
+there in order, each in a fresh process with a cold parse cache. Every run is
+split into phases by timing the shared skilllib entry points it calls:
+
+  discovery : finding skill directories (discover_skill_dirs)
+  parsing   : SKILL.md parse-cache lookups (SkillParseCache.get/frontmatter)
+  writes    : generated files and caches (OutputBatch.commit, *.save)
+  analysis  : everything else (checks, metrics, rendering, reporting)
+
+Phases are exclusive: time spent parsing inside analysis counts as parsing.
+The first repeat writes every generated file; later repeats measure the
+unchanged-output path, and the median of all repeats is reported.
+
+Results can be saved as a baseline and compared against later runs; any phase
+slower than the baseline by more than --threshold (and by at least
+--min-delta seconds, to ignore noise in tiny phases) is a regression and makes
+the command exit 1.
+
+Usage:
+    python scripts/bench-pipeline.py [--sizes 1k,10k,50k] [--depth 3] [--body-size 4000]
+                                     [--bullets 8] [--repeat 1] [--json]
+                                     [--output results.json]
+                                     [--save-baseline FILE] [--baseline FILE]
+                                     [--threshold 0.25]
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_VERSION = 1
+
+# Pipeline order, as `npm test` and the generators would run on a fresh tree.
+PIPELINE = (
+    ("generate-skill-files", "generate-skill-files.py", ["--check-parse-once"]),
+    ("generate-rules", "generate-rules.py", []),
+    ("validate-skills", "validate-skills.py", []),
+    ("audit-quality", "audit-quality.py", []),
+    ("dedup-skills", "dedup-skills.py", []),
+    ("check-consistency", "check-consistency.py", []),
+)
+PHASES = ("discovery", "parsing", "analysis", "writes")
+
+WORDS = (
+    "agent api async batch build cache client config context data deploy error event "
+    "handler index input latency logging model module network output pipeline policy "
+    "query queue request resource retry schema service session storage stream task "
+    "test token trace type update validate version worker workflow"
+).split()
+BOLD_LABELS = ("Prefer", "Avoid", "Always", "Never", "Use", "Validate", "Cache", "Pin")
+
+
+# --- synthetic trees --------------------------------------------------------
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    if text.endswith("k"):
+        return int(float(text[:-1]) * 1000)
+    return int(text)
+
+
+def tree_paths(count: int, depth: int) -> list[str]:
+    """Relative skill paths for a breadth-first tree of ``count`` skills at most
+    ``depth`` levels deep, with an even fan-out."""
+    fanout = max(2, math.ceil(count ** (1 / max(1, depth))))
+    paths = []
+    level = [""]
+    for d in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(fanout):
+                if len(paths) == count:
+                    return paths
+                name = f"s{d}-{len(paths):05d}"
+                path = f"{parent}/{name}" if parent else name
+                paths.append(path)
+                next_level.append(path)
+        level = next_level
+    return paths
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def skill_md(rng: random.Random, name: str, body_size: int, bullets: int) -> str:
+    keywords = rng.sample(WORDS, 3)
+    lines = [
+        "---",
+        f"name: {name}",
+        "description: |",
+        f"  {sentence(rng, 12)}",
+        f"  USE FOR: {', '.join(keywords)}",
+        "  DO NOT USE FOR: unrelated work",
+        "license: MIT",
+        "metadata:",
+        f"  displayName: {name.replace('-', ' ').title()}",
+        "  author: bench",
+        f"  tags: [{', '.join(rng.sample(WORDS, 2))}]",
+        "---",
+        "",
+        f"# {name}",
+        "",
+        "## Overview",
+        "",
+        sentence(rng, 30),
+        "",
+        "## Example",
+        "",
+        "```python",
+        f"def {keywords[0]}_{keywords[1]}():",
+        f"    return {keywords[2]!r}",
+        "```",
+        "",
+        "| Option | Purpose |",
+        "|--------|---------|",
+        f"| `{keywords[0]}` | {sentence(rng, 6)} |",
+        "",
+        "## Details",
+        "",
+    ]
+    size = sum(len(line) + 1 for line in lines)
+    while size < body_size:
+        paragraph = " ".join(sentence(rng, rng.randint(8, 20)) for _ in range(4))
+        lines.extend([paragraph, ""])
+        size += len(paragraph) + 1
+    lines.extend(["## Best Practices", ""])
+    for i in range(bullets):
+        if i % 2:
+            lines.append(f"- **{rng.choice(BOLD_LABELS)} {rng.choice(WORDS)} {i}**: "
+                         f"{sentence(rng, rng.randint(6, 24)).lower()}")
+        else:
+            lines.append(f"- {sentence(rng, rng.randint(6, 24))}")
+    lines.extend(["", "## References", "",
+                  f"- [{keywords[0]} docs](https://example.com/{name})", ""])
+    return "\n".join(lines)
+
+
+def generate_tree(skills_root: str, count: int, depth: int, body_size: int,
+                  bullets: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for rel in tree_paths(count, depth):
+        skill_dir = os.path.join(skills_root, rel)
+        os.makedirs(skill_dir, exist_ok=True)
+        with open(os.path.join(skill_dir, "SKILL.md"), "w", encoding="utf-8", newline="\n") as f:
+            f.write(skill_md(rng, os.path.basename(rel), body_size, bullets))
+
+
+# --- phase driver (runs inside the copied scripts/ directory) ---------------
+
+class PhaseClock:
+    """Exclusive wall time per phase: a nested phase pauses its caller's."""
+
+    def __init__(self):
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.stack = []
+        self.mark = time.perf_counter()
+
+    def _switch(self):
+        now = time.perf_counter()
+        current = self.stack[-1] if self.stack else "analysis"
+        self.totals[current] += now - self.mark
+        self.mark = now
+
+    def wrap(self, phase: str, fn):
+        def timed(*args, **kwargs):
+            self._switch()
+            self.stack.append(phase)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._switch()
+                self.stack.pop()
+        return timed
+
+    def finish(self) -> dict:
+        self._switch()
+        return self.totals
+
+
+def phase_driver(script: str, result_path: str, script_args: list[str]) -> int:
+    """Run ``script`` in this process with skilllib entry points timed by phase."""
+    import skilllib.index
+    import skilllib.manifest
+    import skilllib.output
+    import skilllib.parsing
+
+    clock = PhaseClock()
+    patches = [
+        (skilllib.index, "discover_skill_dirs", "discovery"),
+        (skilllib.parsing.SkillParseCache, "get", "parsing"),
+        (skilllib.parsing.SkillParseCache, "frontmatter", "parsing"),
+        (skilllib.parsing.SkillParseCache, "save", "writes"),
+        (skilllib.output.OutputBatch, "commit", "writes"),
+        (skilllib.manifest.BuildManifest, "save", "writes"),
+    ]
+    for owner, name, phase in patches:
+        setattr(owner, name, clock.wrap(phase, getattr(owner, name)))
+
+    sys.argv = [script, *script_args]
+    exit_code = 0
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            runpy.run_path(script, run_name="__main__")
+        except SystemExit as exc:
+            exit_code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    total = time.perf_counter() - started
+    phases = clock.finish()
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({"phases": phases, "total": total, "exit_code": exit_code}, f)
+    return 0
+
+
+# --- harness ----------------------------------------------------------------
+
+def run_script(workdir: str, script: str, args: list[str], env: dict) -> dict:
+    scripts_dir = os.path.join(workdir, "scripts")
+    result_path = os.path.join(workdir, "phase-result.json")
+    subprocess.run(
+        [sys.executable, os.path.join(scripts_dir, "bench-pipeline.py"), "--phase-driver",
+         os.path.join(scripts_dir, script), result_path, *args],
+        env=env, check=True,
+    )
+    with open(result_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bench_size(count: int, args) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as workdir:
+        shutil.copytree(os.path.join(REPO_ROOT, "scripts"), os.path.join(workdir, "scripts"),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        started = time.perf_counter()
+        generate_tree(os.path.join(workdir, "skills"), count, args.depth, args.body_size,
+                      args.bullets, args.seed)
+        generate_time = time.perf_counter() - started
+
+        cache_dir = os.path.join(workdir, ".cache")
+        env = dict(os.environ)
+        env["SKILLS_CACHE_DIR"] = cache_dir
+        env.pop("SKILLS_NO_CACHE", None)
+
+        runs = {name: [] for name, _, _ in PIPELINE}
+        for _ in range(args.repeat):
+            for name, script, script_args in PIPELINE:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+                runs[name].append(run_script(workdir, script, script_args, env))
+
+    scripts = {}
+    for name, results in runs.items():
+        failed = [r["exit_code"] for r in results if r["exit_code"]]
+        if failed:
+            print(f"WARNING: {name} exited with {failed[0]} on the synthetic tree",
+                  file=sys.stderr)
+        entry = {phase: statistics.median(r["phases"][phase] for r in results)
+                 for phase in PHASES}
+        entry["total"] = statistics.median(r["total"] for r in results)
+        scripts[name] = entry
+    return {"skills": count, "generate_seconds": generate_time, "scripts": scripts}
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list[dict]:
+    """One row per (size, script, metric) present in both runs."""
+    rows = []
+    for size, current in results["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if base is None:
+            continue
+        for script, metrics in current["scripts"].items():
+            base_metrics = base["scripts"].get(script)
+            if base_metrics is None:
+                continue
+            for metric in (*PHASES, "total"):
+                old, new = base_metrics.get(metric), metrics.get(metric)
+                if old is None or new is None:
+                    continue
+                change = (new - old) / old if old > 0 else 0.0
+                rows.append({
+                    "size": size, "script": script, "metric": metric,
+                    "baseline": old, "current": new, "change": change,
+                    "regression": change > threshold and new - old >= min_delta,
+                })
+    return rows
+
+
+def print_report(report: dict) -> None:
+    config = report["config"]
+    tree = config["tree"]
+    print(f"Pipeline benchmark: depth {tree['depth']}, body {tree['body_size']} chars, "
+          f"{tree['bullets']} bullets, {config['repeat']} repeat(s), "
+          f"{report['environment']['cpus']} CPUs")
+    comparison = {(r["size"], r["script"], r["metric"]): r for r in report.get("comparison", [])}
+    for size, result in report["sizes"].items():
+        print(f"\n{result['skills']} skills (tree generated in {result['generate_seconds']:.2f}s)")
+        header = f"{'Script':<22}" + "".join(f"{p:>11}" for p in (*PHASES, "total"))
+        if comparison:
+            header += f"{'vs base':>9}"
+        print(header)
+        print("-" * len(header))
+        for script, metrics in result["scripts"].items():
+            line = f"{script:<22}" + "".join(f"{metrics[p]:>10.3f}s" for p in (*PHASES, "total"))
+            row = comparison.get((size, script, "total"))
+            if row is not None:
+                line += f"{row['change']:>+8.1%}"
+            print(line)
+    regressions = [r for r in report.get("comparison", []) if r["regression"]]
+    if "comparison" in report:
+        print(f"\nRegressions (> {config['threshold']:.0%} slower): {len(regressions)}")
+        for r in regressions:
+            print(f"  {r['size']} {r['script']} {r['metric']}: "
+                  f"{r['baseline']:.3f}s -> {r['current']:.3f}s ({r['change']:+.1%})")
+
+
+def tree_config(args) -> dict:
+    return {"depth": args.depth, "body_size": args.body_size,
+            "bullets": args.bullets, "seed": args.seed}
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--phase-driver":
+        sys.exit(phase_driver(sys.argv[2], sys.argv[3], sys.argv[4:]))
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1k",
+                        help="comma-separated skill counts, e.g. 1k,10k,50k (default: 1k)")
+    parser.add_argument("--depth", type=int, default=3, help="maximum tree depth (default: 3)")
+    parser.add_argument("--body-size", type=int, default=4000,
+                        help="approximate SKILL.md body size in characters (default: 4000)")
+    parser.add_argument("--bullets", type=int, default=8,
+                        help="Best Practices bullets per skill (default: 8)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for tree contents")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per script; the median is reported (default: 1)")
+    parser.add_argument("--json", action="store_true",
+                        help="print the JSON report instead of the table")
+    parser.add_argument("--output", metavar="PATH", help="also write the JSON report to PATH")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="write this run as a baseline for later --baseline comparisons")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="fractional slowdown that counts as a regression (default: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many seconds (default: 0.05)")
+    args = parser.parse_args()
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != BENCH_VERSION:
+            print(f"ERROR: {args.baseline}: unsupported baseline version", file=sys.stderr)
+            sys.exit(2)
+        if baseline.get("config", {}).get("tree") != tree_config(args):
+            print("WARNING: baseline was recorded with different tree settings",
+                  file=sys.stderr)
+
+    report = {
+        "version": BENCH_VERSION,
+        "config": {
+            "tree": tree_config(args),
+            "repeat": args.repeat,
+            "threshold": args.threshold,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count() or 1,
+        },
+        "sizes": {},
+    }
+    for count in sizes:
+        print(f"Benchmarking {count} skills...", file=sys.stderr)
+        report["sizes"][str(count)] = bench_size(count, args)
+
+    regressions = []
+    if baseline is not None:
+        report["comparison"] = compare(report, baseline, args.threshold, args.min_delta)
+        regressions = [r for r in report["comparison"] if r["regression"]]
+
+    text = json.dumps(report, indent=2) + "\n"
+    if args.json:
+        sys.stdout.write(text)
+    else:
+        print_report(report)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
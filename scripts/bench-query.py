@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Benchmark query-skills.py's store on a synthetic corpus, and check its answers.
+
+Generates --rules synthetic rules spread over skills of --rules-per-skill
+rules each (categories, tags, impacts and body text drawn from a fixed
+vocabulary), packs them with skilllib.query.pack_store into a temporary
+file, and runs a fixed set of queries against it. Each query's result is
+compared with a brute-force evaluation over the generated rows, and its
+median time over --repeat runs is reported. Exits 1 if any result differs,
+or if any query is slower than --budget milliseconds.
+
+Usage:
+    python scripts/bench-query.py [--rules 100000] [--rules-per-skill 10]
+                                  [--repeat 5] [--budget 50] [--seed 1] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+from skilllib.query import QueryStore, RuleRow, SkillRow, pack_store, parse_query
+from skilllib.rules_index import IMPACT_ORDER, impact_rank
+
+
+CATEGORIES = ("ai", "cloud", "dev", "dotnet", "go", "python", "rust", "security", "typescript")
+WORDS = (
+    "agent api async batch build cache client config context data deploy error event "
+    "handler index input latency logging model module network output pipeline policy "
+    "query queue request resource retry schema secret service session storage stream task "
+    "test token trace type update validate version worker workflow"
+).split()
+TAGS = tuple(WORDS[:24]) + ("azure", "aws", "gcp", "kubernetes", "docker", "sql", "security")
+IMPACT_WEIGHTS = (1, 3, 10, 2)   # CRITICAL, HIGH, MEDIUM, LOW
+
+QUERIES = (
+    "impact:CRITICAL",
+    "impact:HIGH path:dotnet",
+    "impact:HIGH text:secret path:dotnet",
+    "impact:critical+ tag:security",
+    "(tag:azure OR tag:aws) AND impact:high+",
+    "tag:kube* -impact:LOW",
+    "text:token",
+    'text:"retry policy" NOT path:python',
+    'text:"token cache str" impact:high+',
+    "path:python/p* impact:LOW text:cache",
+    "NOT (impact:MEDIUM OR tag:sql)",
+)
+
+
+def synthetic_skills(n_rules: int, per_skill: int, seed: int) -> list[SkillRow]:
+    rng = random.Random(seed)
+    skills = []
+    for number in range((n_rules + per_skill - 1) // per_skill):
+        category = CATEGORIES[number % len(CATEGORIES)]
+        path = f"{category}/{rng.choice(WORDS)}-{number}"
+        tags = sorted(set(rng.sample(TAGS, 3)) | {category})
+        skill = SkillRow(path, f"{category}-{number}", " ".join(rng.choices(WORDS, k=12)),
+                         tags, [0, 0, 0])
+        for i in range(min(per_skill, n_rules - number * per_skill)):
+            title = " ".join(rng.choices(WORDS, k=5)).capitalize()
+            body = f"## {title}\n\n" + " ".join(rng.choices(WORDS, k=40)) + ".\n"
+            impact = rng.choices(IMPACT_ORDER, IMPACT_WEIGHTS)[0]
+            skill.rules.append(RuleRow(f"{path}/rules/{category}-{i:02d}.md", title, impact,
+                                       body.lower()))
+        skills.append(skill)
+    return skills
+
+
+def matches(node, rule: RuleRow, skill: SkillRow) -> bool:
+    """Reference semantics, one rule at a time."""
+    kind = node[0]
+    if kind == "and":
+        return all(matches(child, rule, skill) for child in node[1])
+    if kind == "or":
+        return any(matches(child, rule, skill) for child in node[1])
+    if kind == "not":
+        return not matches(node[1], rule, skill)
+    _, name, value = node
+    if name == "impact":
+        level = value.rstrip("+").upper()
+        if value.endswith("+"):
+            return impact_rank(rule.impact) <= impact_rank(level)
+        return rule.impact == level
+    if name == "tag":
+        tags = [t.lower() for t in skill.tags]
+        value = value.lower()
+        if value.endswith("*"):
+            return any(t.startswith(value[:-1]) for t in tags)
+        return value in tags
+    if name == "path":
+        if value.endswith("*"):
+            return rule.path.startswith(value[:-1])
+        return rule.path.startswith(value.strip("/") + "/")
+    return re.search(r"(?<![A-Za-z0-9_])" + re.escape(value.lower()), rule.text) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and check the rule query store.")
+    parser.add_argument("--rules", type=int, default=100_000, help="synthetic rules (default: 100000)")
+    parser.add_argument("--rules-per-skill", type=int, default=10,
+                        help="rules per synthetic skill (default: 10)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query (default: 5)")
+    parser.add_argument("--budget", type=float, default=50.0, metavar="MS",
+                        help="slowest acceptable median query time (default: 50)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    skills = synthetic_skills(args.rules, args.rules_per_skill, args.seed)
+    data = pack_store(skills)
+    pack_s = time.perf_counter() - started
+
+    failed = 0
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-query-") as tmp:
+        path = os.path.join(tmp, "query-store.bin")
+        with open(path, "wb") as f:
+            f.write(data)
+        started = time.perf_counter()
+        store = QueryStore(path)
+        open_ms = (time.perf_counter() - started) * 1000
+        with store:
+            for query in QUERIES:
+                times = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    rows = store.query(query)
+                    times.append((time.perf_counter() - started) * 1000)
+                node = parse_query(query)
+                expected = sorted(rule.path for skill in skills for rule in skill.rules
+                                  if matches(node, rule, skill))
+                found = [store.rule_path[i].decode("utf-8") for i in rows]
+                correct = found == sorted(expected, key=lambda p: p.encode("utf-8"))
+                ms = statistics.median(times)
+                failed += (not correct) + (ms > args.budget)
+                results.append({"query": query, "matches": len(rows), "ms": round(ms, 2),
+                                "correct": correct})
+
+    if args.json:
+        print(json.dumps({"rules": args.rules, "skills": len(skills), "store_bytes": len(data),
+                          "pack_s": round(pack_s, 2), "open_ms": round(open_ms, 2),
+                          "queries": results}, indent=2))
+    else:
+        print(f"{args.rules} rules in {len(skills)} skills: store {len(data) / 2**20:.1f} MiB, "
+              f"packed in {pack_s:.2f}s, opened in {open_ms:.1f} ms")
+        width = max(len(r["query"]) for r in results)
+        for r in results:
+            flag = "" if r["correct"] else "  WRONG"
+            if r["ms"] > args.budget:
+                flag += "  SLOW"
+            print(f"  {r['query']:<{width}}  {r['matches']:>7} matches  {r['ms']:7.2f} ms{flag}")
+    print(f"{'FAILED' if failed else 'OK'}: {failed} failed checks (budget {args.budget:g} ms)",
+          file=sys.stderr if args.json else sys.stdout)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Check consistency across skills: names, tags, descriptions and READMEs.
+
+validate-skills.py checks each skill on its own. This pass looks at every
+skill under skills/ together (skilllib/consistency.py) and reports:
+
+  - duplicate names, and names that differ only in spelling;
+  - metadata.tags that are spelling variants of each other;
+  - identical or near-identical descriptions;
+  - README.md Sub-skills tables that miss a sub-skill or list a non-skill.
+
+Each check hashes names, tags or descriptions into an index once, so the pass
+stays close to linear in the number of skills.
+
+Usage:
+    python scripts/check-consistency.py [--threshold 0.8] [--json] [--strict]
+                                        [--profile [N]] [--trace trace.json]
+
+Findings are reported without failing the run; --strict exits 1 if there are
+any.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from skilllib import load_skill, profile, save_cache
+from skilllib.consistency import SkillFacts, check_consistency
+from skilllib.index import SKILLS_ROOT, discover_skill_dirs
+
+
+def gather_facts(skill_dirs: list[str]) -> list[SkillFacts]:
+    rels = {os.path.relpath(d, SKILLS_ROOT).replace("\\", "/"): d for d in skill_dirs}
+    children: dict[str, list[str]] = {}
+    for rel in rels:
+        parent = os.path.dirname(rel) if rel != "." else None
+        if parent is not None and (parent or ".") in rels:
+            children.setdefault(parent or ".", []).append(os.path.basename(rel))
+
+    facts = []
+    for rel, skill_dir in rels.items():
+        with profile.skill(rel):
+            fm = load_skill(os.path.join(skill_dir, "SKILL.md")).frontmatter_dict() or {}
+            metadata = fm.get("metadata") if isinstance(fm.get("metadata"), dict) else {}
+            tags = metadata.get("tags")
+            description = fm.get("description")
+            readme = None
+            if rel in children:
+                try:
+                    with open(os.path.join(skill_dir, "README.md"), "r", encoding="utf-8") as f:
+                        readme = f.read()
+                except OSError:
+                    pass
+            facts.append(SkillFacts(
+                path=rel,
+                name=str(fm.get("name", os.path.basename(skill_dir))),
+                tags=tags if isinstance(tags, list) else [],
+                description=description if isinstance(description, str) else "",
+                sub_skills=sorted(children.get(rel, [])),
+                readme=readme,
+            ))
+    return facts
+
+
+def print_report(findings, skills: int) -> None:
+    for finding in findings:
+        print(f"[{finding.check}] {finding.message}")
+        for path in finding.skills:
+            print(f"    {path}")
+    checks = sorted({f.check for f in findings})
+    print(f"{'' if not findings else chr(10)}Checked {skills} skills: {len(findings)} findings"
+          + (f" ({', '.join(checks)})" if checks else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check consistency across skills.")
+    parser.add_argument("--threshold", type=float, default=0.8,
+                        help="minimum estimated similarity for near-identical descriptions "
+                             "(default: 0.8)")
+    parser.add_argument("--json", action="store_true", help="print findings as JSON")
+    parser.add_argument("--strict", action="store_true", help="exit 1 if there are findings")
+    profile.add_arguments(parser)
+    args = parser.parse_args()
+    profile.configure(args)
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        sys.exit(1)
+
+    with profile.span("discovery"):
+        skill_dirs = discover_skill_dirs(SKILLS_ROOT)
+    with profile.span("collect"):
+        facts = gather_facts(skill_dirs)
+    with profile.span("check"):
+        findings = check_consistency(facts, args.threshold)
+    with profile.span("save"):
+        save_cache()
+
+    with profile.span("report"):
+        if args.json:
+            print(json.dumps([finding.to_json() for finding in findings], indent=2))
+        else:
+            print_report(findings, len(facts))
+    profile.finish(args)
+    sys.exit(1 if args.strict and findings else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Check that the reference links of every skill still resolve.
+
+Collects the URLs of each skill's ``references`` frontmatter and of the links
+in its body's ``## References`` section (what metadata.json publishes),
+checks each distinct URL once with skilllib/links.py, and lists broken and
+unreachable links with the skills that cite them.
+
+Results are cached in .cache/link-check-cache.json. A result younger than
+--ttl is reused without a request, and an older one is revalidated with
+ETag/Last-Modified, so a warm run makes few or no requests. This is not part
+of `npm test`, which must pass offline.
+
+Usage:
+    python scripts/check-links.py [SKILL_DIR ...] [--concurrency 32] [--per-host 4]
+                                  [--timeout 10] [--ttl HOURS] [--refresh | --offline]
+                                  [--json] [--profile [N]] [--trace trace.json]
+
+--offline makes no requests: it reports cached results and counts the URLs
+that were never checked. Exits 1 if any link is broken or unreachable.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from skilllib import load_skill, profile, save_cache
+from skilllib.index import SKILLS_ROOT, discover_skill_dirs
+from skilllib.links import DEFAULT_TTL, LinkCache, LinkChecker, check_links
+from skilllib.markdown import extract_references_from_body
+from skilllib.parsing import REPO_ROOT
+
+
+AGENTS_ROOT = os.path.join(REPO_ROOT, ".agents", "skills")
+
+
+def all_skill_dirs() -> list[str]:
+    """Skill directories under skills/ and .agents/skills/, relative to the repo."""
+    dirs = list(discover_skill_dirs(SKILLS_ROOT))
+    for dirpath, dirnames, filenames in os.walk(AGENTS_ROOT):
+        dirnames.sort()
+        if "SKILL.md" in filenames:
+            dirs.append(dirpath)
+    return sorted(os.path.relpath(d, REPO_ROOT).replace("\\", "/") for d in dirs)
+
+
+def skill_urls(skill_dir: str) -> list[str]:
+    """Reference URLs cited by one skill: frontmatter first, then the body."""
+    parsed = load_skill(os.path.join(REPO_ROOT, skill_dir, "SKILL.md"))
+    fm = parsed.frontmatter_dict() or {}
+    urls = []
+    references = fm.get("references")
+    if isinstance(references, list):
+        urls.extend(ref["url"].strip() for ref in references
+                    if isinstance(ref, dict) and isinstance(ref.get("url"), str) and ref["url"].strip())
+    urls.extend(ref["url"] for ref in extract_references_from_body(parsed.load_body()))
+    return list(dict.fromkeys(urls))
+
+
+def collect(skill_dirs: list[str]) -> dict[str, list[str]]:
+    """URL -> skills citing it, in first-seen order."""
+    cited: dict[str, list[str]] = {}
+    for skill_dir in skill_dirs:
+        with profile.skill(skill_dir):
+            for url in skill_urls(skill_dir):
+                cited.setdefault(url, []).append(skill_dir)
+    return cited
+
+
+def describe(result) -> str:
+    if result.error is not None:
+        return result.error
+    text = str(result.status)
+    if result.final_url:
+        text += f" (via redirect to {result.final_url})"
+    return text
+
+
+def print_report(results: dict, cited: dict[str, list[str]], checker: LinkChecker,
+                 elapsed: float) -> None:
+    values = list(results.values())
+    ok = sum(r.ok for r in values)
+    broken = [r for r in values if r.broken]
+    unreachable = [r for r in values if r.error is not None]
+    unchecked = sum(r.source == "unchecked" for r in values)
+    cached = sum(r.source == "cache" for r in values)
+    stats = checker.stats
+    print(f"Checked {len(values)} URLs cited {sum(map(len, cited.values()))} times: "
+          f"{ok} OK, {len(broken)} broken, {len(unreachable)} unreachable"
+          + (f", {unchecked} never checked" if unchecked else ""))
+    print(f"  {cached} from cache, {stats['revalidated']} revalidated, "
+          f"{stats['requests']} requests over {stats['connections']} connections "
+          f"in {elapsed:.2f}s")
+    for title, group in (("Broken", broken), ("Unreachable", unreachable)):
+        if not group:
+            continue
+        print(f"\n{title}:")
+        for result in sorted(group, key=lambda r: r.url):
+            print(f"  {result.url}: {describe(result)}")
+            for skill_dir in cited[result.url]:
+                print(f"      {skill_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the reference links of every skill.")
+    parser.add_argument("paths", nargs="*",
+                        help="skill directories to check (default: every skill)")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="requests in flight overall (default: 32)")
+    parser.add_argument("--per-host", type=int, default=4,
+                        help="requests in flight per host (default: 4)")
+    parser.add_argument("--timeout", type=float, default=10.0, metavar="SECONDS",
+                        help="per-request timeout (default: 10)")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL / 3600, metavar="HOURS",
+                        help="reuse cached results younger than this (default: 168)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--refresh", action="store_true",
+                      help="recheck every URL, revalidating cached results")
+    mode.add_argument("--offline", action="store_true",
+                      help="make no requests; report cached results only")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    profile.add_arguments(parser)
+    args = parser.parse_args()
+    profile.configure(args)
+    if args.concurrency < 1 or args.per_host < 1:
+        parser.error("--concurrency and --per-host must be at least 1")
+
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        sys.exit(1)
+
+    with profile.span("discovery"):
+        if args.paths:
+            skill_dirs = [os.path.relpath(os.path.abspath(p), REPO_ROOT).replace("\\", "/")
+                          for p in args.paths]
+        else:
+            skill_dirs = all_skill_dirs()
+    with profile.span("collect"):
+        cited = collect(skill_dirs)
+
+    cache = LinkCache()
+    checker = LinkChecker(args.concurrency, args.per_host, args.timeout)
+    started = time.perf_counter()
+    with profile.span("check"):
+        results = check_links(cited, cache, checker, ttl=args.ttl * 3600,
+                              refresh=args.refresh, offline=args.offline)
+    elapsed = time.perf_counter() - started
+    profile.count("link_requests", checker.stats["requests"])
+    with profile.span("save"):
+        if not args.paths:
+            cache.prune(cited)
+        cache.save()
+        save_cache()
+
+    with profile.span("report"):
+        if args.json:
+            print(json.dumps([dict(result.to_json(), ok=result.ok, source=result.source,
+                                   skills=cited[url])
+                              for url, result in results.items()], indent=2))
+        else:
+            print_report(results, cited, checker, elapsed)
+    profile.finish(args)
+    failed = any(r.broken or r.error is not None for r in results.values())
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
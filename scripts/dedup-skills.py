@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Find duplicated content across skills and report how much could be saved.
+
+SKILL.md, AGENTS.md and rules/*.md of every skill are split into sections
+(skilllib/dedup.py). Identical sections are grouped by content hash and
+similar ones by MinHash/LSH; the report shows the bytes each would save and
+the largest offenders, e.g. cheatsheet sections copied from other skills or
+AGENTS.md repeating its SKILL.md body.
+
+Usage:
+    python scripts/dedup-skills.py [--threshold 0.8] [--shingle 5] [--top 10] [--json]
+                                   [--store DIR] [--verify-store DIR]
+                                   [--profile [N]] [--trace trace.json]
+
+--store DIR also writes a content-addressed blob store: each distinct section
+once under DIR/blobs/, plus DIR/manifests/<skill>.json listing every file as
+section hashes. --verify-store DIR rebuilds each file from such a store and
+compares it with the tree.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from skilllib import profile
+from skilllib.dedup import DedupIndex, restore_file
+from skilllib.index import SKILLS_ROOT, discover_skill_dirs
+from skilllib.output import format_bytes
+
+
+def skill_files(skill_dir: str) -> list[str]:
+    """SKILL.md, AGENTS.md and rules/*.md, relative to the skill directory."""
+    files = [name for name in ("SKILL.md", "AGENTS.md")
+             if os.path.isfile(os.path.join(skill_dir, name))]
+    try:
+        rules = sorted(os.listdir(os.path.join(skill_dir, "rules")))
+    except OSError:
+        rules = []
+    files.extend(f"rules/{name}" for name in rules if name.endswith(".md"))
+    return files
+
+
+def percent(part: float, whole: int) -> str:
+    return f"{100 * part / whole:.1f}%" if whole else "0.0%"
+
+
+def location(first) -> str:
+    skill, name, title = first
+    return f"{skill}/{name} {title!r}"
+
+
+def print_report(index: DedupIndex, skills: int, top: int) -> None:
+    stats = index.stats
+    exact = sum(stats.exact_saved.values())
+    print(f"Scanned {skills} skills: {stats.files} files, {stats.chunks} sections, "
+          f"{format_bytes(stats.bytes)}")
+    print(f"Distinct sections: {stats.unique_chunks} ({format_bytes(stats.unique_bytes)})")
+    print(f"Exact duplicates:  {format_bytes(exact)} could be saved ({percent(exact, stats.bytes)})")
+    for kind, saved in stats.exact_saved.most_common():
+        print(f"  {kind:<12} {format_bytes(saved):>10}")
+    clusters = index.near_clusters(top)
+    print(f"Near duplicates:   ~{format_bytes(round(stats.near_saved))} more "
+          f"({percent(stats.near_saved, stats.bytes)}) at >= {index.threshold:.0%} similarity")
+
+    groups = index.exact_groups(top)
+    if groups:
+        print("\nLargest exact duplicates:")
+        for group in groups:
+            print(f"  {format_bytes(group['saved']):>10}  {group['copies']}x "
+                  f"{format_bytes(group['size'])}  {location(group['first'])}")
+    if clusters:
+        print("\nLargest near-duplicate clusters:")
+        for cluster in clusters:
+            print(f"  ~{format_bytes(cluster['saved']):>9}  {cluster['members']} variants")
+            for chunk in cluster["chunks"][:5]:
+                print(f"      {location(chunk['first'])}")
+            if cluster["members"] > 5:
+                print(f"      ... and {cluster['members'] - 5} more")
+    if stats.store.written or stats.store.unchanged:
+        print(f"\nStore {index.store_dir}: {stats.store.summary()}")
+
+
+def json_report(index: DedupIndex, skills: int, top: int) -> dict:
+    stats = index.stats
+    return {
+        "skills": skills,
+        "files": stats.files,
+        "sections": stats.chunks,
+        "bytes": stats.bytes,
+        "distinct_sections": stats.unique_chunks,
+        "distinct_bytes": stats.unique_bytes,
+        "exact_saved": dict(stats.exact_saved.most_common()),
+        "near_saved": round(stats.near_saved),
+        "threshold": index.threshold,
+        "exact_groups": index.exact_groups(top),
+        "near_clusters": index.near_clusters(top),
+    }
+
+
+def verify_store(store_dir: str) -> int:
+    mismatched = 0
+    checked = 0
+    for manifest_file in sorted(_manifests(store_dir)):
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        skill_dir = os.path.join(SKILLS_ROOT, manifest["skill"])
+        for name, hashes in manifest["files"].items():
+            checked += 1
+            path = os.path.join(skill_dir, name)
+            try:
+                with open(path, "rb") as f:
+                    on_disk = f.read()
+                rebuilt = restore_file(store_dir, hashes)
+            except OSError as exc:
+                print(f"  - {manifest['skill']}/{name}: {exc}")
+                mismatched += 1
+                continue
+            if rebuilt != on_disk:
+                print(f"  - {manifest['skill']}/{name}: differs from the tree")
+                mismatched += 1
+    print(f"Verified {checked} files from {store_dir}: {mismatched} mismatched")
+    return 1 if mismatched else 0
+
+
+def _manifests(store_dir: str):
+    for dirpath, _, filenames in os.walk(os.path.join(store_dir, "manifests")):
+        for name in filenames:
+            if name.endswith(".json"):
+                yield os.path.join(dirpath, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report duplicated content across skills.")
+    parser.add_argument("--threshold", type=float, default=0.8,
+                        help="minimum estimated similarity for near duplicates (default: 0.8)")
+    parser.add_argument("--shingle", type=int, default=5,
+                        help="words per shingle for MinHash (default: 5)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="duplicate groups and clusters to list (default: 10)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--store", metavar="DIR",
+                        help="also write a deduplicated blob store with per-skill manifests")
+    parser.add_argument("--verify-store", metavar="DIR",
+                        help="rebuild every file from a blob store and compare with the tree")
+    profile.add_arguments(parser)
+    args = parser.parse_args()
+    profile.configure(args)
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.verify_store:
+        sys.exit(verify_store(args.verify_store))
+
+    with profile.span("discovery"):
+        skill_dirs = discover_skill_dirs(SKILLS_ROOT)
+
+    index = DedupIndex(args.threshold, args.shingle, args.store)
+    for skill_dir in skill_dirs:
+        rel = os.path.relpath(skill_dir, SKILLS_ROOT).replace("\\", "/")
+        with profile.skill(rel), profile.span("chunk"):
+            index.add_skill(rel, skill_dir, skill_files(skill_dir))
+    index.finish()
+
+    with profile.span("report"):
+        if args.json:
+            print(json.dumps(json_report(index, len(skill_dirs), args.top), indent=2))
+        else:
+            print_report(index, len(skill_dirs), args.top)
+    profile.finish(args)
+
+
+if __name__ == "__main__":
+    main()
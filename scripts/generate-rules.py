@@ -5,104 +5,56 @@ Extracts best practice bullets from SKILL.md and creates individual rule files
 following the Vercel agent-skills pattern:
   - _template.md   : rule authoring template
   - _sections.md   : index table of all rules with impact levels
+  - _index.json    : machine-readable index (title, impact, byte offset and
+                     hash of each rule, sorted by impact; skilllib/rules_index.py)
   - {name}-{slug}.md : one file per best practice
 
 Usage:
-    python scripts/generate-rules.py [--dry-run] [--verbose]
+    python scripts/generate-rules.py [--dry-run] [--verbose] [--jobs N] [--force]
+                                     [--impact-keywords tables.json] [--explain]
+                                     [--global-index [PATH]]
+                                     [--profile [N]] [--trace trace.json]
+
+--jobs N spreads per-skill work across N worker processes (0 = one per CPU).
+Results are merged in discovery order, so console output and generated files
+are identical to a serial run.
+
+A rule manifest (.cache/rules-manifest.json) maps each skill's bullet content
+hashes to the rule files written for them. On the next run only rules whose
+bullet changed are rendered and rewritten, _sections.md is rebuilt only when the
+rule set changes, and files for removed or renamed bullets are deleted.
+--force re-renders everything regardless of the manifest.
+
+--global-index also packs every skill's _index.json into one binary file
+(.cache/rules-index.bin by default) that skilllib.rules_index.RulesIndex
+reads through mmap, so "all CRITICAL rules under python/" is a binary search.
 """
 
+import argparse
+import functools
 import json
 import os
 import re
 import sys
-import yaml
+from concurrent.futures import ProcessPoolExecutor
+
+from skilllib import get_cache, load_skill, profile, save_cache
+from skilllib.impact import ImpactClassifier, default_classifier
+from skilllib.index import discover_skill_dirs
+from skilllib.manifest import BuildManifest, sha256_bytes
+from skilllib.metadata import display_name_from
+from skilllib.output import OutputBatch, WriteStats
+from skilllib.parsing import DEFAULT_CACHE_DIR
+from skilllib.rules_index import (INDEX_FILENAME, build_skill_index, global_index_path,
+                                  indexed_files, pack_rules_index, rule_entry)
 
 
 SKILLS_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "skills"))
 
-# Section headers that contain best practices
-BP_HEADERS = [
-    r"## Best Practices",
-    r"## Guidelines",
-    r"## Rules You Must Follow",
-    r"## Rules",
-    r"## Recommendations",
-]
-
-# Keyword heuristics for impact classification
-CRITICAL_KEYWORDS = [
-    "never", "always", "must", "critical", "security", "vulnerability",
-    "injection", "secret", "credential", "production", "do not",
-]
-HIGH_KEYWORDS = [
-    "important", "ensure", "require", "enforce", "validate", "prevent",
-    "protect", "avoid", "mandatory",
-]
-LOW_KEYWORDS = [
-    "consider", "prefer", "optionally", "where possible", "when practical",
-    "if needed", "may want",
-]
-
-
-def parse_skill_md(path: str):
-    """Parse SKILL.md into (frontmatter_dict, body_str)."""
-    with open(path, "r", encoding="utf-8") as f:
-        content = f.read()
-    match = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)", content, re.DOTALL)
-    if not match:
-        return None, content
-    fm_text, body = match.group(1), match.group(2)
-    try:
-        fm = yaml.safe_load(fm_text)
-    except yaml.YAMLError:
-        fm = {}
-    return fm or {}, body
-
-
-def display_name_from(name: str, metadata: dict) -> str:
-    """Get display name from metadata or title-case the name."""
-    if metadata and metadata.get("displayName"):
-        return metadata["displayName"]
-    return name.replace("-", " ").title()
-
-
-def extract_best_practices(body: str) -> list:
-    """Extract bullet items from the best-practices-like section of the body."""
-    header_pattern = "|".join(BP_HEADERS)
-    match = re.search(
-        rf"(?:^|\n)({header_pattern})\s*\n(.*?)(?=\n## |\Z)",
-        body,
-        re.DOTALL | re.MULTILINE,
-    )
-    if not match:
-        return []
-
-    section_text = match.group(2)
-
-    # Parse bullet items (- prefixed), handling continuation lines
-    bullets = []
-    current = None
-    for line in section_text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("- "):
-            if current is not None:
-                bullets.append(current)
-            current = stripped[2:]
-        elif re.match(r"^\d+\.\s+", stripped):
-            # Numbered list item
-            if current is not None:
-                bullets.append(current)
-            current = re.sub(r"^\d+\.\s+", "", stripped)
-        elif current is not None and stripped and not stripped.startswith("#"):
-            current += " " + stripped
-        elif not stripped:
-            if current is not None:
-                bullets.append(current)
-                current = None
-    if current is not None:
-        bullets.append(current)
-
-    return [b.strip() for b in bullets if b.strip()]
+# Rule manifest (stored under .cache/); bump the version whenever the rendered
+# format of any rules/ file changes so every rule is re-rendered once.
+MANIFEST_NAME = "rules-manifest.json"
+MANIFEST_VERSION = 2
 
 
 def parse_bullet(bullet_text: str) -> dict:
@@ -143,19 +95,10 @@ def generate_rule_filename(title: str, skill_name: str) -> str:
     return f"{prefix}-{slug}.md"
 
 
-def determine_impact(bullet_text: str):
+def determine_impact(bullet_text: str, classifier: ImpactClassifier = None):
     """Return (impact_level, impact_description) based on keyword heuristics."""
-    text_lower = bullet_text.lower()
-    for kw in CRITICAL_KEYWORDS:
-        if kw in text_lower:
-            return ("CRITICAL", "essential for correctness or security")
-    for kw in HIGH_KEYWORDS:
-        if kw in text_lower:
-            return ("HIGH", "significant quality or reliability improvement")
-    for kw in LOW_KEYWORDS:
-        if kw in text_lower:
-            return ("LOW", "recommended but situational")
-    return ("MEDIUM", "general best practice")
+    impact = (classifier or default_classifier()).classify(bullet_text)
+    return (impact.level, impact.description)
 
 
 def derive_tags(fm: dict, skill_dir: str) -> list:
@@ -260,20 +203,46 @@ def build_sections_content(rules: list, skill_name: str,
     return "\n".join(lines)
 
 
-def write_rules_directory(skill_dir: str, rules: list, skill_name: str,
-                          display_name: str, dry_run: bool = False) -> int:
-    """Create rules/ directory and write all rule files. Returns file count."""
-    rules_dir = os.path.join(skill_dir, "rules")
-    if not dry_run:
-        os.makedirs(rules_dir, exist_ok=True)
+def rule_key(bullet_text: str, impact: str, impact_desc: str) -> str:
+    """Content hash of everything a single rule file is rendered from
+    (besides the skill-wide context)."""
+    return sha256_bytes(json.dumps([bullet_text, impact, impact_desc]).encode("utf-8"))
 
-    files_written = 0
 
-    # _template.md
-    if not dry_run:
-        with open(os.path.join(rules_dir, "_template.md"), "w", encoding="utf-8") as f:
-            f.write(build_template_content(skill_name))
-    files_written += 1
+def skill_context(skill_name: str, display_name: str, tags: list) -> str:
+    """Hash of the skill-wide inputs shared by every file in rules/."""
+    return sha256_bytes(json.dumps(
+        [MANIFEST_VERSION, skill_name, display_name, tags]).encode("utf-8"))
+
+
+def file_signature(path: str):
+    """[size, mtime_ns] of a generated file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def write_rules_directory(skill_dir: str, rules: list, skill_name: str,
+                          display_name: str, tags: list, dry_run: bool = False,
+                          previous: dict = None) -> tuple[int, WriteStats, dict, int]:
+    """Write the rules/ directory in one atomic batch.
+
+    ``previous`` is the skill's rule-manifest entry from the last run. A rule
+    whose bullet hash still maps to the same filename, and whose file is
+    untouched on disk since it was written, is kept without being rendered;
+    _sections.md, _index.json and _template.md are kept likewise while the
+    rule set and the skill context are unchanged. Everything else is rendered,
+    files whose bytes already match are left alone, and generated files (those
+    listed in _index.json or the manifest entry) that no longer correspond to
+    a rule are deleted. Files the generator never wrote (hand-authored rules,
+    notes) are left in place.
+
+    Returns (generated file count, disk stats, new manifest entry, rules reused).
+    """
+    rules_dir = os.path.join(skill_dir, "rules")
+    batch = OutputBatch(dry_run)
 
     # Deduplicate filenames
     seen = set()
@@ -285,36 +254,219 @@ def write_rules_directory(skill_dir: str, rules: list, skill_name: str,
             rule["filename"] = fn
         seen.add(fn)
 
-    # _sections.md (needs final filenames)
-    if not dry_run:
-        with open(os.path.join(rules_dir, "_sections.md"), "w", encoding="utf-8") as f:
-            f.write(build_sections_content(rules, skill_name, display_name))
-    files_written += 1
+    context = skill_context(skill_name, display_name, tags)
+    rule_set = [[rule["key"], rule["filename"]] for rule in rules]
+    prev_outputs = {}
+    prev_rules = set()
+    same_context = same_rule_set = False
+    if previous is not None and previous["inputs"] and previous["inputs"]["context"] == context:
+        same_context = True
+        prev_outputs = previous["outputs"]
+        prev_rules = {tuple(pair) for pair in previous["inputs"]["rules"]}
+        same_rule_set = previous["inputs"]["rules"] == rule_set
+
+    def current(filename: str) -> bool:
+        recorded = prev_outputs.get(filename)
+        return recorded is not None and file_signature(os.path.join(rules_dir, filename)) == recorded
+
+    # _template.md
+    if same_context and current("_template.md"):
+        batch.keep(os.path.join(rules_dir, "_template.md"))
+    else:
+        batch.add(os.path.join(rules_dir, "_template.md"), build_template_content(skill_name))
+
+    # _sections.md (needs final filenames); only rebuilt when the rule set changes
+    if same_rule_set and current("_sections.md"):
+        batch.keep(os.path.join(rules_dir, "_sections.md"))
+    else:
+        batch.add(os.path.join(rules_dir, "_sections.md"),
+                  build_sections_content(rules, skill_name, display_name))
+
+    def render(rule: dict) -> str:
+        return build_rule_content(rule["title"], rule["description"],
+                                  rule["impact"], rule["impact_description"], tags)
 
     # Individual rule files
+    reused = 0
+    rendered = {}
     for rule in rules:
-        if not dry_run:
-            with open(os.path.join(rules_dir, rule["filename"]), "w", encoding="utf-8") as f:
-                f.write(rule["content"])
-        files_written += 1
+        path = os.path.join(rules_dir, rule["filename"])
+        if (rule["key"], rule["filename"]) in prev_rules and current(rule["filename"]):
+            batch.keep(path)
+            reused += 1
+        else:
+            rendered[rule["filename"]] = render(rule)
+            batch.add(path, rendered[rule["filename"]])
 
-    return files_written
+    # _index.json (same inputs as _sections.md); kept rules are rendered again
+    # in memory for their offsets and hashes, which is cheaper than reading them
+    if same_rule_set and current(INDEX_FILENAME):
+        batch.keep(os.path.join(rules_dir, INDEX_FILENAME))
+    else:
+        rel = os.path.relpath(skill_dir, SKILLS_ROOT).replace("\\", "/")
+        entries = [rule_entry(rule["filename"], rule["title"], rule["impact"],
+                              rendered.get(rule["filename"]) or render(rule))
+                   for rule in rules]
+        batch.add(os.path.join(rules_dir, INDEX_FILENAME),
+                  build_skill_index(rel, skill_name, tags, entries))
+
+    files = len(batch.files) + len(batch.kept)
+    outputs = sorted(os.path.basename(p) for p in (*batch.files, *batch.kept))
+    # Generated files are the rules listed in the committed _index.json plus,
+    # with a warm cache, the outputs the manifest recorded; anything else in
+    # rules/ was written by hand and is never pruned.
+    owned = set(indexed_files(rules_dir))
+    if previous is not None:
+        owned.update(previous["outputs"])
+    batch.prune(os.path.join(rules_dir, name) for name in owned)
+    with profile.span("write"):
+        stats = batch.commit()
+    entry = {
+        "inputs": {"context": context, "rules": rule_set},
+        "outputs": {name: file_signature(os.path.join(rules_dir, name)) for name in outputs},
+    }
+    return files, stats, entry, reused
+
+
+def process_skill(skill_dir: str, dry_run: bool = False,
+                  classifier: ImpactClassifier = None, previous: dict = None) -> dict:
+    """Build and write the rules/ directory for one skill. Returns stats dict.
+
+    Runs unchanged in pool workers, so it must not print or touch the rule
+    manifest; the caller passes in the skill's previous manifest entry, stores
+    the returned one, and reports results in discovery order. Profiling spans
+    and counters travel back in ``result["profile"]``.
+    """
+    rel = os.path.relpath(skill_dir, SKILLS_ROOT).replace("\\", "/")
+    with profile.get_profiler().capture() as captured, profile.skill(rel):
+        result = build_skill_rules(skill_dir, rel, dry_run, classifier, previous)
+    result["profile"] = captured
+    return result
+
+
+def build_skill_rules(skill_dir: str, rel: str, dry_run: bool,
+                      classifier: ImpactClassifier, previous: dict) -> dict:
+    skill_md_path = os.path.join(skill_dir, "SKILL.md")
+    with profile.span("parse"):
+        parsed = load_skill(skill_md_path)
+        fm = parsed.frontmatter_dict()
+    if fm is None:
+        fm = {}
+
+    bullets = parsed.bp_bullets
+    result = {
+        "rel": rel,
+        "rules": 0,
+        "files": 0,
+        "reused": 0,
+        "explanations": [],
+        "cache_entry": get_cache().entry(skill_md_path),
+        "disk": WriteStats(),
+        "manifest_entry": None,
+    }
+    if not bullets:
+        return result
+
+    skill_name = fm.get("name", os.path.basename(skill_dir))
+    metadata = fm.get("metadata") or {}
+    display = display_name_from(skill_name, metadata)
+    tags = derive_tags(fm, skill_dir)
+
+    classifier = classifier or default_classifier()
+    rules = []
+    with profile.span("classify"):
+        for i, bullet_text in enumerate(bullets):
+            bullet = parse_bullet(bullet_text)
+            impact, impact_desc, keyword = classifier.classify(bullet_text)
+            result["explanations"].append((impact, keyword, bullet["title"]))
+            rules.append({
+                "title": bullet["title"],
+                "description": bullet["description"],
+                "impact": impact,
+                "impact_description": impact_desc,
+                "filename": generate_rule_filename(bullet["title"], skill_name),
+                "index": i,
+                "key": rule_key(bullet_text, impact, impact_desc),
+            })
+
+    result["rules"] = len(rules)
+    with profile.span("render"):
+        result["files"], result["disk"], entry, result["reused"] = write_rules_directory(
+            skill_dir, rules, skill_name, display, tags, dry_run, previous)
+    if not dry_run:
+        result["manifest_entry"] = entry
+    return result
+
+
+def _process_pair(pair, dry_run, classifier):
+    return process_skill(pair[0], dry_run, classifier, pair[1])
+
+
+def run_skills(skill_dirs: list, dry_run: bool, jobs: int, classifier: ImpactClassifier = None,
+               previous: list = None):
+    """Yield process_skill results in ``skill_dirs`` order.
+
+    ``previous`` holds each skill's last rule-manifest entry (or None). With
+    jobs > 1 the work is spread across a process pool; results are still
+    yielded in input order so output is identical to a serial run.
+    """
+    previous = previous or [None] * len(skill_dirs)
+    if jobs <= 1 or len(skill_dirs) <= 1:
+        for skill_dir, prev in zip(skill_dirs, previous):
+            yield process_skill(skill_dir, dry_run, classifier, prev)
+        return
+
+    worker = functools.partial(_process_pair, dry_run=dry_run, classifier=classifier)
+    chunksize = max(1, len(skill_dirs) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=profile.init_worker,
+                             initargs=(profile.get_profiler().enabled,)) as pool:
+        yield from pool.map(worker, zip(skill_dirs, previous), chunksize=chunksize)
+
+
+def write_global_index(path: str, skill_dirs: list) -> WriteStats:
+    """Pack the rules/_index.json of ``skill_dirs`` into the global index."""
+    indexes = []
+    for skill_dir in skill_dirs:
+        with open(os.path.join(skill_dir, "rules", INDEX_FILENAME), "r", encoding="utf-8") as f:
+            indexes.append(json.load(f))
+    batch = OutputBatch()
+    batch.add(path, pack_rules_index(indexes))
+    return batch.commit()
 
 
 def main():
-    dry_run = "--dry-run" in sys.argv
-    verbose = "--verbose" in sys.argv or "-v" in sys.argv
+    parser = argparse.ArgumentParser(description="Generate rules/ directories from SKILL.md best practices.")
+    parser.add_argument("--dry-run", action="store_true", help="do not write any files")
+    parser.add_argument("--verbose", "-v", action="store_true", help="also list skipped skills")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="worker processes to use (0 = one per CPU, default: 1)")
+    parser.add_argument("--impact-keywords", metavar="JSON",
+                        help="keyword tables for impact classification, e.g. "
+                             '{"CRITICAL": [...], "HIGH": [...], "LOW": [...]}')
+    parser.add_argument("--explain", action="store_true",
+                        help="print which keyword decided each rule's impact")
+    parser.add_argument("--force", action="store_true",
+                        help="ignore the rule manifest and re-render every rule file")
+    parser.add_argument("--global-index", nargs="?", metavar="PATH",
+                        const=global_index_path(os.environ.get("SKILLS_CACHE_DIR")
+                                                or DEFAULT_CACHE_DIR),
+                        help="also pack every rules/_index.json into one binary index "
+                             "(default: .cache/rules-index.bin)")
+    profile.add_arguments(parser)
+    args = parser.parse_args()
+    profile.configure(args)
+    dry_run = args.dry_run
+    verbose = args.verbose
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    classifier = ImpactClassifier.from_json(args.impact_keywords) if args.impact_keywords else None
 
     if not os.path.isdir(SKILLS_ROOT):
         print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
         sys.exit(1)
 
     # Discover all SKILL.md files
-    skill_dirs = []
-    for root, dirs, files in os.walk(SKILLS_ROOT):
-        if "SKILL.md" in files:
-            skill_dirs.append(root)
-    skill_dirs.sort()
+    with profile.span("discovery"):
+        skill_dirs = discover_skill_dirs(SKILLS_ROOT)
 
     print(f"Found {len(skill_dirs)} skill directories")
     if dry_run:
@@ -325,59 +477,70 @@ def main():
     without_rules = 0
     total_rules = 0
     total_files = 0
-
-    for skill_dir in skill_dirs:
-        skill_md_path = os.path.join(skill_dir, "SKILL.md")
-        fm, body = parse_skill_md(skill_md_path)
-        if fm is None:
-            fm = {}
-
-        bullets = extract_best_practices(body)
-        rel = os.path.relpath(skill_dir, SKILLS_ROOT).replace("\\", "/")
-
-        if not bullets:
+    total_reused = 0
+    indexed = []
+    disk = WriteStats()
+
+    manifest = BuildManifest(MANIFEST_NAME, {"version": MANIFEST_VERSION})
+    keys = [os.path.relpath(sd, SKILLS_ROOT).replace("\\", "/") for sd in skill_dirs]
+    previous = [manifest.get(key) for key in keys]
+    if args.force:
+        # Re-render everything, but keep last run's outputs so that files it
+        # generated for since-removed bullets are still deleted.
+        previous = [entry and {"inputs": None, "outputs": entry["outputs"]} for entry in previous]
+
+    cache = get_cache()
+    profiler = profile.get_profiler()
+    results = run_skills(skill_dirs, dry_run, jobs, classifier, previous)
+    for skill_dir, key, result in zip(skill_dirs, keys, results):
+        profiler.merge(result["profile"])
+        cache.absorb(os.path.join(skill_dir, "SKILL.md"), result["cache_entry"])
+        disk.add(result["disk"])
+        if result["manifest_entry"] is not None:
+            manifest.set(key, **result["manifest_entry"])
+        elif not dry_run:
+            manifest.entries.pop(key, None)
+        rel = result["rel"]
+        if not result["rules"]:
             without_rules += 1
             if verbose:
                 print(f"  SKIP (no best practices): {rel}")
             continue
 
-        skill_name = fm.get("name", os.path.basename(skill_dir))
-        metadata = fm.get("metadata") or {}
-        display = display_name_from(skill_name, metadata)
-        tags = derive_tags(fm, skill_dir)
-
-        rules = []
-        for i, bullet_text in enumerate(bullets):
-            parsed = parse_bullet(bullet_text)
-            impact, impact_desc = determine_impact(bullet_text)
-            filename = generate_rule_filename(parsed["title"], skill_name)
-            content = build_rule_content(
-                parsed["title"], parsed["description"],
-                impact, impact_desc, tags,
-            )
-            rules.append({
-                "title": parsed["title"],
-                "description": parsed["description"],
-                "impact": impact,
-                "impact_description": impact_desc,
-                "filename": filename,
-                "index": i,
-                "content": content,
-            })
-
-        files = write_rules_directory(skill_dir, rules, skill_name, display, dry_run)
         with_rules += 1
-        total_rules += len(rules)
-        total_files += files
-        print(f"  OK: {rel} ({len(rules)} rules, {files} files)")
-
+        indexed.append(skill_dir)
+        total_rules += result["rules"]
+        total_files += result["files"]
+        total_reused += result["reused"]
+        print(f"  OK: {rel} ({result['rules']} rules, {result['files']} files)")
+        if args.explain:
+            for impact, keyword, title in result["explanations"]:
+                reason = f'"{keyword}"' if keyword else "no keyword"
+                print(f"      {impact:<8} {reason:<18} {title}")
+
+    with profile.span("save"):
+        save_cache()
+        if not dry_run:
+            manifest.prune(keys)
+            manifest.save()
+    if args.global_index and not dry_run:
+        with profile.span("global_index"):
+            global_stats = write_global_index(args.global_index, indexed)
+        disk.add(global_stats)
     print(f"\n{'=' * 50}")
     print(f"Skills processed:     {total}")
     print(f"  With rules/:        {with_rules}")
     print(f"  Skipped (no BP):    {without_rules}")
     print(f"Total rule files:     {total_rules}")
     print(f"Total files written:  {total_files}")
-    print(f"  (includes _template.md and _sections.md per skill)")
+    print(f"  (includes _template.md, _sections.md and _index.json per skill)")
+    print(f"Rules re-rendered:    {total_rules - total_reused} "
+          f"({total_reused} unchanged since the last run)")
+    print(f"Disk {'changes (dry run)' if dry_run else 'changes'}:  {disk.summary()}")
+    if args.global_index and not dry_run:
+        print(f"Global rules index:   {os.path.relpath(args.global_index)} "
+              f"({len(indexed)} skills)")
+    profile.finish(args)
 
 
 if __name__ == "__main__":
@@ -7,104 +7,74 @@ Mirrors the Vercel agent-skills pattern:
   - README.md      : human-readable documentation with structure and sub-skills
 
 Usage:
-    python scripts/generate-skill-files.py [--dry-run]
+    python scripts/generate-skill-files.py [--dry-run] [--incremental]
+                                           [--compact [--code-budget TOKENS]]
+                                           [--tokens [N]] [--tokens-json PATH]
+                                           [--check-parse-once]
+                                           [--profile [N]] [--trace trace.json]
+
+With --incremental, a manifest of input and output hashes is kept in .cache/
+and only skills whose SKILL.md (or a child sub-skill's SKILL.md) changed are
+regenerated; files whose rendered bytes already match the disk are not
+rewritten.
+
+Skills are modelled as one tree (skilllib/tree.py) for the whole run, so a
+SKILL.md read for its own files is reused for its parent's sub-skill table.
+--check-parse-once makes the run exit 1 unless every SKILL.md went through
+the parser exactly once (bench-pipeline.py passes it).
+
+--tokens estimates what each SKILL.md body (and so AGENTS.md) costs an agent
+in tokens, per section, skill and category (skilllib/tokens.py). --compact
+writes AGENTS.md through skilllib.markdown.compact_markdown instead of
+copying the body, trimming code blocks to --code-budget tokens, and reports
+the tokens each skill saves.
 """
 
+import argparse
 import json
 import os
-import re
 import sys
-import yaml
+
+from skilllib import profile, save_cache
+from skilllib.index import discover_skill_dirs
+from skilllib.manifest import BuildManifest, sha256_bytes, sha256_file
+from skilllib.markdown import compact_markdown, extract_references_from_body
+from skilllib.metadata import clean_description, count_rules, display_name_from
+from skilllib.output import OutputBatch, WriteStats
+from skilllib.tokens import TokenLedger, count_tokens
+from skilllib.tree import SkillNode, SkillTree
 
 
 SKILLS_ROOT = os.path.join(os.path.dirname(__file__), "..", "skills")
 DATE = "February 2026"
 
+# Incremental-mode manifest (stored under .cache/); bump the version whenever
+# the rendered output format changes so every skill is regenerated once.
+MANIFEST_NAME = "skill-files-manifest.json"
+MANIFEST_VERSION = 1
 
-def parse_skill_md(path: str):
-    """Parse SKILL.md into (frontmatter_dict, body_str)."""
-    with open(path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # Split on YAML frontmatter fences
-    match = re.match(r"^---\s*\n(.*?)\n---\s*\n(.*)", content, re.DOTALL)
-    if not match:
-        return None, content
-
-    fm_text, body = match.group(1), match.group(2)
-    try:
-        fm = yaml.safe_load(fm_text)
-    except yaml.YAMLError:
-        fm = {}
-    return fm or {}, body
-
-
-def clean_description(desc: str) -> str:
-    """Extract the first meaningful paragraph, stripping USE FOR / DO NOT USE FOR."""
-    if not desc:
-        return ""
-    lines = desc.strip().splitlines()
-    clean_lines = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped.upper().startswith("USE FOR:"):
-            break
-        if stripped.upper().startswith("DO NOT USE FOR:"):
-            break
-        clean_lines.append(stripped)
-    result = " ".join(clean_lines).strip()
-    # collapse multiple spaces
-    result = re.sub(r"\s+", " ", result)
-    return result
-
-
-def display_name_from(name: str, metadata: dict) -> str:
-    """Get display name from metadata or title-case the name."""
-    if metadata and metadata.get("displayName"):
-        return metadata["displayName"]
-    # Title-case with hyphens replaced by spaces
-    return name.replace("-", " ").title()
 
+def find_sub_skills(node: SkillNode) -> list:
+    """Name and description of each skill in an immediate child directory.
 
-def find_sub_skills(skill_dir: str) -> list:
-    """Find immediate child directories that contain SKILL.md."""
+    Reads the children's frontmatter from the tree, which parses each SKILL.md
+    once for the whole run.
+    """
     subs = []
-    try:
-        entries = sorted(os.listdir(skill_dir))
-    except OSError:
-        return subs
-    for entry in entries:
-        child = os.path.join(skill_dir, entry)
-        if os.path.isdir(child) and os.path.isfile(os.path.join(child, "SKILL.md")):
-            # Get name from child frontmatter
-            fm, _ = parse_skill_md(os.path.join(child, "SKILL.md"))
-            child_name = fm.get("name", entry) if fm else entry
-            child_desc = clean_description(fm.get("description", "")) if fm else ""
-            child_display = display_name_from(child_name, fm.get("metadata"))
-            subs.append({
-                "dir": entry,
-                "name": child_name,
-                "displayName": child_display,
-                "description": child_desc,
-            })
+    for child in node.sub_skills:
+        fm = child.frontmatter
+        child_name = fm.get("name", child.dirname) if fm else child.dirname
+        child_desc = clean_description(fm.get("description", "")) if fm else ""
+        child_display = display_name_from(child_name, fm.get("metadata") if fm else None)
+        subs.append({
+            "dir": child.dirname,
+            "name": child_name,
+            "displayName": child_display,
+            "description": child_desc,
+        })
     return subs
 
 
-def extract_references_from_body(body: str) -> list:
-    """Extract markdown links from a top-level References section."""
-    match = re.search(r"^## References\s*\n(.*?)(?=^## |\Z)", body, re.DOTALL | re.MULTILINE)
-    if not match:
-        return []
-    refs = []
-    seen = set()
-    for title, url in re.findall(r"-\s+\[([^\]]+)\]\((https?://[^)]+)\)", match.group(1)):
-        if url in seen:
-            continue
-        seen.add(url)
-        refs.append({"title": title.strip(), "url": url.strip()})
-    return refs
-
-
 def generate_metadata_json(fm: dict, skill_dir: str, body: str = "") -> dict:
     """Build metadata.json content from frontmatter."""
     name = fm.get("name", os.path.basename(skill_dir))
@@ -125,8 +95,12 @@ def generate_metadata_json(fm: dict, skill_dir: str, body: str = "") -> dict:
     }
 
 
-def generate_readme(fm: dict, skill_dir: str, sub_skills: list) -> str:
-    """Build README.md content."""
+def generate_readme(node: SkillNode, sub_skills: list = None) -> str:
+    """Build README.md content for a node of the skill tree."""
+    fm = node.frontmatter or {}
+    skill_dir = node.path
+    if sub_skills is None:
+        sub_skills = find_sub_skills(node)
     name = fm.get("name", os.path.basename(skill_dir))
     metadata = fm.get("metadata") or {}
     display = display_name_from(name, metadata)
@@ -147,10 +121,8 @@ def generate_readme(fm: dict, skill_dir: str, sub_skills: list) -> str:
     lines.append("| `AGENTS.md` | Agent-optimized quick reference (generated) |")
     lines.append("| `README.md` | This file |")
     # Include rules/ if present
-    rules_dir = os.path.join(skill_dir, "rules")
-    if os.path.isdir(rules_dir):
-        rule_count = len([f for f in os.listdir(rules_dir)
-                         if f.endswith(".md") and not f.startswith("_")])
+    rule_count = count_rules(skill_dir)
+    if rule_count is not None:
         lines.append(f"| `rules/` | {rule_count} individual best practice rules |")
     lines.append("")
 
@@ -191,78 +163,233 @@ def generate_readme(fm: dict, skill_dir: str, sub_skills: list) -> str:
     return "\n".join(lines)
 
 
-def process_skill(skill_dir: str, dry_run: bool = False) -> dict:
-    """Process one skill directory. Returns stats dict."""
-    skill_md = os.path.join(skill_dir, "SKILL.md")
-    if not os.path.isfile(skill_md):
-        return {"skipped": True}
+OUTPUT_FILES = ("metadata.json", "AGENTS.md", "README.md")
+
+
+def render_skill_files(node: SkillNode, body: str, sub_skills: list,
+                       compact: int | None = None) -> dict:
+    """Render every generated file for a skill. Returns {filename: content}.
+
+    ``compact`` is the code budget for a compact AGENTS.md; None copies the
+    body verbatim.
+    """
+    meta = generate_metadata_json(node.frontmatter or {}, node.path, body)
+    agents = body.lstrip("\n")
+    if compact is not None:
+        agents = compact_markdown(agents, compact)
+    return {
+        # 1. metadata.json
+        "metadata.json": json.dumps(meta, indent=2, ensure_ascii=False) + "\n",
+        # 2. AGENTS.md — body content from SKILL.md
+        "AGENTS.md": agents,
+        # 3. README.md
+        "README.md": generate_readme(node, sub_skills),
+    }
+
 
-    fm, body = parse_skill_md(skill_md)
-    if fm is None:
-        fm = {}
-
-    sub_skills = find_sub_skills(skill_dir)
-
-    # 1. metadata.json
-    meta = generate_metadata_json(fm, skill_dir, body)
-    meta_path = os.path.join(skill_dir, "metadata.json")
-    if not dry_run:
-        with open(meta_path, "w", encoding="utf-8", newline="\n") as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
-            f.write("\n")
-
-    # 2. AGENTS.md — body content from SKILL.md
-    agents_path = os.path.join(skill_dir, "AGENTS.md")
-    if not dry_run:
-        with open(agents_path, "w", encoding="utf-8", newline="\n") as f:
-            f.write(body.lstrip("\n"))
-
-    # 3. README.md
-    readme = generate_readme(fm, skill_dir, sub_skills)
-    readme_path = os.path.join(skill_dir, "README.md")
-    if not dry_run:
-        with open(readme_path, "w", encoding="utf-8", newline="\n") as f:
-            f.write(readme)
+def skill_inputs(node: SkillNode) -> dict:
+    """Fingerprint everything the rendered files depend on.
 
+    That is the skill's own SKILL.md, the SKILL.md of each immediate child
+    (the README sub-skill table), and the rule count shown in the README.
+    """
     return {
+        "skill": node.skill.sha256,
+        "children": {child.dirname: child.skill.sha256 for child in node.sub_skills},
+        "rules": count_rules(node.path),
+    }
+
+
+def outputs_match(skill_dir: str, output_hashes: dict) -> bool:
+    """True if every generated file on disk still has its recorded hash."""
+    for name in OUTPUT_FILES:
+        recorded = output_hashes.get(name)
+        if recorded is None or sha256_file(os.path.join(skill_dir, name)) != recorded:
+            return False
+    return True
+
+
+def process_skill(node: SkillNode, dry_run: bool = False, manifest: BuildManifest = None,
+                  compact: int | None = None) -> dict:
+    """Process one skill of the tree. Returns stats dict.
+
+    With a manifest (incremental mode) the skill is skipped when its inputs
+    and on-disk outputs match the previous run, and files whose rendered
+    bytes already match the disk are not rewritten. With ``compact`` (a code
+    budget), AGENTS.md is rendered compactly and the stats include its token
+    estimate before and after.
+    """
+    skill_dir = node.path
+    if not os.path.isfile(os.path.join(skill_dir, "SKILL.md")):
+        return {"skipped": True}
+
+    key = node.rel
+    inputs = None
+    if manifest is not None:
+        with profile.span("inputs"):
+            inputs = skill_inputs(node)
+        previous = manifest.get(key)
+        if (previous is not None and previous["inputs"] == inputs
+                and outputs_match(skill_dir, previous["outputs"])):
+            return {"skipped": False, "up_to_date": True, "files_skipped": len(OUTPUT_FILES)}
+
+    fm = node.frontmatter or {}
+    with profile.span("render"):
+        body = node.skill.load_body()
+        sub_skills = find_sub_skills(node)
+        rendered = render_skill_files(node, body, sub_skills, compact)
+
+        batch = OutputBatch(dry_run)
+        output_hashes = {}
+        for name, content in rendered.items():
+            data = content.encode("utf-8")
+            output_hashes[name] = sha256_bytes(data)
+            batch.add(os.path.join(skill_dir, name), data)
+    with profile.span("write"):
+        disk = batch.commit()
+
+    if manifest is not None and not dry_run:
+        manifest.set(key, inputs, output_hashes)
+
+    result = {
         "skipped": False,
         "name": fm.get("name", os.path.basename(skill_dir)),
         "sub_skills": len(sub_skills),
+        "disk": disk,
     }
+    if compact is not None:
+        with profile.span("tokens"):
+            result["agents_tokens"] = (count_tokens(body.lstrip("\n")),
+                                       count_tokens(rendered["AGENTS.md"]))
+    return result
+
+
+def print_token_report(ledger: TokenLedger, top: int) -> None:
+    total = ledger.total
+    print(f"\nEstimated tokens in SKILL.md bodies (AGENTS.md as copied): {total:,} "
+          f"in {len(ledger.skills)} skills")
+    if total:
+        print("  " + ", ".join(f"{kind} {tokens:,} ({100 * tokens / total:.0f}%)"
+                               for kind, tokens in ledger.kinds().most_common()))
+    print("By category:")
+    for category, skills, tokens in ledger.categories():
+        print(f"  {category:<24} {skills:>5} skills {tokens:>10,}")
+    print("Largest skills:")
+    for entry in ledger.largest_skills(top):
+        print(f"  {entry.tokens:>8,}  {entry.path}")
+    print("Largest sections:")
+    for rel, title, tokens in ledger.largest_sections(top):
+        print(f"  {tokens:>8,}  {rel}  {title}")
 
 
 def main():
-    dry_run = "--dry-run" in sys.argv
+    parser = argparse.ArgumentParser(
+        description="Generate metadata.json, AGENTS.md and README.md for every skill.")
+    parser.add_argument("--dry-run", action="store_true", help="do not write any files")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only regenerate skills whose inputs changed since the last run")
+    parser.add_argument("--compact", action="store_true",
+                        help="write a compact AGENTS.md and report the tokens each skill saves")
+    parser.add_argument("--code-budget", type=int, default=300, metavar="TOKENS",
+                        help="with --compact, trim code blocks to about this many tokens "
+                             "(0 = no limit, default: 300)")
+    parser.add_argument("--tokens", metavar="N", type=int, nargs="?", const=10,
+                        help="estimate tokens per section, skill and category and list the "
+                             "N largest (default N: 10)")
+    parser.add_argument("--tokens-json", metavar="PATH",
+                        help="also write the full token accounting as JSON to PATH")
+    parser.add_argument("--check-parse-once", action="store_true",
+                        help="exit 1 unless every SKILL.md was parsed exactly once")
+    profile.add_arguments(parser)
+    args = parser.parse_args()
+    profile.configure(args)
+    dry_run = args.dry_run
+    incremental = args.incremental
+    compact = args.code_budget if args.compact else None
+    ledger = TokenLedger() if args.tokens is not None or args.tokens_json else None
 
     if not os.path.isdir(SKILLS_ROOT):
         print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
         sys.exit(1)
 
-    # Collect all skill directories
-    skill_dirs = []
-    for root, dirs, files in os.walk(SKILLS_ROOT):
-        if "SKILL.md" in files:
-            skill_dirs.append(root)
-    skill_dirs.sort()
+    # Collect all skill directories; the tree parses each SKILL.md once
+    with profile.span("discovery"):
+        skill_dirs = discover_skill_dirs(SKILLS_ROOT)
+        tree = SkillTree(skill_dirs, SKILLS_ROOT)
 
     print(f"Found {len(skill_dirs)} skill directories")
     if dry_run:
         print("DRY RUN — no files will be written")
 
+    manifest = None
+    if incremental:
+        header = {"version": MANIFEST_VERSION, "date": DATE}
+        if compact is not None:
+            header["compact"] = compact
+        manifest = BuildManifest(MANIFEST_NAME, header)
+
     processed = 0
     skipped = 0
+    up_to_date = 0
+    files_skipped = 0
+    agents_before = agents_after = 0
+    disk = WriteStats()
     for sd in skill_dirs:
-        result = process_skill(sd, dry_run)
+        node = tree.node(sd)
+        with profile.skill(node.rel):
+            result = process_skill(node, dry_run, manifest, compact)
+            if ledger is not None and not result.get("skipped"):
+                with profile.span("tokens"):
+                    ledger.add(node.rel, node.skill.load_body())
         if result.get("skipped"):
             skipped += 1
+        elif result.get("up_to_date"):
+            up_to_date += 1
+            files_skipped += result["files_skipped"]
         else:
             processed += 1
+            disk.add(result["disk"])
             rel = os.path.relpath(sd, SKILLS_ROOT).replace("\\", "/")
             subs = result.get("sub_skills", 0)
             sub_note = f" ({subs} sub-skills)" if subs > 0 else ""
-            print(f"  OK: {rel}{sub_note}")
+            token_note = ""
+            if "agents_tokens" in result:
+                before, after = result["agents_tokens"]
+                agents_before += before
+                agents_after += after
+                token_note = f" [AGENTS.md {before:,} -> {after:,} tokens]"
+            print(f"  OK: {rel}{sub_note}{token_note}")
+
+    with profile.span("save"):
+        save_cache()
+        if manifest is not None and not dry_run:
+            manifest.prune(tree.nodes)
+            manifest.save()
 
     print(f"\nDone: {processed} processed, {skipped} skipped")
+    if incremental:
+        print(f"Up to date: {up_to_date} skills")
+        print(f"Files: {disk.written} regenerated, {files_skipped} skipped (inputs unchanged), "
+              f"{disk.unchanged} unchanged (identical output)")
+    print(f"Disk {'changes (dry run)' if dry_run else 'changes'}: {disk.summary()}")
+    if compact is not None and agents_before:
+        saved = agents_before - agents_after
+        print(f"Compact AGENTS.md: {agents_before:,} -> {agents_after:,} estimated tokens "
+              f"({saved:,} saved, {100 * saved / agents_before:.1f}%)")
+    if ledger is not None:
+        if args.tokens is not None:
+            print_token_report(ledger, args.tokens)
+        if args.tokens_json:
+            batch = OutputBatch(dry_run)
+            batch.add(args.tokens_json, json.dumps(ledger.to_json(), indent=1) + "\n")
+            batch.commit()
+    profile.finish(args)
+    if args.check_parse_once:
+        try:
+            tree.assert_parsed_once()
+        except AssertionError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Generate skills-index.json: a one-pass index of every skill under skills/.
+
+Each entry holds the skill's path, name, cleaned description, tags,
+parent/children, rule count and SKILL.md content hash. Other scripts use the
+index (via skilllib.index.discover_skill_dirs) instead of re-walking skills/.
+
+Usage:
+    python scripts/generate-skills-index.py                 # full rebuild
+    python scripts/generate-skills-index.py skills/ai/a2a   # update listed skills only
+    python scripts/generate-skills-index.py --check         # exit 1 if out of date
+"""
+
+import argparse
+import os
+import sys
+
+from skilllib import save_cache
+from skilllib.index import (
+    INDEX_PATH,
+    SKILLS_ROOT,
+    build_index,
+    load_index,
+    load_state,
+    render_index,
+    update_index,
+    write_index,
+)
+
+
+def to_skill_rel(arg: str) -> str:
+    """Map a CLI path (skill dir or its SKILL.md) to a path relative to skills/."""
+    path = os.path.abspath(arg)
+    if os.path.basename(path) == "SKILL.md":
+        path = os.path.dirname(path)
+    rel = os.path.relpath(path, SKILLS_ROOT).replace("\\", "/")
+    if rel.startswith(".."):
+        raise ValueError(f"not under skills/: {arg}")
+    return rel
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate skills-index.json.")
+    parser.add_argument("paths", nargs="*",
+                        help="skill directories to update incrementally (default: rebuild all)")
+    parser.add_argument("--check", action="store_true",
+                        help="do not write; exit 1 if skills-index.json is out of date")
+    args = parser.parse_args()
+
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        sys.exit(1)
+
+    existing = load_index()
+    rel_index = os.path.relpath(INDEX_PATH).replace("\\", "/")
+
+    if args.paths and existing is not None and not args.check:
+        try:
+            changed = [to_skill_rel(p) for p in args.paths]
+        except ValueError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            sys.exit(1)
+        dirs = load_state().get("dirs", {})
+        touched = update_index(existing, dirs, changed)
+        wrote = write_index(existing, dirs)
+        save_cache()
+        print(f"Updated {len(touched)} of {len(existing)} skills in {rel_index}"
+              f"{'' if wrote else ' (unchanged)'}")
+        return
+
+    entries, dirs = build_index()
+    save_cache()
+    if args.check:
+        try:
+            with open(INDEX_PATH, "r", encoding="utf-8") as f:
+                current = f.read()
+        except OSError:
+            current = None
+        if current != render_index(entries):
+            print(f"{rel_index} is out of date; run: python scripts/generate-skills-index.py",
+                  file=sys.stderr)
+            sys.exit(1)
+        print(f"{rel_index} is up to date ({len(entries)} skills)")
+        return
+
+    wrote = write_index(entries, dirs)
+    print(f"Indexed {len(entries)} skills in {rel_index}{'' if wrote else ' (unchanged)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Pack skills into indexed bundles for distribution and fast loading.
+
+By default writes one bundle per top-level category (dist/bundles/ai.skb,
+dist/bundles/dotnet.skb, ...); --all writes a single skills.skb for the whole
+tree. A bundle holds every file under its skills (SKILL.md, generated files,
+rules/, scripts, ...) behind a sorted table of contents with per-entry
+offsets, so one skill or rule is read with a binary search and one slice of
+an mmap; see skilllib/bundle.py for the layout.
+
+Usage:
+    python scripts/pack-skills.py [CATEGORY ...] [--all] [--compress [LEVEL]]
+                                  [--output-dir DIR] [--dry-run]
+    python scripts/pack-skills.py --list BUNDLE [SKILL]
+    python scripts/pack-skills.py --cat BUNDLE PATH
+    python scripts/pack-skills.py --verify BUNDLE [BUNDLE ...]
+
+Bundles are deterministic: a bundle whose bytes would not change is not
+rewritten.
+"""
+
+import argparse
+import os
+import sys
+
+from skilllib.bundle import BUNDLE_SUFFIX, BundleError, SkillBundle, collect_files, pack_bundle
+from skilllib.index import SKILLS_ROOT
+from skilllib.output import OutputBatch, WriteStats, format_bytes
+from skilllib.parsing import REPO_ROOT
+
+
+DEFAULT_OUTPUT_DIR = os.path.join(REPO_ROOT, "dist", "bundles")
+
+
+def categories() -> list[str]:
+    return sorted(name for name in os.listdir(SKILLS_ROOT)
+                  if os.path.isdir(os.path.join(SKILLS_ROOT, name)) and not name.startswith("."))
+
+
+def build(args) -> int:
+    if args.all:
+        targets = [("skills", SKILLS_ROOT)]
+    else:
+        known = categories()
+        unknown = sorted(set(args.categories) - set(known))
+        if unknown:
+            print(f"ERROR: unknown categor{'y' if len(unknown) == 1 else 'ies'}: "
+                  f"{', '.join(unknown)}", file=sys.stderr)
+            return 2
+        targets = [(name, os.path.join(SKILLS_ROOT, name)) for name in args.categories or known]
+
+    disk = WriteStats()
+    totals = {"files": 0, "raw_bytes": 0, "bundle_bytes": 0}
+    for name, top in targets:
+        files = collect_files(top)
+        data, stats = pack_bundle(name, files, compress_level=args.compress)
+        batch = OutputBatch(args.dry_run)
+        batch.add(os.path.join(args.output_dir, name + BUNDLE_SUFFIX), data)
+        disk.add(batch.commit())
+        for key in totals:
+            totals[key] += stats[key]
+        print(f"  {name + BUNDLE_SUFFIX:<24} {stats['skills']:>4} skills {stats['files']:>6} files "
+              f"{format_bytes(stats['raw_bytes']):>10} -> {format_bytes(stats['bundle_bytes']):>10}")
+
+    print(f"\nPacked {totals['files']} files into {len(targets)} bundle(s): "
+          f"{format_bytes(totals['raw_bytes'])} -> {format_bytes(totals['bundle_bytes'])}")
+    print(f"Disk {'changes (dry run)' if args.dry_run else 'changes'}: {disk.summary()}")
+    return 0
+
+
+def list_bundle(path: str, skill: str | None) -> int:
+    with SkillBundle(path) as bundle:
+        if skill is not None:
+            files = bundle.skill_files(skill)
+            if not files:
+                print(f"ERROR: no skill {skill!r} in {path}", file=sys.stderr)
+                return 1
+            for rel, data in files.items():
+                print(f"{len(data):>9}  {rel}")
+            return 0
+        for entry in bundle.entries():
+            mark = "z" if entry.compressed else " "
+            print(f"{entry.size:>9} {entry.stored:>9} {mark}  {entry.path}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack skills into indexed bundles.")
+    parser.add_argument("categories", nargs="*",
+                        help="top-level categories to pack (default: every category)")
+    parser.add_argument("--all", action="store_true",
+                        help="write one bundle for the whole skills/ tree")
+    parser.add_argument("--compress", metavar="LEVEL", type=int, nargs="?", const=6,
+                        choices=range(0, 10),
+                        help="zlib-compress each entry that shrinks (level 0-9, default 6)")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help="where bundles are written (default: dist/bundles)")
+    parser.add_argument("--dry-run", action="store_true", help="do not write any files")
+    parser.add_argument("--list", metavar="BUNDLE",
+                        help="list a bundle's entries, or one skill's files if a SKILL is given")
+    parser.add_argument("--cat", metavar="BUNDLE",
+                        help="write one entry of a bundle (PATH relative to skills/) to stdout")
+    parser.add_argument("--verify", action="store_true",
+                        help="check every entry of the given bundles against its CRC-32")
+    args = parser.parse_args()
+
+    try:
+        if args.list:
+            if len(args.categories) > 1:
+                parser.error("--list takes at most one SKILL")
+            return list_bundle(args.list, args.categories[0] if args.categories else None)
+        if args.cat:
+            if len(args.categories) != 1:
+                parser.error("--cat needs exactly one PATH")
+            with SkillBundle(args.cat) as bundle:
+                sys.stdout.buffer.write(bundle.read(args.categories[0]))
+            return 0
+        if args.verify:
+            if not args.categories:
+                parser.error("--verify needs at least one BUNDLE")
+            failed = 0
+            for path in args.categories:
+                with SkillBundle(path) as bundle:
+                    bad = bundle.verify()
+                    status = "OK" if not bad else f"{len(bad)} corrupt entries"
+                    print(f"{path}: {len(bundle)} entries, {status}")
+                    for rel in bad:
+                        print(f"  - {rel}")
+                failed += bool(bad)
+            return 1 if failed else 0
+    except KeyError as exc:
+        print(f"ERROR: no entry {exc.args[0]!r} in {args.cat}", file=sys.stderr)
+        return 1
+    except (OSError, BundleError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        return 1
+    return build(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
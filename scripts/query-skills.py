@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Query rules and skills with boolean filters on tags, impact, path and text.
+
+Answers questions such as "which HIGH-impact rules mention security in the
+dotnet tree?" from one precompiled, columnar store (.cache/query-store.bin,
+skilllib/query.py) instead of reading rules/*.md. The store is built from
+each skill's SKILL.md and rules/_index.json (written by generate-rules.py),
+and refreshed automatically before a query when any SKILL.md or rules/ dir
+has changed; only the changed skills are read again.
+
+Usage:
+    python scripts/query-skills.py 'impact:HIGH text:security path:dotnet'
+    python scripts/query-skills.py '(tag:azure OR tag:aws) impact:high+' --paths
+    python scripts/query-skills.py --skills 'tag:python -text:deprecated' --json
+    python scripts/query-skills.py --build             # refresh the store only
+    python scripts/query-skills.py --rebuild           # re-read every skill
+
+Filters: tag:NAME (tag:NAME* for a prefix), impact:LEVEL (impact:LEVEL+ for
+that level or more severe), path:DIR (path:PREFIX* for a raw prefix), and
+text:WORDS or bare words (text at the start of a word; quote phrases).
+Adjacent filters are ANDed; OR, AND, NOT, a leading - and parentheses
+combine them. Rules are listed in path order.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from skilllib import save_cache
+from skilllib.index import SKILLS_ROOT
+from skilllib.query import QueryError, build_query_store, open_store, query_store_path
+
+
+def print_table(store, rows: list[int], table: str) -> None:
+    if not rows:
+        print(f"No matching {table}.")
+        return
+    if table == "rules":
+        found = [store.rule(i) for i in rows]
+        width = max(len(r["path"]) for r in found) + len("skills/")
+        for r in found:
+            print(f"{r['impact']:<8}  {'skills/' + r['path']:<{width}}  {r['title']}")
+    else:
+        found = [store.skill(i) for i in rows]
+        width = max(len(s["path"]) for s in found) + len("skills/")
+        for s in found:
+            desc = s["description"]
+            desc = desc if len(desc) <= 80 else desc[:77] + "..."
+            print(f"{'skills/' + s['path']:<{width}}  {s['rules']:>3} rules  {desc}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query rules and skills with boolean filters.")
+    parser.add_argument("query", nargs="*", help="filters, e.g. impact:HIGH tag:security path:dotnet")
+    parser.add_argument("--skills", action="store_true", help="query skills instead of rules")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="print results as JSON")
+    output.add_argument("--paths", action="store_true", help="print only the matching paths")
+    parser.add_argument("-n", "--limit", type=int, help="maximum results (default: all)")
+    parser.add_argument("--build", action="store_true",
+                        help="refresh the store (changed skills only) and exit")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="re-read every skill and rewrite the store")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="query the existing store without checking for changes")
+    parser.add_argument("--time", action="store_true", help="report query time on stderr")
+    args = parser.parse_args()
+
+    if not args.query and not (args.build or args.rebuild):
+        parser.error("a query is required unless --build or --rebuild is given")
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        sys.exit(1)
+
+    path = query_store_path()
+    store = None if args.rebuild else open_store(path)
+    if args.build or args.rebuild or store is None or (
+            not args.no_refresh and not store.is_current()):
+        if store is not None:
+            store.close()
+        started = time.perf_counter()
+        stats = build_query_store(full=args.rebuild)
+        save_cache()
+        elapsed = time.perf_counter() - started
+        if args.build or args.rebuild or not args.query:
+            state = "written" if stats.written else "unchanged"
+            print(f"Stored {stats.rules} rules from {stats.skills} skills "
+                  f"({stats.reread} read, {state}) in {elapsed:.2f}s")
+        if not args.query:
+            return
+        store = open_store(path)
+        if store is None:
+            print(f"ERROR: could not open query store: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    table = "skills" if args.skills else "rules"
+    with store:
+        started = time.perf_counter()
+        try:
+            rows = store.query(" ".join(args.query), table, args.limit)
+        except QueryError as e:
+            parser.error(str(e))
+        elapsed = time.perf_counter() - started
+
+        if args.json:
+            found = [store.rule(i) if table == "rules" else store.skill(i) for i in rows]
+            for item in found:
+                item["path"] = f"skills/{item['path']}"
+                if "skill" in item:
+                    item["skill"] = f"skills/{item['skill']}"
+            print(json.dumps(found, indent=2, ensure_ascii=False))
+        elif args.paths:
+            column = store.rule_path if table == "rules" else store.skill_path
+            for i in rows:
+                print(f"skills/{column[i].decode('utf-8')}")
+        else:
+            print_table(store, rows, table)
+    if args.time:
+        print(f"{len(rows)} {table} in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Search skills by content with a persistent BM25 index.
+
+The index covers each skill's name, cleaned description, metadata.tags, rule
+titles (rules/*.md) and SKILL.md body. It lives in .cache/search-index.bin and
+is refreshed automatically before a query when any SKILL.md or rules/ dir has
+changed; only the changed skills are re-tokenized.
+
+Usage:
+    python scripts/search-skills.py "dependency injection"
+    python scripts/search-skills.py --limit 5 --json kubernetes helm
+    python scripts/search-skills.py --build            # refresh the index only
+    python scripts/search-skills.py --rebuild          # re-tokenize every skill
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from skilllib import save_cache
+from skilllib.index import SKILLS_ROOT
+from skilllib.search import SearchIndex, build_search_index, search_index_path
+
+
+def open_index(path: str):
+    try:
+        return SearchIndex(path)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over skills.")
+    parser.add_argument("query", nargs="*", help="search terms")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="maximum results (default: 10)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--build", action="store_true",
+                        help="refresh the index (changed skills only) and exit")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="re-tokenize every skill and rewrite the index")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="query the existing index without checking for changes")
+    parser.add_argument("--time", action="store_true", help="report query time on stderr")
+    args = parser.parse_args()
+
+    if not args.query and not (args.build or args.rebuild):
+        parser.error("a query is required unless --build or --rebuild is given")
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        sys.exit(1)
+
+    path = search_index_path()
+    index = None if args.rebuild else open_index(path)
+    if args.build or args.rebuild or index is None or (
+            not args.no_refresh and not index.is_current()):
+        if index is not None:
+            index.close()
+        started = time.perf_counter()
+        stats = build_search_index(full=args.rebuild)
+        save_cache()
+        elapsed = time.perf_counter() - started
+        if args.build or args.rebuild or not args.query:
+            state = f"{stats.terms} terms written" if stats.written else "unchanged"
+            print(f"Indexed {stats.documents} skills ({stats.tokenized} tokenized, "
+                  f"{stats.removed} removed, {state}) in {elapsed:.2f}s")
+        if not args.query:
+            return
+        index = open_index(path)
+        if index is None:
+            print(f"ERROR: could not open search index: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    with index:
+        started = time.perf_counter()
+        hits = index.search(" ".join(args.query), limit=args.limit)
+        elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps([
+            {"path": f"skills/{h.path}", "name": h.name, "score": round(h.score, 4),
+             "description": h.description}
+            for h in hits
+        ], indent=2, ensure_ascii=False))
+    elif not hits:
+        print("No matching skills.")
+    else:
+        width = max(len(h.path) for h in hits) + len("skills/")
+        for h in hits:
+            desc = h.description if len(h.description) <= 80 else h.description[:77] + "..."
+            print(f"{h.score:7.2f}  {'skills/' + h.path:<{width}}  {desc}")
+    if args.time:
+        print(f"{len(hits)} results in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Shared helpers for the scripts/ tooling.
+
+The scripts in this directory are run directly (``python scripts/<name>.py``),
+which puts scripts/ on ``sys.path`` so they can ``import skilllib``.
+"""
+
+from .frontmatter import BodyView, FrontmatterView, SkillHeader, read_frontmatter
+from .markdown import BP_HEADERS, count_code_blocks, extract_best_practices, extract_headings
+from .parsing import (
+    FENCE_MISSING,
+    FENCE_OK,
+    FENCE_UNTERMINATED,
+    ParsedSkill,
+    SkillParseCache,
+    get_cache,
+    load_frontmatter,
+    load_skill,
+    parse_skill_md,
+    save_cache,
+)
+
+__all__ = [
+    "BP_HEADERS",
+    "BodyView",
+    "FENCE_MISSING",
+    "FENCE_OK",
+    "FENCE_UNTERMINATED",
+    "FrontmatterView",
+    "ParsedSkill",
+    "SkillHeader",
+    "SkillParseCache",
+    "count_code_blocks",
+    "extract_best_practices",
+    "extract_headings",
+    "get_cache",
+    "load_frontmatter",
+    "load_skill",
+    "parse_skill_md",
+    "read_frontmatter",
+    "save_cache",
+]
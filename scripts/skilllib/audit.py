@@ -0,0 +1,214 @@
+"""Quality metrics for SKILL.md bodies, stored column-wise.
+
+``measure_body`` gathers every metric the audit needs (length, code blocks,
+tables, ``##`` sections, boilerplate phrases, and the Best Practices
+section's item counts) in one call per file. Each metric is a precompiled
+C-level scan; a combined single-regex tokenizer was measured 2-3x slower in
+CPython, because the engine loses its literal-prefix skipping once the
+patterns are alternated.
+
+Rows are collected into a ``MetricTable``, which keeps one typed array per
+metric so the report's sort, score brackets and filters run as whole-column
+operations, and which exports to CSV for trend tracking.
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import os
+import re
+from array import array
+from itertools import compress
+
+from .parsing import load_skill
+from .profile import skill, span
+
+
+BOILERPLATE_PHRASES = [
+    "use appropriate",
+    "configure as needed",
+    "follow best practices",
+    "leverage built-in",
+    "extend as needed",
+    "use conventions",
+    "keep tests focused",
+    "use health checks",
+    "implement circuit breakers",
+    "configure timeout policies",
+    "add custom middleware",
+    "monitor proxy metrics",
+    "monitor metrics",
+    "choose appropriate",
+    "as needed",
+]
+
+SCORE_BRACKETS = [
+    (float("-inf"), 0, "CRITICAL (<0)"),
+    (0, 10, "LOW (0-9)"),
+    (10, 25, "MEDIUM (10-24)"),
+    (25, 50, "GOOD (25-49)"),
+    (50, float("inf"), "EXCELLENT (50+)"),
+]
+
+_CODE_FENCE_RE = re.compile(r"```\w+")
+_TABLE_ROW_RE = re.compile(r"\|.*\|.*\|")
+_SECTION_RE = re.compile(r"^## ", re.MULTILINE)
+_OVERVIEW_RE = re.compile(r"^## Overview", re.MULTILINE)
+_EXAMPLE_RE = re.compile(r"^## Example", re.MULTILINE)
+_BP_SECTION_RE = re.compile(r"## Best Practices\s*\n(.*?)(?=\n## |\Z)", re.DOTALL)
+_BP_ITEM_RE = re.compile(r"^- ", re.MULTILINE)
+
+# (name, array typecode or None for an object column)
+COLUMNS = (
+    ("path", None),
+    ("body_len", "q"),
+    ("code_blocks", "l"),
+    ("tables", "l"),
+    ("sections", "l"),
+    ("bp_items", "l"),
+    ("generic", "l"),
+    ("generic_found", None),
+    ("bp_generic", "l"),
+    ("thin_bp", "l"),
+    ("score", "q"),
+    ("has_overview", "b"),
+    ("has_example", "b"),
+)
+
+
+def quality_score(body_len: int, code_blocks: int, tables: int, sections: int,
+                  bp_items: int, generic: int) -> int:
+    score = code_blocks * 3 + tables * 2 + sections * 2 + bp_items - generic * 2
+    if body_len < 500:
+        score -= 20
+    elif body_len < 1000:
+        score -= 10
+    elif body_len < 2000:
+        score -= 5
+    return score
+
+
+def measure_body(body: str, phrases=BOILERPLATE_PHRASES) -> dict:
+    """Every audit metric for ``body``, from one lowercased copy and
+    precompiled scans (the body is never re-read or re-lowered per metric)."""
+    code_blocks = len(_CODE_FENCE_RE.findall(body))
+    tables = len(_TABLE_ROW_RE.findall(body))
+    sections = len(_SECTION_RE.findall(body))
+
+    lower = body.lower()
+    phrase_counts = [lower.count(phrase) for phrase in phrases]
+    generic = sum(phrase_counts)
+
+    bp_items = thin_bp = bp_generic = 0
+    bp_match = _BP_SECTION_RE.search(body)
+    if bp_match:
+        bp_text = bp_match.group(1)
+        bp_items = len(_BP_ITEM_RE.findall(bp_text))
+        bp_lower = bp_text.lower()
+        bp_generic = sum(bp_lower.count(phrase) for phrase in phrases)
+        for line in bp_text.splitlines():
+            stripped = line.strip()
+            if stripped.startswith("- ") and len(stripped) < 40:
+                thin_bp += 1
+
+    return {
+        "body_len": len(body),
+        "code_blocks": code_blocks,
+        "tables": tables,
+        "sections": sections,
+        "bp_items": bp_items,
+        "generic": generic,
+        "generic_found": [p for p, n in zip(phrases, phrase_counts) if n],
+        "bp_generic": bp_generic,
+        "thin_bp": thin_bp,
+        "score": quality_score(len(body), code_blocks, tables, sections, bp_items, generic),
+        "has_overview": bool(_OVERVIEW_RE.search(body)),
+        "has_example": bool(_EXAMPLE_RE.search(body)),
+    }
+
+
+def measure_skill(skill_dir: str, skills_root: str) -> dict | None:
+    """Metrics row for one skill dir, or None if its SKILL.md has no frontmatter."""
+    with span("parse"):
+        parsed = load_skill(os.path.join(skill_dir, "SKILL.md"))
+    if not parsed.has_frontmatter:
+        return None
+    row = {"path": os.path.relpath(skill_dir, skills_root).replace("\\", "/")}
+    with span("measure"):
+        row.update(measure_body(parsed.load_body()))
+    return row
+
+
+class MetricTable:
+    """Column-oriented metrics: one typed array (or list) per column."""
+
+    def __init__(self, columns=COLUMNS):
+        self.schema = tuple(columns)
+        self.columns = {
+            name: (array(code) if code else []) for name, code in self.schema
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["path"])
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def append(self, row: dict) -> None:
+        for name, _ in self.schema:
+            self.columns[name].append(row[name])
+
+    def row(self, i: int) -> dict:
+        return {name: self.columns[name][i] for name, _ in self.schema}
+
+    def take(self, indices) -> "MetricTable":
+        """New table holding the rows at ``indices``, in that order."""
+        indices = list(indices)
+        out = MetricTable(self.schema)
+        for name, code in self.schema:
+            col = self.columns[name]
+            values = [col[i] for i in indices]
+            out.columns[name] = array(code, values) if code else values
+        return out
+
+    def where(self, mask) -> "MetricTable":
+        """Rows where ``mask`` (an iterable of booleans, one per row) is true."""
+        return self.take(compress(range(len(self)), mask))
+
+    def argsort(self, name: str) -> list[int]:
+        """Stable ascending order of row indices by column ``name``."""
+        col = self.columns[name]
+        return sorted(range(len(col)), key=col.__getitem__)
+
+    def sort_by(self, name: str) -> "MetricTable":
+        return self.take(self.argsort(name))
+
+    def bracket_counts(self, name: str, brackets=SCORE_BRACKETS) -> list[tuple[str, int]]:
+        """Rows per half-open [lo, hi) bracket, by bisecting the sorted column."""
+        values = sorted(self.columns[name])
+        counts = []
+        for lo, hi, label in brackets:
+            counts.append((label, bisect.bisect_left(values, hi) - bisect.bisect_left(values, lo)))
+        return counts
+
+    def to_csv(self, f) -> None:
+        """Write the table as CSV; list columns are joined with ';'."""
+        writer = csv.writer(f, lineterminator="\n")
+        names = [name for name, _ in self.schema]
+        writer.writerow(names)
+        cols = [self.columns[name] for name in names]
+        for values in zip(*cols):
+            writer.writerow([
+                ";".join(v) if isinstance(v, list) else v for v in values
+            ])
+
+
+def audit_skills(skill_dirs, skills_root: str) -> MetricTable:
+    table = MetricTable()
+    for skill_dir in skill_dirs:
+        with skill(os.path.relpath(skill_dir, skills_root).replace("\\", "/")):
+            row = measure_skill(skill_dir, skills_root)
+        if row is not None:
+            table.append(row)
+    return table
@@ -0,0 +1,275 @@
+"""Packed skill bundles: one indexed file per category (or the whole tree).
+
+A bundle holds every file under its skills, so a consumer can read one skill
+or one rule without walking directories or opening thousands of small files.
+The layout, read through mmap, follows the search index::
+
+    b"SKBNDL01" | u32 header length | header JSON
+    | u32[n+1] path byte offsets | entry records
+    | path bytes (sorted UTF-8) | entry data
+
+The header lists the bundled skills (directories relative to skills/). An
+entry record is ``<QIIIIi``: absolute data offset, stored length, original
+length, CRC-32 of the original bytes, flags, and the index of the skill that
+owns the file (-1 for files outside any skill). Paths are relative to skills/
+and sorted, and entry data is laid out in the same order, so a lookup is a
+binary search over the path table plus one slice of the map, and a skill's
+files (with its sub-skills') sit in one contiguous range. With compression, each entry is
+zlib-compressed on its own (flag bit 0) and only when that makes it smaller.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+
+from .index import SKILLS_ROOT, nearest_parent
+
+
+BUNDLE_VERSION = 1
+MAGIC = b"SKBNDL01"
+BUNDLE_SUFFIX = ".skb"
+FLAG_ZLIB = 1
+
+# Directories never bundled (VCS, caches, build tooling inside a skill).
+SKIP_DIRS = frozenset({".git", ".cache", "__pycache__", "node_modules"})
+
+_U32 = struct.Struct("<I")
+_ENTRY = struct.Struct("<QIIIIi")
+
+
+@dataclass
+class BundleEntry:
+    path: str
+    offset: int
+    stored: int
+    size: int
+    crc32: int
+    flags: int
+    skill: str | None
+
+    @property
+    def compressed(self) -> bool:
+        return bool(self.flags & FLAG_ZLIB)
+
+
+def collect_files(top: str, skills_root: str = SKILLS_ROOT) -> list[str]:
+    """Every file under ``top``, as sorted paths relative to ``skills_root``."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(top):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        for name in filenames:
+            rel = os.path.relpath(os.path.join(dirpath, name), skills_root)
+            files.append(rel.replace("\\", "/"))
+    return sorted(files, key=lambda p: p.encode("utf-8"))
+
+
+def pack_bundle(name: str, files: list[str], skills_root: str = SKILLS_ROOT,
+                compress_level: int | None = None) -> tuple[bytes, dict]:
+    """Pack ``files`` (sorted, relative to ``skills_root``) into bundle bytes.
+
+    Returns the bytes and a stats dict (files, skills, raw and stored bytes).
+    Output depends only on the file contents, so an unchanged tree packs to
+    identical bytes.
+    """
+    skill_set = {os.path.dirname(rel) or "." for rel in files
+                 if os.path.basename(rel) == "SKILL.md"}
+    owners = [nearest_parent(rel, skill_set) for rel in files]
+    skills = sorted(skill_set)
+    skill_ids = {rel: i for i, rel in enumerate(skills)}
+
+    blobs = []
+    records = []
+    raw_total = 0
+    for rel in files:
+        with open(os.path.join(skills_root, rel), "rb") as f:
+            data = f.read()
+        raw_total += len(data)
+        flags = 0
+        stored = data
+        if compress_level is not None:
+            packed = zlib.compress(data, compress_level)
+            if len(packed) < len(data):
+                stored, flags = packed, FLAG_ZLIB
+        blobs.append(stored)
+        records.append([len(stored), len(data), zlib.crc32(data), flags])
+
+    header = json.dumps({
+        "version": BUNDLE_VERSION,
+        "name": name,
+        "skills": skills,
+        "n_entries": len(files),
+        "compression": "zlib" if compress_level is not None else None,
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 4)
+
+    path_blob = bytearray()
+    path_offsets = [0]
+    for rel in files:
+        path_blob += rel.encode("utf-8")
+        path_offsets.append(len(path_blob))
+
+    data_start = (len(MAGIC) + 4 + len(header) + 4 * (len(files) + 1)
+                  + _ENTRY.size * len(files) + len(path_blob))
+    out = bytearray(MAGIC)
+    out += _U32.pack(len(header))
+    out += header
+    out += struct.pack(f"<{len(files) + 1}I", *path_offsets)
+    offset = data_start
+    for record, owner in zip(records, owners):
+        out += _ENTRY.pack(offset, *record, skill_ids[owner] if owner is not None else -1)
+        offset += record[0]
+    out += path_blob
+    for blob in blobs:
+        out += blob
+    stats = {"files": len(files), "skills": len(skills), "raw_bytes": raw_total,
+             "stored_bytes": sum(len(b) for b in blobs), "bundle_bytes": len(out)}
+    return bytes(out), stats
+
+
+class BundleError(ValueError):
+    """The file is not a readable skill bundle, or an entry is corrupt."""
+
+
+class SkillBundle:
+    """Read-only, memory-mapped view of a packed bundle."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BundleError(f"empty file: {path}") from None
+        mm = self._map
+        if mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise BundleError(f"not a skill bundle: {path}")
+        try:
+            (header_len,) = _U32.unpack_from(mm, len(MAGIC))
+            start = len(MAGIC) + 4
+            header = json.loads(mm[start:start + header_len])
+            version = header.get("version")
+        except (struct.error, ValueError, AttributeError):
+            self.close()
+            raise BundleError(f"corrupt skill bundle: {path}: unreadable header") from None
+        if version != BUNDLE_VERSION:
+            self.close()
+            raise BundleError(f"skill bundle version mismatch: {path}")
+        try:
+            self.name = header["name"]
+            self.skills: list[str] = header["skills"]
+            self.compression = header["compression"]
+            self.n_entries = int(header["n_entries"])
+            pos = start + header_len
+            width = (self.n_entries + 1) * 4
+            self._records_start = pos + width
+            self._paths_start = self._records_start + _ENTRY.size * self.n_entries
+            if self.n_entries < 0 or self._paths_start > len(mm):
+                raise ValueError("path or entry table past end of file")
+            self._path_offsets = memoryview(mm)[pos:pos + width].cast("I")
+            if self._paths_start + self._path_offsets[self.n_entries] > len(mm):
+                raise ValueError("path data past end of file")
+        except (KeyError, TypeError, ValueError) as exc:
+            self.close()
+            detail = f": {exc}" if isinstance(exc, ValueError) and str(exc) else ""
+            raise BundleError(f"corrupt skill bundle: {path}{detail}") from None
+
+    def __enter__(self) -> "SkillBundle":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_entries
+
+    def __contains__(self, path: str) -> bool:
+        return self._find(path) is not None
+
+    def close(self) -> None:
+        view = self.__dict__.pop("_path_offsets", None)
+        if view is not None:
+            view.release()
+        self._map.close()
+        self._file.close()
+
+    def _path(self, i: int) -> bytes:
+        offsets = self._path_offsets
+        return self._map[self._paths_start + offsets[i]:self._paths_start + offsets[i + 1]]
+
+    def _find(self, path: str) -> int | None:
+        key = path.encode("utf-8")
+        i = bisect.bisect_left(range(self.n_entries), key, key=self._path)
+        if i < self.n_entries and self._path(i) == key:
+            return i
+        return None
+
+    def _entry(self, i: int) -> BundleEntry:
+        offset, stored, size, crc, flags, skill = _ENTRY.unpack_from(
+            self._map, self._records_start + i * _ENTRY.size)
+        try:
+            path = self._path(i).decode("utf-8")
+            owner = self.skills[skill] if skill >= 0 else None
+        except (UnicodeDecodeError, IndexError):
+            raise BundleError(f"corrupt skill bundle: {self.path}: entry {i}") from None
+        return BundleEntry(path, offset, stored, size, crc, flags, owner)
+
+    def entry(self, path: str) -> BundleEntry | None:
+        i = self._find(path)
+        return None if i is None else self._entry(i)
+
+    def entries(self):
+        """Every entry, in path order."""
+        for i in range(self.n_entries):
+            yield self._entry(i)
+
+    def read_entry(self, entry: BundleEntry, verify: bool = False) -> bytes:
+        if entry.offset + entry.stored > len(self._map):
+            raise BundleError(f"corrupt entry {entry.path} in {self.path}: data past end of file")
+        data = self._map[entry.offset:entry.offset + entry.stored]
+        if entry.compressed:
+            try:
+                data = zlib.decompress(data)
+            except zlib.error:
+                raise BundleError(f"corrupt entry {entry.path} in {self.path}") from None
+        if verify and (len(data) != entry.size or zlib.crc32(data) != entry.crc32):
+            raise BundleError(f"corrupt entry {entry.path} in {self.path}")
+        return data
+
+    def read(self, path: str) -> bytes:
+        """Bytes of one file (path relative to skills/); KeyError if absent."""
+        entry = self.entry(path)
+        if entry is None:
+            raise KeyError(path)
+        return self.read_entry(entry)
+
+    def skill_files(self, skill: str) -> dict[str, bytes]:
+        """{path: bytes} of the files owned by ``skill`` (not its sub-skills)."""
+        prefix = "" if skill == "." else skill.rstrip("/") + "/"
+        key = prefix.encode("utf-8")
+        start = bisect.bisect_left(range(self.n_entries), key, key=self._path)
+        files = {}
+        for i in range(start, self.n_entries):
+            entry = self._entry(i)
+            if not entry.path.startswith(prefix):
+                break
+            if entry.skill == skill:
+                files[entry.path] = self.read_entry(entry)
+        return files
+
+    def verify(self) -> list[str]:
+        """Paths whose stored bytes do not match their recorded length and CRC."""
+        bad = []
+        for entry in self.entries():
+            try:
+                self.read_entry(entry, verify=True)
+            except BundleError:
+                bad.append(entry.path)
+        return bad
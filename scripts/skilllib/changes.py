@@ -0,0 +1,92 @@
+"""Map changed files to the skill directories they affect.
+
+A file belongs to the nearest ancestor directory that contains SKILL.md
+(within one of the skill roots). When a SKILL.md itself is added, edited or
+removed, the immediate parent skill is affected too, because its generated
+README.md lists each child's name and description in the sub-skills table.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+
+from .parsing import REPO_ROOT
+
+
+class GitError(RuntimeError):
+    """A git command failed (unknown ref, not a repository, git missing)."""
+
+
+def git_output(args: list[str], cwd: str = REPO_ROOT) -> list[str]:
+    """Run git and return its NUL-separated output (callers pass -z)."""
+    try:
+        proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, check=False)
+    except OSError as exc:
+        raise GitError(f"could not run git: {exc}") from exc
+    if proc.returncode != 0:
+        message = proc.stderr.decode("utf-8", "replace").strip()
+        raise GitError(message or f"git {' '.join(args)} exited with {proc.returncode}")
+    return [p for p in proc.stdout.decode("utf-8", "surrogateescape").split("\0") if p]
+
+
+def resolve_commit(ref: str, cwd: str = REPO_ROOT) -> str:
+    """Full commit hash for ``ref``; raises GitError if it does not name a commit."""
+    try:
+        out = git_output(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"], cwd)
+    except GitError:
+        raise GitError(f"unknown revision: {ref}") from None
+    return out[0].strip()
+
+
+def git_changed_files(ref: str, cwd: str = REPO_ROOT) -> list[str]:
+    """Repo-relative paths that differ between ``ref`` and the working tree.
+
+    Covers committed, staged and unstaged changes plus untracked files. Renames
+    are reported as a delete and an add so both locations are considered.
+    """
+    resolve_commit(ref, cwd)
+    changed = git_output(["diff", "--name-only", "-z", "--no-renames", ref, "--"], cwd)
+    untracked = git_output(["ls-files", "--others", "--exclude-standard", "-z"], cwd)
+    return sorted(set(changed) | set(untracked))
+
+
+def _under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip("/") + "/")
+
+
+def owning_skill_dir(path: str, roots, base: str = REPO_ROOT) -> str | None:
+    """Nearest existing ancestor of ``path`` (inclusive) that has a SKILL.md.
+
+    ``path`` and ``roots`` are relative to ``base``; the search stops at the
+    skill root. Returns None for paths outside every root.
+    """
+    path = path.replace("\\", "/").rstrip("/")
+    root = next((r for r in roots if _under(path, r)), None)
+    if root is None:
+        return None
+    current = path
+    while _under(current, root):
+        if os.path.isfile(os.path.join(base, current, "SKILL.md")):
+            return current
+        if current == root:
+            break
+        current = os.path.dirname(current)
+    return None
+
+
+def affected_skill_dirs(paths, roots, base: str = REPO_ROOT) -> list[str]:
+    """Sorted skill dirs owning ``paths``, plus parents whose README lists them."""
+    roots = [r.replace("\\", "/").rstrip("/") for r in roots]
+    affected = set()
+    for path in paths:
+        path = path.replace("\\", "/")
+        owner = owning_skill_dir(path, roots, base)
+        if owner is not None:
+            affected.add(owner)
+        if os.path.basename(path) == "SKILL.md":
+            parent = os.path.dirname(os.path.dirname(path))
+            if any(_under(parent, r) for r in roots) and os.path.isfile(
+                    os.path.join(base, parent, "SKILL.md")):
+                affected.add(parent)
+    return sorted(affected)
@@ -0,0 +1,233 @@
+"""Cross-skill consistency checks that per-skill validation cannot see.
+
+Runs over every skill at once and reports:
+
+  - ``duplicate-name``: skills sharing a ``name``;
+  - ``name-variant``: names that differ only in case, punctuation or a
+    trailing "s" (``event-driven`` / ``EventDriven``, ``hook`` / ``hooks``);
+  - ``tag-variant``: ``metadata.tags`` spelled in near-identical ways, also
+    within one edit for longer tags (``kubernetes`` / ``kubernets``);
+  - ``duplicate-description`` and ``similar-description``: descriptions that
+    are identical once normalized, or close by MinHash (skilllib/dedup.py);
+  - ``readme-sub-skills``: a README whose ``## Sub-skills`` table is missing
+    an immediate sub-skill or lists a directory that is not one.
+
+Nothing is compared pairwise. Names, tags and normalized descriptions are
+hashed into indexes once. Spelling variants share a bucket because each key
+is filed under itself, its singular and (for edits) every one-character
+deletion of itself. Descriptions are bucketed by MinHash band. A value is
+then compared only with the first value of each bucket it lands in, so the
+work grows linearly with the number of skills and tags.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+from .dedup import BANDS, ROWS, signature, similarity
+
+
+# One-edit tag matches are only trusted on keys at least this long; shorter
+# tags differ by one letter too often on purpose (csharp / fsharp).
+MIN_EDIT_KEY = 7
+DESCRIPTION_SHINGLE = 3
+
+_KEY_RE = re.compile(r"[^a-z0-9]+")
+_WORD_RE = re.compile(r"\w+")
+_SUB_SKILLS_RE = re.compile(r"^## Sub-skills[ \t]*\n(.*?)(?=^## |\Z)", re.DOTALL | re.MULTILINE)
+_SUB_SKILL_ROW_RE = re.compile(r"^\|\s*\[`([^`]+?)/?`\]\(", re.MULTILINE)
+
+
+@dataclass
+class SkillFacts:
+    """What the checks need from one skill."""
+
+    path: str                      # relative to skills/
+    name: str
+    tags: list[str] = field(default_factory=list)
+    description: str = ""          # raw frontmatter description
+    sub_skills: list[str] = field(default_factory=list)   # immediate child dir names
+    readme: str | None = None      # README.md text, if the skill has sub-skills
+
+
+@dataclass
+class Finding:
+    check: str
+    message: str
+    skills: list[str]
+
+    def to_json(self) -> dict:
+        return {"check": self.check, "message": self.message, "skills": self.skills}
+
+
+def normalize_key(text: str) -> str:
+    """Lower-case alphanumerics only: ``Event_Driven`` -> ``eventdriven``."""
+    return _KEY_RE.sub("", text.lower())
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Levenshtein distance <= 1, or one adjacent transposition."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) < len(b):
+        return a[i:] == b[i + 1:]
+    return (a[i + 1:] == b[i + 1:]
+            or (i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]))
+
+
+class _Groups:
+    """Union-find over hashable values, keeping first-seen order."""
+
+    def __init__(self):
+        self.parent: dict = {}
+
+    def add(self, value) -> None:
+        self.parent.setdefault(value, value)
+
+    def root(self, value):
+        parent = self.parent
+        while parent[value] != value:
+            parent[value] = parent[parent[value]]
+            value = parent[value]
+        return value
+
+    def union(self, a, b) -> None:
+        ra, rb = self.root(a), self.root(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+    def groups(self) -> list[list]:
+        members: dict = {}
+        for value in self.parent:
+            members.setdefault(self.root(value), []).append(value)
+        return [group for group in members.values() if len(group) > 1]
+
+
+def spelling_groups(values, edits: bool = False,
+                    min_edit_key: int = MIN_EDIT_KEY) -> list[list[str]]:
+    """Groups of distinct ``values`` that are spelling variants of each other.
+
+    Values match when their normalized keys are equal or equal up to a
+    trailing "s"; with ``edits``, also when the keys (both at least
+    ``min_edit_key`` long) are within one edit.
+    """
+    groups = _Groups()
+    first: dict[str, tuple[str, str]] = {}   # bucket -> (value, key) filed first
+    for value in values:
+        key = normalize_key(value)
+        if not key:
+            continue
+        groups.add(value)
+        buckets = {key, key[:-1] if key.endswith("s") else key + "s"}
+        if edits and len(key) >= min_edit_key:
+            buckets.update(key[:i] + key[i + 1:] for i in range(len(key)))
+        for bucket in buckets:
+            rep = first.setdefault(bucket, (value, key))
+            if rep[0] == value:
+                continue
+            rep_key = rep[1]
+            if (rep_key == key or rep_key.rstrip("s") == key.rstrip("s")
+                    or (edits and min(len(key), len(rep_key)) >= min_edit_key
+                        and within_one_edit(key, rep_key))):
+                groups.union(rep[0], value)
+    return [sorted(group) for group in groups.groups()]
+
+
+def check_names(facts: list[SkillFacts]) -> list[Finding]:
+    by_name: dict[str, list[str]] = {}
+    for skill in facts:
+        by_name.setdefault(skill.name, []).append(skill.path)
+    findings = [Finding("duplicate-name", f"name {name!r} is used by {len(paths)} skills", paths)
+                for name, paths in by_name.items() if len(paths) > 1]
+    for group in spelling_groups(by_name):
+        findings.append(Finding("name-variant", "names differ only in spelling: "
+                                + ", ".join(repr(name) for name in group),
+                                sorted(path for name in group for path in by_name[name])))
+    return findings
+
+
+def check_tags(facts: list[SkillFacts]) -> list[Finding]:
+    by_tag: dict[str, list[str]] = {}
+    for skill in facts:
+        for tag in skill.tags:
+            if isinstance(tag, str):
+                by_tag.setdefault(tag, []).append(skill.path)
+    findings = []
+    for group in spelling_groups(by_tag, edits=True):
+        uses = ", ".join(f"{tag!r} ({len(by_tag[tag])})" for tag in group)
+        findings.append(Finding("tag-variant", f"tags look like one spelled differently: {uses}",
+                                sorted({path for tag in group for path in by_tag[tag]})))
+    return findings
+
+
+def check_descriptions(facts: list[SkillFacts], threshold: float = 0.8) -> list[Finding]:
+    """Identical normalized descriptions, then MinHash/LSH near-duplicates."""
+    by_text: dict[str, list[str]] = {}
+    for skill in facts:
+        text = normalize_text(skill.description)
+        if text:
+            by_text.setdefault(text, []).append(skill.path)
+    findings = [Finding("duplicate-description", f"{len(paths)} skills share one description",
+                        paths)
+                for paths in by_text.values() if len(paths) > 1]
+
+    groups = _Groups()
+    sigs: dict[str, bytes] = {}
+    buckets: dict[bytes, str] = {}
+    for text in by_text:
+        sig = signature(text.encode("utf-8"), DESCRIPTION_SHINGLE)
+        if sig is None:
+            continue
+        sigs[text] = sig
+        groups.add(text)
+        for band in range(BANDS):
+            key = sig[band * ROWS * 4:(band + 1) * ROWS * 4] + bytes((band,))
+            rep = buckets.setdefault(key, text)
+            if rep != text and similarity(sig, sigs[rep]) >= threshold:
+                groups.union(rep, text)
+    for group in groups.groups():
+        paths = sorted(path for text in group for path in by_text[text])
+        findings.append(Finding("similar-description",
+                                f"{len(paths)} skills have near-identical descriptions", paths))
+    return findings
+
+
+def check_readmes(facts: list[SkillFacts]) -> list[Finding]:
+    findings = []
+    for skill in facts:
+        if not skill.sub_skills:
+            continue
+        if skill.readme is None:
+            findings.append(Finding("readme-sub-skills", "README.md is missing", [skill.path]))
+            continue
+        match = _SUB_SKILLS_RE.search(skill.readme)
+        listed = set(_SUB_SKILL_ROW_RE.findall(match.group(1))) if match else set()
+        missing = sorted(set(skill.sub_skills) - listed)
+        extra = sorted(listed - set(skill.sub_skills))
+        if missing:
+            findings.append(Finding("readme-sub-skills",
+                                    f"README.md does not list sub-skills: {', '.join(missing)}",
+                                    [skill.path]))
+        if extra:
+            findings.append(Finding("readme-sub-skills",
+                                    f"README.md lists directories that are not sub-skills: "
+                                    f"{', '.join(extra)}", [skill.path]))
+    return findings
+
+
+def check_consistency(facts: list[SkillFacts], threshold: float = 0.8) -> list[Finding]:
+    """Every check's findings, in the order the checks are listed above."""
+    return (check_names(facts) + check_tags(facts)
+            + check_descriptions(facts, threshold) + check_readmes(facts))
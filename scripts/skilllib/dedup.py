@@ -0,0 +1,246 @@
+"""Content-addressed chunking and duplicate detection across skills.
+
+Each skill's SKILL.md, AGENTS.md and rules/*.md are cut into chunks at the
+frontmatter fence and at every level-1/2 heading outside fenced code
+(skilllib/text.py). The chunks are exact byte slices, so a file is the
+concatenation of its chunks, and AGENTS.md (a copy of the SKILL.md body)
+splits at the same boundaries.
+
+Exact duplicates are found by SHA-256. Near-duplicates are found with MinHash
+and LSH: every distinct chunk with enough words gets a one-permutation MinHash
+signature (``SIG_BINS`` bins over CRC-32 word shingles, densified by rotation),
+which is cut into ``BANDS`` bands. A chunk is compared only with the first chunk
+seen in each of its band buckets, so every chunk costs at most ``BANDS``
+comparisons and the analysis stays linear in the size of the tree. Chunks whose
+signatures agree on at least ``threshold`` of their bins are merged into one
+cluster (union-find).
+
+With a store directory, every distinct chunk is written once under
+``blobs/<aa>/<sha256>`` and each skill gets ``manifests/<skill>.json`` listing
+its files as chunk hashes; ``restore_file`` rebuilds a file from them.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import zlib
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .output import OutputBatch, WriteStats
+from .text import chunk_title, split_chunks
+
+
+STORE_VERSION = 1
+
+SIG_BINS = 32
+BANDS = 8
+ROWS = SIG_BINS // BANDS
+_BIN_BITS = 5  # log2(SIG_BINS)
+_VALUE_BITS = 32 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 0xFFFFFFFF
+
+# Chunks with fewer words than this are only deduplicated exactly.
+MIN_WORDS = 12
+
+_WORD_RE = re.compile(rb"\w+")
+
+
+def signature(data: bytes, shingle: int) -> bytes | None:
+    """One-permutation MinHash of the word ``shingle``-grams of ``data``."""
+    words = _WORD_RE.findall(data.lower())
+    if len(words) < max(MIN_WORDS, shingle):
+        return None
+    shingles = map(b" ".join, zip(*(words[i:] for i in range(shingle))))
+    hashes = sorted(map(zlib.crc32, shingles))
+    # Each bin keeps the smallest hash whose top bits select it: the first
+    # hash at or above the bin's lower bound, if it is still inside the bin.
+    sig = [_EMPTY] * SIG_BINS
+    for b in range(SIG_BINS):
+        i = bisect.bisect_left(hashes, b << _VALUE_BITS)
+        if i < len(hashes) and hashes[i] >> _VALUE_BITS == b:
+            sig[b] = hashes[i] & _VALUE_MASK
+    # Densify: an empty bin borrows the next filled bin's value, tagged with
+    # the distance so borrowed and native values never collide.
+    for b in range(SIG_BINS):
+        if sig[b] <= _VALUE_MASK:
+            continue
+        for step in range(1, SIG_BINS):
+            value = sig[(b + step) % SIG_BINS]
+            if value <= _VALUE_MASK:
+                sig[b] = (step << _VALUE_BITS) | value
+                break
+    return array("I", sig).tobytes()
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity: the fraction of agreeing bins."""
+    same = sum(x == y for x, y in zip(memoryview(a).cast("I"), memoryview(b).cast("I")))
+    return same / SIG_BINS
+
+
+def file_kind(name: str) -> str:
+    return "rules" if name.startswith("rules/") else name
+
+
+@dataclass
+class DedupStats:
+    files: int = 0
+    chunks: int = 0
+    bytes: int = 0
+    unique_chunks: int = 0
+    unique_bytes: int = 0
+    exact_saved: Counter = field(default_factory=Counter)  # by file kind
+    near_saved: float = 0.0
+    store: WriteStats = field(default_factory=WriteStats)
+
+
+class DedupIndex:
+    """Streaming index of chunks: exact groups by hash, near groups by LSH."""
+
+    def __init__(self, threshold: float = 0.8, shingle: int = 5, store_dir: str | None = None):
+        self.threshold = threshold
+        self.shingle = shingle
+        self.store_dir = store_dir
+        self.stats = DedupStats()
+        self.ids: dict[str, int] = {}      # sha256 -> chunk id
+        self.hashes: list[str] = []
+        self.sizes: list[int] = []
+        self.counts: list[int] = []
+        self.first: list[tuple[str, str, str]] = []  # (skill, file, title)
+        self.sigs: list[bytes | None] = []
+        self.parent: list[int] = []
+        self.near_sim: dict[int, float] = {}
+        self.buckets: dict[bytes, int] = {}
+
+    def _root(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def _link(self, i: int) -> None:
+        sig = self.sigs[i]
+        if sig is None:
+            return
+        best = 0.0
+        for band in range(BANDS):
+            key = sig[band * ROWS * 4:(band + 1) * ROWS * 4] + bytes((band,))
+            rep = self.buckets.setdefault(key, i)
+            if rep == i:
+                continue
+            sim = similarity(sig, self.sigs[rep])
+            if sim >= self.threshold:
+                best = max(best, sim)
+                a, b = self._root(i), self._root(rep)
+                if a != b:
+                    self.parent[a] = b
+        if best:
+            self.near_sim[i] = best
+
+    def add(self, skill: str, name: str, chunk: bytes, batch: OutputBatch | None = None) -> str:
+        """Record one chunk occurrence; returns its hash."""
+        digest = hashlib.sha256(chunk).hexdigest()
+        stats = self.stats
+        stats.chunks += 1
+        stats.bytes += len(chunk)
+        i = self.ids.get(digest)
+        if i is not None:
+            self.counts[i] += 1
+            stats.exact_saved[file_kind(name)] += len(chunk)
+            return digest
+
+        i = len(self.hashes)
+        self.ids[digest] = i
+        self.hashes.append(digest)
+        self.sizes.append(len(chunk))
+        self.counts.append(1)
+        self.first.append((skill, name, chunk_title(chunk)))
+        self.parent.append(i)
+        self.sigs.append(signature(chunk, self.shingle))
+        stats.unique_chunks += 1
+        stats.unique_bytes += len(chunk)
+        self._link(i)
+        if batch is not None:
+            path = blob_path(self.store_dir, digest)
+            if not os.path.exists(path):
+                batch.add(path, chunk)
+        return digest
+
+    def add_skill(self, skill: str, skill_dir: str, files: list[str]) -> None:
+        """Chunk and record ``files`` (relative to ``skill_dir``) of one skill."""
+        batch = OutputBatch() if self.store_dir else None
+        manifest = {}
+        for name in files:
+            with open(os.path.join(skill_dir, name), "rb") as f:
+                data = f.read()
+            self.stats.files += 1
+            manifest[name] = [self.add(skill, name, chunk, batch)
+                              for chunk in split_chunks(data, name.endswith(".md"))]
+        if batch is not None:
+            payload = {"version": STORE_VERSION, "skill": skill, "files": manifest}
+            batch.add(manifest_path(self.store_dir, skill),
+                      json.dumps(payload, indent=1, sort_keys=True) + "\n")
+            self.stats.store.add(batch.commit())
+
+    def finish(self) -> None:
+        """Total the near-duplicate estimate: each chunk merged into a cluster
+        could be stored as a delta, saving about ``size * similarity``."""
+        self.stats.near_saved = sum(self.sizes[i] * sim for i, sim in self.near_sim.items())
+
+    def exact_groups(self, limit: int) -> list[dict]:
+        """Chunks stored more than once, by bytes saved."""
+        groups = [i for i, n in enumerate(self.counts) if n > 1]
+        groups.sort(key=lambda i: (-(self.counts[i] - 1) * self.sizes[i], self.hashes[i]))
+        return [{
+            "hash": self.hashes[i],
+            "size": self.sizes[i],
+            "copies": self.counts[i],
+            "saved": (self.counts[i] - 1) * self.sizes[i],
+            "first": list(self.first[i]),
+        } for i in groups[:limit]]
+
+    def near_clusters(self, limit: int) -> list[dict]:
+        """Clusters of distinct but similar chunks, by estimated bytes saved."""
+        members: dict[int, list[int]] = {}
+        for i in range(len(self.hashes)):
+            members.setdefault(self._root(i), []).append(i)
+        clusters = []
+        for root, ids in members.items():
+            if len(ids) < 2:
+                continue
+            saved = sum(self.sizes[i] * self.near_sim.get(i, 0.0) for i in ids)
+            clusters.append({
+                "members": len(ids),
+                "saved": round(saved),
+                "chunks": [{"hash": self.hashes[i], "size": self.sizes[i],
+                            "copies": self.counts[i], "first": list(self.first[i])}
+                           for i in sorted(ids, key=lambda i: self.first[i])],
+            })
+        clusters.sort(key=lambda c: (-c["saved"], c["chunks"][0]["hash"]))
+        return clusters[:limit]
+
+
+def blob_path(store_dir: str, digest: str) -> str:
+    return os.path.join(store_dir, "blobs", digest[:2], digest)
+
+
+def manifest_path(store_dir: str, skill: str) -> str:
+    name = "_root" if skill == "." else skill
+    return os.path.join(store_dir, "manifests", name + ".json")
+
+
+def restore_file(store_dir: str, hashes: list[str]) -> bytes:
+    """Reassemble a file from the chunk hashes listed in a skill manifest."""
+    parts = []
+    for digest in hashes:
+        with open(blob_path(store_dir, digest), "rb") as f:
+            parts.append(f.read())
+    return b"".join(parts)
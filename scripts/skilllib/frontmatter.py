@@ -0,0 +1,212 @@
+"""Streaming SKILL.md frontmatter reader with a lazy, mmap-backed body view.
+
+``read_frontmatter`` reads a file line by line only until the closing ``---``
+fence, so tools that need just the frontmatter never load or regex-scan the
+body. The body is exposed through ``BodyView``, which maps the file on demand.
+
+Fence rules match ``parsing.FRONTMATTER_RE`` (``^---\\s*\\n(.*?)\\n---\\s*\\n``):
+the opening line is ``---`` plus optional trailing whitespace, at least one
+line (possibly blank) must precede the closing fence, and the closing fence
+must be newline-terminated.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from typing import Any
+
+import yaml
+
+from .profile import count, span
+from .simple_yaml import parse_simple_yaml
+
+
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Fence states recorded on .fence
+FENCE_OK = "ok"
+FENCE_MISSING = "missing"
+FENCE_UNTERMINATED = "unterminated"
+
+_FENCE = b"---"
+_LINE_WS = b" \t\r\n\f\v"
+_NON_WS_RE = re.compile(rb"\S")
+
+
+def decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes with the same newline handling as text-mode open()."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def load_yaml(text: str) -> tuple[Any, str | None]:
+    """safe_load ``text``, returning (data, error message or None).
+
+    Simple documents go through the restricted parser in simple_yaml.py; the
+    rest use libyaml's CSafeLoader when PyYAML was built with it, except
+    documents containing tabs, which libyaml accepts in places the pure-Python
+    loader rejects. Error messages always come from the pure-Python loader so
+    they do not depend on how PyYAML was installed.
+    """
+    with span("yaml"):
+        data = parse_simple_yaml(text)
+        if data is not None:
+            count("yaml_fast_path")
+            return data, None
+        count("yaml_full_loader")
+        if _SafeLoader is not yaml.SafeLoader and "\t" not in text:
+            try:
+                return yaml.load(text, Loader=_SafeLoader), None
+            except yaml.YAMLError:
+                pass
+        try:
+            return yaml.safe_load(text), None
+        except yaml.YAMLError as exc:
+            return None, str(exc)
+
+
+class FrontmatterView:
+    """Accessors shared by every parsed view of a SKILL.md file.
+
+    Subclasses provide ``fence``, ``frontmatter`` and ``yaml_error``.
+    """
+
+    fence: str
+    frontmatter: Any
+    yaml_error: str | None
+
+    @property
+    def has_frontmatter(self) -> bool:
+        return self.fence == FENCE_OK
+
+    def frontmatter_dict(self) -> dict | None:
+        """Frontmatter as the generators expect it.
+
+        Returns None when the file has no frontmatter fences, and an empty dict
+        when the YAML is invalid or empty.
+        """
+        if not self.has_frontmatter:
+            return None
+        if self.yaml_error is not None:
+            return {}
+        return self.frontmatter or {}
+
+
+class BodyView:
+    """Lazy view of the body of a SKILL.md file, backed by mmap.
+
+    ``start`` is the byte offset just past the closing ``---`` (0 when the file
+    has no frontmatter). The map is opened per call, or held open for the
+    duration of a ``with`` block.
+    """
+
+    def __init__(self, path: str, start: int):
+        self.path = path
+        self.start = start
+        self._file = None
+        self._map = None
+
+    def __enter__(self) -> "BodyView":
+        self._file = open(self.path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+        self._file = self._map = None
+
+    def _with_map(self, fn):
+        if self._file is not None:
+            return fn(self._map)
+        with self:
+            return fn(self._map)
+
+    def _first_content(self, mm) -> int | None:
+        if mm is None:
+            return None
+        match = _NON_WS_RE.search(mm, self.start)
+        return match.start() if match else None
+
+    def is_blank(self) -> bool:
+        """True if the body is whitespace only; stops at the first content byte."""
+        return self._with_map(lambda mm: self._first_content(mm) is None)
+
+    def offset(self) -> int:
+        """Byte offset where the body text begins."""
+        def compute(mm):
+            if mm is None or self.start == 0:
+                return self.start
+            # Like the regex's greedy "---\s*\n": skip whitespace after the
+            # fence and start just past the last newline in that run.
+            end = self._first_content(mm)
+            if end is None:
+                end = len(mm)
+            return mm.rfind(b"\n", self.start, end) + 1
+        return self._with_map(compute)
+
+    def read_bytes(self) -> bytes:
+        def read(mm):
+            if mm is None:
+                return b""
+            return mm[self.offset():]
+        return self._with_map(read)
+
+    def text(self) -> str:
+        return decode_text(self.read_bytes())
+
+
+@dataclass
+class SkillHeader(FrontmatterView):
+    """Frontmatter of a SKILL.md file, read without loading the body."""
+
+    path: str
+    fence: str
+    frontmatter: Any = None
+    yaml_error: str | None = None
+    fence_end: int = 0
+    mtime_ns: int = 0
+    size: int = 0
+
+    def body(self) -> BodyView:
+        return BodyView(self.path, self.fence_end)
+
+    @property
+    def body_blank(self) -> bool:
+        return self.body().is_blank()
+
+
+def read_frontmatter(path: str) -> SkillHeader:
+    """Stream ``path`` up to the closing fence and parse the frontmatter."""
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        header = SkillHeader(path=path, fence=FENCE_MISSING, mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+        first = f.readline()
+        if not first.startswith(_FENCE):
+            return header
+        header.fence = FENCE_UNTERMINATED
+        if first.rstrip(_LINE_WS) != _FENCE or not first.endswith(b"\n"):
+            return header
+
+        offset = len(first)
+        lines = []
+        for line in f:
+            if lines and line.endswith(b"\n") and line.rstrip(_LINE_WS) == _FENCE:
+                header.fence = FENCE_OK
+                header.fence_end = offset + len(_FENCE)
+                break
+            lines.append(line)
+            offset += len(line)
+        else:
+            return header
+
+    # Drop the newline that belongs to the closing fence, as the regex does.
+    fm_text = decode_text(b"".join(lines))[:-1]
+    header.frontmatter, header.yaml_error = load_yaml(fm_text)
+    return header
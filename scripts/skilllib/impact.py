@@ -0,0 +1,158 @@
+"""Single-scan, word-boundary-aware impact classification for rule bullets.
+
+All keyword tables are compiled into one prefix-trie regex, so each bullet is
+scanned once regardless of how many keywords the tables hold.
+Keywords only match whole words plus a small set of inflections ("secrets",
+"validated", "preferred", "requirements"), so "never" no longer fires inside
+"nevertheless" or "whenever" and "must" no longer fires inside "mustache".
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import NamedTuple
+
+
+# Keyword heuristics for impact classification, highest priority first.
+CRITICAL_KEYWORDS = [
+    "never", "always", "must", "critical", "security", "vulnerability",
+    "injection", "secret", "credential", "production", "do not",
+]
+HIGH_KEYWORDS = [
+    "important", "ensure", "require", "enforce", "validate", "prevent",
+    "protect", "avoid", "mandatory",
+]
+LOW_KEYWORDS = [
+    "consider", "prefer", "optionally", "where possible", "when practical",
+    "if needed", "may want",
+]
+
+IMPACT_DESCRIPTIONS = {
+    "CRITICAL": "essential for correctness or security",
+    "HIGH": "significant quality or reliability improvement",
+    "MEDIUM": "general best practice",
+    "LOW": "recommended but situational",
+}
+
+DEFAULT_LEVEL = "MEDIUM"
+
+# Ordered (level, keywords) pairs; earlier levels win over later ones.
+DEFAULT_TABLES = (
+    ("CRITICAL", CRITICAL_KEYWORDS),
+    ("HIGH", HIGH_KEYWORDS),
+    ("LOW", LOW_KEYWORDS),
+)
+
+# Inflections accepted after a keyword; anything else means the keyword was
+# only a fragment of a longer word.
+_SUFFIXES = ("", "s", "es", "d", "ed", "ing", "ly", "ion", "ions", "ive",
+             "able", "ably", "ment", "ments", "ence", "ences")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class Impact(NamedTuple):
+    level: str
+    description: str
+    keyword: str | None  # the table keyword that fired, None for the default
+
+
+def keyword_forms(keyword: str) -> list[str]:
+    """Every accepted surface form of a keyword (lowercase, single-spaced)."""
+    words = keyword.lower().split()
+    head, last = words[:-1], words[-1]
+    lasts = [last + suffix for suffix in _SUFFIXES]
+    if last[-1] not in "aeiouyw":
+        # prefer -> preferred / preferring
+        lasts += [last + last[-1] + suffix for suffix in ("ed", "ing")]
+    return [" ".join(head + [form]) for form in lasts]
+
+
+def trie_pattern(words) -> str:
+    """Build a prefix-trie regex matching exactly ``words``.
+
+    Shared prefixes are factored out ("avoid|avoids|always" becomes
+    "a(?:voids?|lways)"), so the engine rejects most positions after one
+    character instead of trying every alternative.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        terminal = "" in node
+        alternatives = [
+            (r"\s+" if ch == " " else re.escape(ch)) + build(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not alternatives:
+            return ""
+        if len(alternatives) == 1 and not terminal:
+            return alternatives[0]
+        group = "(?:" + "|".join(alternatives) + ")"
+        return group + "?" if terminal else group
+
+    return build(trie)
+
+
+class ImpactClassifier:
+    """Classify text against ordered keyword tables in a single regex scan.
+
+    ``tables`` is a sequence of (level, keywords) pairs in priority order.
+    """
+
+    def __init__(self, tables=DEFAULT_TABLES, descriptions=None, default_level=DEFAULT_LEVEL):
+        self.descriptions = dict(IMPACT_DESCRIPTIONS)
+        if descriptions:
+            self.descriptions.update(descriptions)
+        self.default_level = default_level
+        # surface form -> (rank, level, keyword); the first table to claim a
+        # form keeps it, mirroring the old CRITICAL > HIGH > LOW precedence.
+        self._forms: dict[str, tuple[int, str, str]] = {}
+        for rank, (level, keywords) in enumerate(tables):
+            for keyword in keywords:
+                for form in keyword_forms(keyword):
+                    self._forms.setdefault(form, (rank, level, keyword))
+        if self._forms:
+            self._regex = re.compile(rf"\b{trie_pattern(self._forms)}\b")
+        else:
+            self._regex = re.compile(r"(?!)")
+
+    @classmethod
+    def from_json(cls, path: str) -> "ImpactClassifier":
+        """Load tables from JSON: {"CRITICAL": [...], "HIGH": [...], ...}.
+
+        Key order is priority order. An optional "descriptions" object
+        overrides the impact description for each level.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        descriptions = data.pop("descriptions", None)
+        return cls(tuple(data.items()), descriptions)
+
+    def classify(self, text: str) -> Impact:
+        best = None
+        for match in self._regex.finditer(text.lower()):
+            hit = self._forms[_WHITESPACE_RE.sub(" ", match.group())]
+            if best is None or hit[0] < best[0]:
+                best = hit
+                if hit[0] == 0:
+                    break
+        if best is None:
+            level = self.default_level
+            return Impact(level, self.descriptions.get(level, ""), None)
+        _, level, keyword = best
+        return Impact(level, self.descriptions.get(level, ""), keyword)
+
+
+_default_classifier: ImpactClassifier | None = None
+
+
+def default_classifier() -> ImpactClassifier:
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = ImpactClassifier()
+    return _default_classifier
@@ -0,0 +1,257 @@
+"""Prebuilt index of every skill under skills/ (skills-index.json).
+
+The index is written by scripts/generate-skills-index.py in a single tree
+traversal. Each entry records the skill's path (relative to skills/), name,
+cleaned description, tags, parent/children (by nearest ancestor skill), rule
+count and SKILL.md content hash. It is committed so consumers get a fast
+lookup without walking the tree.
+
+Scripts call ``discover_skill_dirs`` instead of ``os.walk``. It serves the
+indexed paths when a local state file in .cache/ shows that no directory
+under skills/ changed since the index was written (directory mtimes change
+whenever an entry is added or removed), and falls back to walking otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+from .metadata import clean_description, count_rules
+from .output import atomic_write
+from .parsing import DEFAULT_CACHE_DIR, REPO_ROOT, load_skill
+
+
+INDEX_VERSION = 1
+SKILLS_ROOT = os.path.join(REPO_ROOT, "skills")
+INDEX_PATH = os.path.join(REPO_ROOT, "skills-index.json")
+STATE_FILENAME = "skills-index-state.json"
+
+
+def _rel(path: str, root: str) -> str:
+    return os.path.relpath(path, root).replace("\\", "/")
+
+
+def _state_path() -> str:
+    cache_dir = os.environ.get("SKILLS_CACHE_DIR") or DEFAULT_CACHE_DIR
+    return os.path.join(cache_dir, STATE_FILENAME)
+
+
+def walk_tree(root: str = SKILLS_ROOT) -> tuple[list[str], dict[str, int]]:
+    """One traversal: return (skill dir rel paths, {dir rel path: mtime_ns})."""
+    skills = []
+    dirs = {}
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        rel = _rel(current, root)
+        dirs[rel] = os.stat(current).st_mtime_ns
+        has_skill = False
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name == "SKILL.md":
+                    has_skill = True
+        if has_skill:
+            skills.append(rel)
+    skills.sort()
+    return skills, dirs
+
+
+def nearest_parent(rel: str, skill_set) -> str | None:
+    """Closest ancestor of ``rel`` that is itself a skill."""
+    parent = os.path.dirname(rel) if rel != "." else ""
+    while parent:
+        if parent in skill_set:
+            return parent
+        parent = os.path.dirname(parent)
+    if rel != "." and "." in skill_set:
+        return "."
+    return None
+
+
+def build_entry(rel: str, root: str = SKILLS_ROOT) -> dict:
+    """Index entry for one skill (parent/children are filled in by link_tree)."""
+    skill_dir = os.path.join(root, rel)
+    parsed = load_skill(os.path.join(skill_dir, "SKILL.md"))
+    fm = parsed.frontmatter_dict() or {}
+    metadata = fm.get("metadata") or {}
+    tags = metadata.get("tags") if isinstance(metadata, dict) else None
+    return {
+        "path": rel,
+        "name": fm.get("name", os.path.basename(skill_dir)),
+        "description": clean_description(fm.get("description", "")),
+        "tags": tags if isinstance(tags, list) else [],
+        "parent": None,
+        "children": [],
+        "ruleCount": count_rules(skill_dir) or 0,
+        "sha256": parsed.sha256,
+    }
+
+
+def link_tree(entries: dict[str, dict]) -> None:
+    """Fill in parent/children for every entry, in place."""
+    for entry in entries.values():
+        entry["children"] = []
+    for rel in sorted(entries):
+        parent = nearest_parent(rel, entries)
+        entries[rel]["parent"] = parent
+        if parent is not None:
+            entries[parent]["children"].append(rel)
+
+
+def build_index(root: str = SKILLS_ROOT) -> tuple[dict[str, dict], dict[str, int]]:
+    """Full rebuild. Returns (entries by path, directory mtimes)."""
+    skills, dirs = walk_tree(root)
+    entries = {rel: build_entry(rel, root) for rel in skills}
+    link_tree(entries)
+    return entries, dirs
+
+
+def update_index(entries: dict[str, dict], dirs: dict[str, int], changed: list[str],
+                 root: str = SKILLS_ROOT) -> list[str]:
+    """Refresh ``changed`` skill paths (and any skills nested under them) in place.
+
+    Skills whose SKILL.md is gone are removed. ``dirs`` is updated for the
+    changed subtrees and their ancestors; pass an empty dict when there is no
+    previous state, in which case it stays empty and discovery keeps walking.
+    Returns the paths that were added, updated or removed.
+    """
+    track_dirs = bool(dirs)
+    targets = set()
+    for rel in changed:
+        targets.add(rel)
+        full = os.path.join(root, rel)
+        if os.path.isdir(full):
+            nested, subtree_dirs = walk_tree(full)
+            for sub in nested:
+                targets.add(rel if sub == "." else f"{rel}/{sub}")
+            if track_dirs:
+                for sub, mtime_ns in subtree_dirs.items():
+                    dirs[rel if sub == "." else f"{rel}/{sub}"] = mtime_ns
+        else:
+            # Forget a deleted subtree, including any nested skills.
+            prefix = rel + "/"
+            targets.update(p for p in entries if p.startswith(prefix))
+            for stale in [d for d in dirs if d == rel or d.startswith(prefix)]:
+                del dirs[stale]
+        if track_dirs:
+            _refresh_ancestors(dirs, rel, root)
+
+    touched = []
+    for rel in sorted(targets):
+        if os.path.isfile(os.path.join(root, rel, "SKILL.md")):
+            entries[rel] = build_entry(rel, root)
+            touched.append(rel)
+        elif entries.pop(rel, None) is not None:
+            touched.append(rel)
+    link_tree(entries)
+    return touched
+
+
+def render_index(entries: dict[str, dict]) -> str:
+    """Serialize as compact JSON with one skill per line for readable diffs."""
+    lines = ["{", f'"version": {INDEX_VERSION},', '"root": "skills",', '"skills": [']
+    rels = sorted(entries)
+    for i, rel in enumerate(rels):
+        sep = "," if i < len(rels) - 1 else ""
+        lines.append(json.dumps(entries[rel], ensure_ascii=False, separators=(",", ":")) + sep)
+    lines.extend(["]", "}", ""])
+    return "\n".join(lines)
+
+
+def load_index(path: str = INDEX_PATH) -> dict[str, dict] | None:
+    """Load skills-index.json as {path: entry}, or None if absent/incompatible."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != INDEX_VERSION:
+        return None
+    return {entry["path"]: entry for entry in data.get("skills", [])}
+
+
+def write_index(entries: dict[str, dict], dirs: dict[str, int],
+                path: str = INDEX_PATH) -> bool:
+    """Write the index (only if its bytes changed) and the local state file.
+
+    Returns True if skills-index.json was rewritten.
+    """
+    text = render_index(entries)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            changed = f.read() != text
+    except OSError:
+        changed = True
+    if changed:
+        atomic_write(path, text)
+    state = {"index_mtime_ns": os.stat(path).st_mtime_ns, "dirs": dirs}
+    atomic_write(_state_path(), json.dumps(state, sort_keys=True) + "\n")
+    return changed
+
+
+def _refresh_ancestors(dirs: dict[str, int], rel: str, root: str) -> None:
+    """Re-stat each existing ancestor of ``rel`` up to ``root``."""
+    while rel not in (".", ""):
+        rel = os.path.dirname(rel) or "."
+        full = os.path.join(root, rel)
+        if os.path.isdir(full):
+            dirs[rel] = os.stat(full).st_mtime_ns
+
+
+def load_state() -> dict:
+    try:
+        with open(_state_path(), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def index_is_fresh(root: str = SKILLS_ROOT, path: str = INDEX_PATH) -> bool:
+    """True if neither the index nor any directory under ``root`` changed
+    since the index was last written."""
+    state = load_state()
+    dirs = state.get("dirs")
+    if not dirs:
+        return False
+    try:
+        if os.stat(path).st_mtime_ns != state.get("index_mtime_ns"):
+            return False
+    except OSError:
+        return False
+    for rel, mtime_ns in dirs.items():
+        try:
+            if os.stat(os.path.join(root, rel)).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def discover_skill_dirs(root: str = SKILLS_ROOT) -> list[str]:
+    """Sorted skill directories under ``root``, from the index when it is fresh.
+
+    Paths are joined onto ``root`` as given, matching what os.walk would yield.
+    """
+    if os.path.abspath(root) == os.path.abspath(SKILLS_ROOT) and index_is_fresh(root):
+        entries = load_index()
+        if entries is not None:
+            return [os.path.join(root, rel) if rel != "." else root for rel in sorted(entries)]
+    skills, _ = walk_tree(root)
+    return [os.path.join(root, rel) if rel != "." else root for rel in skills]
+
+
+def lookup(name_or_path: str, entries: dict[str, dict] | None = None) -> dict | None:
+    """Find an index entry by relative path or skill name."""
+    entries = entries if entries is not None else load_index()
+    if not entries:
+        return None
+    if name_or_path in entries:
+        return entries[name_or_path]
+    for entry in entries.values():
+        if entry["name"] == name_or_path:
+            return entry
+    return None
@@ -0,0 +1,338 @@
+"""Concurrent reference-link checking with a persistent result cache.
+
+``LinkChecker`` checks URLs on one asyncio event loop with a small HTTP/1.1
+client over ``asyncio.open_connection`` (standard library only). Each host
+(scheme, host, port) gets its own pool: at most ``per_host`` requests in
+flight, over connections that are kept alive and reused, and at most
+``concurrency`` requests run overall. A URL is checked with HEAD, retried
+with GET when the server rejects HEAD, and redirects are followed up to
+``max_redirects`` hops.
+
+``LinkCache`` keeps results in ``.cache/link-check-cache.json``. A result
+younger than its TTL is reused without a request. An older one that carries
+an ETag or Last-Modified is revalidated with a conditional request, and a 304
+renews it. Failures get ``FAILURE_TTL`` so they are retried sooner.
+``check_links`` ties the two together and checks each distinct URL once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import ssl
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
+from urllib.parse import urljoin, urlsplit
+
+from .output import OutputBatch
+from .parsing import DEFAULT_CACHE_DIR
+
+
+CACHE_NAME = "link-check-cache.json"
+CACHE_VERSION = 1
+
+DEFAULT_TTL = 7 * 24 * 3600
+FAILURE_TTL = 3600
+
+USER_AGENT = "agent-skills-link-checker/1.0"
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# Statuses some servers give HEAD requests for pages that GET serves fine.
+HEAD_REJECTED = frozenset({400, 403, 405, 501})
+_MAX_HEADER_LINES = 100
+
+
+class LinkError(Exception):
+    """A URL that cannot be requested, or a malformed response."""
+
+
+@dataclass
+class LinkResult:
+    url: str
+    status: int | None = None
+    final_url: str | None = None   # set when redirects led elsewhere
+    error: str | None = None       # network or protocol failure
+    etag: str | None = None
+    last_modified: str | None = None
+    checked: float = 0.0
+    # Where this result came from in the current run; not persisted.
+    source: str = "network"        # network | cache | revalidated | unchecked
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    @property
+    def broken(self) -> bool:
+        """The server answered, with something other than success."""
+        return self.error is None and self.status is not None and not self.ok
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        del data["source"]
+        return {key: value for key, value in data.items() if value is not None}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "LinkResult":
+        fields = ("url", "status", "final_url", "error", "etag", "last_modified", "checked")
+        return cls(**{key: data[key] for key in fields if key in data}, source="cache")
+
+
+class LinkCache:
+    """URL -> last LinkResult, persisted as JSON under the cache directory.
+
+    Honours ``SKILLS_NO_CACHE`` (nothing is loaded or saved) and
+    ``SKILLS_CACHE_DIR`` like the parse cache.
+    """
+
+    def __init__(self, cache_dir: str | None = None, enabled: bool | None = None):
+        if enabled is None:
+            enabled = os.environ.get("SKILLS_NO_CACHE", "") in ("", "0")
+        self.enabled = enabled
+        cache_dir = cache_dir or os.environ.get("SKILLS_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.path = os.path.join(cache_dir, CACHE_NAME)
+        self.entries: dict[str, LinkResult] = {}
+        self.dirty = False
+        if enabled:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+            return
+        for url, data in payload.get("entries", {}).items():
+            try:
+                self.entries[url] = LinkResult.from_json(data)
+            except (TypeError, KeyError):
+                continue
+
+    def get(self, url: str) -> LinkResult | None:
+        return self.entries.get(url)
+
+    def put(self, result: LinkResult) -> None:
+        self.entries[result.url] = replace(result, source="cache")
+        self.dirty = True
+
+    @staticmethod
+    def fresh(result: LinkResult, now: float, ttl: float) -> bool:
+        return now - result.checked < (ttl if result.ok else min(ttl, FAILURE_TTL))
+
+    def prune(self, live_urls) -> None:
+        """Drop results for URLs no longer referenced anywhere."""
+        live = set(live_urls)
+        stale = [url for url in self.entries if url not in live]
+        for url in stale:
+            del self.entries[url]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self) -> None:
+        if not self.enabled or not self.dirty:
+            return
+        payload = {"version": CACHE_VERSION,
+                   "entries": {url: r.to_json() for url, r in sorted(self.entries.items())}}
+        batch = OutputBatch()
+        batch.add(self.path, json.dumps(payload, indent=1, sort_keys=True) + "\n")
+        batch.commit()
+        self.dirty = False
+
+
+class _HostPool:
+    """In-flight limit and idle keep-alive connections for one host."""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+
+class LinkChecker:
+    """Checks URLs concurrently; ``stats`` counts requests and connections."""
+
+    def __init__(self, concurrency: int = 32, per_host: int = 4, timeout: float = 10.0,
+                 max_redirects: int = 5, ssl_context: ssl.SSLContext | None = None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._ssl_context = ssl_context
+        self._pools: dict[tuple[str, str, int], _HostPool] = {}
+        self._limit: asyncio.Semaphore | None = None
+        self.stats: Counter = Counter()
+
+    def run(self, pending: list[tuple[str, LinkResult | None]],
+            now: float | None = None) -> list[LinkResult]:
+        """Check ``(url, cached result or None)`` pairs; results in the same order."""
+        now = time.time() if now is None else now
+        return asyncio.run(self._run(pending, now))
+
+    async def _run(self, pending, now: float) -> list[LinkResult]:
+        self._limit = asyncio.Semaphore(self.concurrency)
+        try:
+            return await asyncio.gather(*(self.check(url, cached, now) for url, cached in pending))
+        finally:
+            for pool in self._pools.values():
+                for _, writer in pool.idle:
+                    writer.close()
+            self._pools.clear()
+
+    async def check(self, url: str, cached: LinkResult | None = None,
+                    now: float = 0.0) -> LinkResult:
+        """Check one URL; a 304 to a conditional request renews ``cached``."""
+        result = LinkResult(url, checked=now)
+        current = url
+        try:
+            for _ in range(self.max_redirects + 1):
+                headers = {}
+                if cached is not None and cached.ok and current == (cached.final_url or cached.url):
+                    if cached.etag:
+                        headers["If-None-Match"] = cached.etag
+                    if cached.last_modified:
+                        headers["If-Modified-Since"] = cached.last_modified
+                for method in ("HEAD", "GET"):
+                    status, response = await self._request(method, current, headers)
+                    if method == "HEAD" and status in HEAD_REJECTED:
+                        self.stats["get_fallbacks"] += 1
+                        continue
+                    break
+                if status == 304 and headers:
+                    self.stats["revalidated"] += 1
+                    return replace(cached, checked=now, source="revalidated")
+                if status in REDIRECT_STATUSES and "location" in response:
+                    current = urljoin(current, response["location"])
+                    continue
+                result.status = status
+                result.final_url = current if current != url else None
+                result.etag = response.get("etag")
+                result.last_modified = response.get("last-modified")
+                return result
+            result.error = f"more than {self.max_redirects} redirects"
+        except TimeoutError:
+            result.error = f"timed out after {self.timeout:g}s"
+        except (OSError, LinkError, ValueError) as exc:
+            result.error = str(exc) or type(exc).__name__
+        return result
+
+    def _pool(self, key: tuple[str, str, int]) -> _HostPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _HostPool(self.per_host)
+        return pool
+
+    async def _request(self, method: str, url: str, headers: dict) -> tuple[int, dict]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise LinkError(f"unsupported URL: {url}")
+        key = (scheme, parts.hostname.lower(), parts.port or (443 if scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc.rpartition('@')[2]}",
+                 f"User-Agent: {USER_AGENT}", "Accept: */*"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        # A GET response body is never read, so that connection is not reused.
+        lines.append("Connection: close" if method == "GET" else "Connection: keep-alive")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        pool = self._pool(key)
+        # The host slot is taken first so a busy host cannot hold global slots.
+        async with pool.semaphore, self._limit:
+            self.stats["requests"] += 1
+            return await asyncio.wait_for(self._exchange(key, pool, method, request), self.timeout)
+
+    async def _exchange(self, key, pool: _HostPool, method: str, request: bytes) -> tuple[int, dict]:
+        while True:
+            reused = bool(pool.idle)
+            if reused:
+                reader, writer = pool.idle.pop()
+                self.stats["reused"] += 1
+            else:
+                reader, writer = await self._connect(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                version, status, response = await self._read_head(reader)
+            except (ConnectionError, LinkError):
+                writer.close()
+                if reused:
+                    # The server closed an idle keep-alive connection; retry on a new one.
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            break
+        if (method == "HEAD" and version == "HTTP/1.1"
+                and response.get("connection", "").lower() != "close"):
+            pool.idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, response
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            context = self._ssl_context
+        self.stats["connections"] += 1
+        return await asyncio.open_connection(host, port, ssl=context,
+                                             server_hostname=host if context else None)
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> tuple[str, int, dict]:
+        """Status line and headers (names lower-cased), skipping 1xx responses."""
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("connection closed without a response")
+            version, _, rest = line.decode("latin-1").strip().partition(" ")
+            if not version.startswith("HTTP/") or not rest[:3].isdigit():
+                raise LinkError(f"malformed status line: {line[:80]!r}")
+            status = int(rest[:3])
+            headers = {}
+            for _ in range(_MAX_HEADER_LINES):
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n"):
+                    break
+                if not line:
+                    raise ConnectionError("connection closed in response headers")
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            else:
+                raise LinkError("too many response headers")
+            if not 100 <= status < 200:
+                return version, status, headers
+
+
+def check_links(urls, cache: LinkCache, checker: LinkChecker | None = None,
+                ttl: float = DEFAULT_TTL, refresh: bool = False, offline: bool = False,
+                now: float | None = None) -> dict[str, LinkResult]:
+    """Result for each distinct URL in ``urls``.
+
+    Fresh cached results are used as they are; everything else is checked
+    through ``checker``, unless ``offline``, in which case any cached result
+    is reported and URLs never checked come back with source "unchecked".
+    ``refresh`` treats every cached result as stale.
+    """
+    now = time.time() if now is None else now
+    urls = list(dict.fromkeys(urls))
+    results: dict[str, LinkResult] = {}
+    pending = []
+    for url in urls:
+        cached = cache.get(url)
+        if cached is not None and (offline or (not refresh and cache.fresh(cached, now, ttl))):
+            results[url] = cached
+        elif offline:
+            results[url] = LinkResult(url, source="unchecked")
+        else:
+            pending.append((url, cached))
+    if pending:
+        checker = checker or LinkChecker()
+        for result in checker.run(pending, now):
+            results[result.url] = result
+            cache.put(result)
+    return {url: results[url] for url in urls}
@@ -0,0 +1,62 @@
+"""Build manifests that record input and output hashes between runs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+
+from .output import atomic_write
+from .parsing import DEFAULT_CACHE_DIR
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str) -> str | None:
+    """Hash a file's bytes, or return None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return sha256_bytes(f.read())
+    except FileNotFoundError:
+        return None
+
+
+class BuildManifest:
+    """JSON manifest mapping a key (usually a skill path) to input/output hashes.
+
+    ``header`` captures anything that invalidates every entry at once, such as
+    a generator version; a stored manifest whose header differs is discarded.
+    """
+
+    def __init__(self, name: str, header: dict, cache_dir: str | None = None):
+        cache_dir = cache_dir or os.environ.get("SKILLS_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.path = os.path.join(cache_dir, name)
+        self.header = header
+        self.entries: dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and payload.get("header") == self.header:
+            self.entries = payload.get("entries", {})
+
+    def get(self, key: str) -> dict | None:
+        return self.entries.get(key)
+
+    def set(self, key: str, inputs: dict, outputs: dict) -> None:
+        self.entries[key] = {"inputs": inputs, "outputs": outputs}
+
+    def prune(self, live_keys) -> None:
+        """Drop entries whose key is not in ``live_keys``."""
+        live = set(live_keys)
+        self.entries = {k: v for k, v in self.entries.items() if k in live}
+
+    def save(self) -> None:
+        atomic_write(self.path, json.dumps({"header": self.header, "entries": self.entries},
+                                           indent=1, sort_keys=True) + "\n")
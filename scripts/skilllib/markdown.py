@@ -0,0 +1,187 @@
+"""Markdown helpers shared by the skill generators and auditors."""
+
+from __future__ import annotations
+
+import re
+
+from .tokens import count_tokens
+
+
+# Section headers that contain best practices
+BP_HEADERS = [
+    r"## Best Practices",
+    r"## Guidelines",
+    r"## Rules You Must Follow",
+    r"## Rules",
+    r"## Recommendations",
+]
+
+_BP_SECTION_RE = re.compile(
+    rf"(?:^|\n)({'|'.join(BP_HEADERS)})\s*\n(.*?)(?=\n## |\Z)",
+    re.DOTALL | re.MULTILINE,
+)
+_NUMBERED_ITEM_RE = re.compile(r"^\d+\.\s+")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*$")
+_CODE_BLOCK_RE = re.compile(r"```\w+")
+_REFERENCES_SECTION_RE = re.compile(r"^## References\s*\n(.*?)(?=^## |\Z)", re.DOTALL | re.MULTILINE)
+_REFERENCE_LINK_RE = re.compile(r"-\s+\[([^\]]+)\]\((https?://[^)]+)\)")
+
+# Decoration dropped by compact_markdown.
+_RULE_RE = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+_IMAGE_LINE_RE = re.compile(r"^\s*(?:\[?!\[[^\]]*\]\([^)]*\)(?:\]\([^)]*\))?\s*)+$")
+_COMMENT_RE = re.compile(r"<!--.*?-->")
+_SELF_LINK_RE = re.compile(r"\[(`?)([^\]`]+)\1\]\(\2\)")
+_TABLE_SEP_RE = re.compile(r"^\|?(?:\s*:?-+:?\s*\|)+\s*(?::?-+:?\s*)?$")
+_CELL_PAD_RE = re.compile(r"[ \t]*(?<!\\)\|[ \t]*")
+_CODE_SPAN_RE = re.compile(r"(`[^`]*`)")
+_SPACES_RE = re.compile(r"(?<=\S)[ \t]{2,}")
+
+
+def extract_best_practices(body: str) -> list[str]:
+    """Extract bullet items from the best-practices-like section of the body."""
+    match = _BP_SECTION_RE.search(body)
+    if not match:
+        return []
+
+    section_text = match.group(2)
+
+    # Parse bullet items (- prefixed), handling continuation lines
+    bullets = []
+    current = None
+    for line in section_text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("- "):
+            if current is not None:
+                bullets.append(current)
+            current = stripped[2:]
+        elif _NUMBERED_ITEM_RE.match(stripped):
+            # Numbered list item
+            if current is not None:
+                bullets.append(current)
+            current = _NUMBERED_ITEM_RE.sub("", stripped)
+        elif current is not None and stripped and not stripped.startswith("#"):
+            current += " " + stripped
+        elif not stripped:
+            if current is not None:
+                bullets.append(current)
+                current = None
+    if current is not None:
+        bullets.append(current)
+
+    return [b.strip() for b in bullets if b.strip()]
+
+
+def extract_headings(body: str) -> list[tuple[int, str]]:
+    """Return (level, title) for every ATX heading outside fenced code."""
+    headings = []
+    in_fence = False
+    for line in body.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = _HEADING_RE.match(line)
+        if match:
+            headings.append((len(match.group(1)), match.group(2)))
+    return headings
+
+
+def count_code_blocks(body: str) -> int:
+    """Count fenced code blocks that declare a language."""
+    return len(_CODE_BLOCK_RE.findall(body))
+
+
+def extract_references_from_body(body: str) -> list[dict]:
+    """Extract markdown links from a top-level References section."""
+    match = _REFERENCES_SECTION_RE.search(body)
+    if not match:
+        return []
+    refs = []
+    seen = set()
+    for title, url in _REFERENCE_LINK_RE.findall(match.group(1)):
+        if url in seen:
+            continue
+        seen.add(url)
+        refs.append({"title": title.strip(), "url": url.strip()})
+    return refs
+
+
+def _compact_table_row(row: str) -> str:
+    """One space around each cell; the alignment row shrinks to ``|---|``."""
+    if _TABLE_SEP_RE.match(row):
+        return "|" + "---|" * row.strip().strip("|").count("|") + "---|"
+    parts = _CODE_SPAN_RE.split(row)
+    parts[::2] = [_CELL_PAD_RE.sub(" | ", part) for part in parts[::2]]
+    return "".join(parts).strip()
+
+
+def _trim_code(lines: list[str], budget: int) -> list[str]:
+    """The leading lines of a code block that fit in ``budget`` tokens."""
+    if budget <= 0 or count_tokens("\n".join(lines)) <= budget:
+        return lines
+    kept = []
+    used = 0
+    for line in lines:
+        used += count_tokens(line + "\n")
+        if used > budget:
+            break
+        kept.append(line)
+    indent = kept[-1][:len(kept[-1]) - len(kept[-1].lstrip())] if kept else ""
+    return kept + [f"{indent}... ({len(lines) - len(kept)} more lines)"]
+
+
+def compact_markdown(body: str, code_budget: int = 300) -> str:
+    """A smaller rendering of ``body`` for agents, with the same content.
+
+    Outside fenced code: trailing and repeated spaces, runs of blank lines,
+    table cell padding, horizontal rules, HTML comments and image/badge
+    lines are dropped, and links whose text repeats their target become the
+    bare target. Code blocks over ``code_budget`` tokens (0 = no limit) keep
+    their leading lines and note how many were cut.
+    """
+    out: list[str] = []
+    code: list[str] = []
+    in_fence = False
+    in_comment = False
+    for line in body.splitlines():
+        if in_fence:
+            if line.lstrip().startswith("```"):
+                out.extend(_trim_code(code, code_budget))
+                out.append(line.rstrip())
+                in_fence = False
+            else:
+                code.append(line.rstrip())
+            continue
+        if in_comment:
+            if "-->" not in line:
+                continue
+            line = line.split("-->", 1)[1]
+            in_comment = False
+        line = _COMMENT_RE.sub("", line)
+        if "<!--" in line:
+            line = line.split("<!--", 1)[0]
+            in_comment = True
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            out.append(line.rstrip())
+            code = []
+            in_fence = True
+            continue
+        previous_blank = not out or not out[-1]
+        if (_RULE_RE.match(line) and previous_blank) or (stripped and _IMAGE_LINE_RE.match(line)):
+            continue
+        if stripped.startswith("|"):
+            line = _compact_table_row(stripped)
+        else:
+            indent = line[:len(line) - len(line.lstrip())]
+            line = indent + _SPACES_RE.sub(" ", stripped) if stripped else ""
+        line = _SELF_LINK_RE.sub(lambda m: f"`{m.group(2)}`" if m.group(1) else m.group(2), line)
+        if not line and previous_blank:
+            continue
+        out.append(line)
+    if in_fence:
+        out.extend(_trim_code(code, code_budget))
+    while out and not out[-1]:
+        out.pop()
+    return "\n".join(out) + "\n" if out else ""
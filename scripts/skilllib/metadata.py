@@ -0,0 +1,42 @@
+"""Frontmatter-derived fields shared by the generators and the skills index."""
+
+from __future__ import annotations
+
+import os
+import re
+
+
+def clean_description(desc: str) -> str:
+    """Extract the first meaningful paragraph, stripping USE FOR / DO NOT USE FOR."""
+    if not desc:
+        return ""
+    lines = desc.strip().splitlines()
+    clean_lines = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped.upper().startswith("USE FOR:"):
+            break
+        if stripped.upper().startswith("DO NOT USE FOR:"):
+            break
+        clean_lines.append(stripped)
+    result = " ".join(clean_lines).strip()
+    # collapse multiple spaces
+    result = re.sub(r"\s+", " ", result)
+    return result
+
+
+def display_name_from(name: str, metadata: dict) -> str:
+    """Get display name from metadata or title-case the name."""
+    if metadata and metadata.get("displayName"):
+        return metadata["displayName"]
+    # Title-case with hyphens replaced by spaces
+    return name.replace("-", " ").title()
+
+
+def count_rules(skill_dir: str) -> int | None:
+    """Number of rule files in ``skill_dir/rules``, or None without a rules/ dir."""
+    rules_dir = os.path.join(skill_dir, "rules")
+    if not os.path.isdir(rules_dir):
+        return None
+    return len([f for f in os.listdir(rules_dir)
+                if f.endswith(".md") and not f.startswith("_")])
@@ -0,0 +1,186 @@
+"""Atomic, batched writer for generated files.
+
+Generators queue a whole skill's outputs in an ``OutputBatch`` and call
+``commit()``. Files whose bytes already match the disk are skipped; the rest
+are first written to temp files next to their targets and only then renamed
+into place, so an interrupted run never leaves a half-written file and a
+failure while staging leaves the skill's previous outputs untouched. Stale
+files (e.g. rule files for bullets that no longer exist) are removed last.
+
+``atomic_write`` is the same temp-file-and-rename step for a single file
+(caches, manifests, indexes).
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass, field
+
+from .profile import count
+
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@dataclass
+class WriteStats:
+    written: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    bytes_written: int = 0
+    paths: list[str] = field(default_factory=list, repr=False)  # written or deleted
+
+    @property
+    def touched(self) -> int:
+        return self.written + self.deleted
+
+    def add(self, other: "WriteStats") -> None:
+        self.written += other.written
+        self.unchanged += other.unchanged
+        self.deleted += other.deleted
+        self.bytes_written += other.bytes_written
+        self.paths.extend(other.paths)
+
+    def summary(self) -> str:
+        return (f"{self.written} written, {self.unchanged} unchanged, {self.deleted} deleted, "
+                f"{format_bytes(self.bytes_written)} written")
+
+
+def format_bytes(n: int) -> str:
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f} KiB"
+    return f"{n / (1024 * 1024):.1f} MiB"
+
+
+def _same_bytes(path: str, data: bytes) -> bool:
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+class OutputBatch:
+    """Outputs for one unit of work (usually one skill), written together."""
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self.files: dict[str, bytes] = {}
+        self.kept: set[str] = set()
+        self._prune: set[str] = set()
+
+    def add(self, path: str, content) -> None:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.files[os.path.abspath(path)] = content
+
+    def keep(self, path: str) -> None:
+        """Claim ``path`` as an output without rewriting it (the caller knows
+        it is current); it counts as unchanged and is never pruned."""
+        self.kept.add(os.path.abspath(path))
+
+    def prune(self, paths) -> None:
+        """On commit, delete those of ``paths`` that this batch did not produce.
+
+        Pass only files a previous run generated (e.g. those listed in a
+        committed index), so hand-written files next to the outputs are never
+        touched.
+        """
+        self._prune.update(os.path.abspath(p) for p in paths)
+
+    def _stale(self) -> list[str]:
+        return [path for path in sorted(self._prune)
+                if path not in self.files and path not in self.kept and os.path.isfile(path)]
+
+    def commit(self) -> WriteStats:
+        """Write changed files atomically and delete stale ones."""
+        stats = WriteStats(unchanged=len(self.kept))
+        changed = []
+        for path, data in self.files.items():
+            if _same_bytes(path, data):
+                stats.unchanged += 1
+            else:
+                changed.append((path, data))
+        stale = self._stale()
+
+        if not self.dry_run:
+            staged = []
+            try:
+                for path, data in changed:
+                    staged.append((_stage(path, data), path))
+            except BaseException:
+                for tmp_path, _ in staged:
+                    _unlink_quietly(tmp_path)
+                raise
+            for i, (tmp_path, path) in enumerate(staged):
+                try:
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    for leftover, _ in staged[i:]:
+                        _unlink_quietly(leftover)
+                    raise
+            for path in stale:
+                _unlink_quietly(path)
+            count("files_written", len(changed))
+            count("written_bytes", sum(len(data) for _, data in changed))
+            count("files_deleted", len(stale))
+
+        for path, data in changed:
+            stats.written += 1
+            stats.bytes_written += len(data)
+            stats.paths.append(path)
+        stats.deleted = len(stale)
+        stats.paths.extend(stale)
+        self.files.clear()
+        self.kept.clear()
+        self._prune.clear()
+        return stats
+
+
+def atomic_write(path: str, data) -> None:
+    """Replace ``path`` with ``data`` (str is UTF-8 encoded) in one rename.
+
+    Readers see the old file or the new one, never a partial write. An
+    existing file keeps its permissions; a new one gets the umask default
+    rather than mkstemp's 0600.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp_path = _stage(os.path.abspath(path), data)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
+
+
+def _stage(path: str, data: bytes) -> str:
+    """Write ``data`` to a temp file beside ``path``; return the temp path."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
+    return tmp_path
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
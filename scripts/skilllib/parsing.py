@@ -0,0 +1,284 @@
+"""Single-pass SKILL.md parsing backed by a persistent on-disk cache.
+
+Every script in scripts/ needs the same facts about a SKILL.md file: the YAML
+frontmatter, where the body starts, and a handful of derived values. Parsing
+YAML is the expensive part, so results are cached in ``.cache/`` keyed by
+absolute path and validated against the file's mtime, size and SHA-256.
+
+Callers that only need frontmatter use ``load_frontmatter``, which streams the
+file up to the closing fence (see frontmatter.py) and caches that header
+separately, validated by mtime and size.
+
+Set ``SKILLS_NO_CACHE=1`` to bypass the cache, or ``SKILLS_CACHE_DIR`` to move it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from .frontmatter import (
+    FENCE_MISSING,
+    FENCE_OK,
+    FENCE_UNTERMINATED,
+    FrontmatterView,
+    SkillHeader,
+    decode_text,
+    load_yaml,
+    read_frontmatter,
+)
+from .markdown import count_code_blocks, extract_best_practices, extract_headings
+from .output import atomic_write
+from .profile import count, span
+
+
+# Bump whenever the parsed or derived fields change shape or meaning.
+PARSER_VERSION = 2
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CACHE_DIR = os.path.join(REPO_ROOT, ".cache")
+CACHE_FILENAME = "skill-parse-cache.pickle"
+
+FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)", re.DOTALL)
+
+
+@dataclass
+class ParsedSkill(FrontmatterView):
+    """Parsed view of a single SKILL.md file."""
+
+    path: str
+    sha256: str
+    fence: str
+    frontmatter: Any = None
+    yaml_error: str | None = None
+    body_offset: int = 0
+    body_blank: bool = True
+    headings: list[tuple[int, str]] = field(default_factory=list)
+    code_blocks: int = 0
+    bp_bullets: list[str] = field(default_factory=list)
+
+    def read_text(self) -> str:
+        with open(self.path, "rb") as f:
+            data = f.read()
+        count("files_read")
+        count("read_bytes", len(data))
+        return decode_text(data)
+
+    def load_body(self) -> str:
+        """Re-read the file and return the body (everything after the fence)."""
+        return self.read_text()[self.body_offset:]
+
+
+def parse_text(path: str, text: str, sha256: str, header: SkillHeader | None = None) -> ParsedSkill:
+    """Parse decoded SKILL.md text into a ParsedSkill.
+
+    ``header`` is an already-streamed frontmatter for the same file contents;
+    when given, its YAML result is reused instead of parsing again.
+    """
+    match = FRONTMATTER_RE.match(text)
+    frontmatter = None
+    yaml_error = None
+    if match:
+        fence = FENCE_OK
+        body, body_offset = match.group(2), match.start(2)
+        if header is not None and header.has_frontmatter:
+            frontmatter, yaml_error = header.frontmatter, header.yaml_error
+        else:
+            frontmatter, yaml_error = load_yaml(match.group(1))
+    else:
+        # Without fences the whole file is treated as body.
+        fence = FENCE_UNTERMINATED if text.startswith("---") else FENCE_MISSING
+        body, body_offset = text, 0
+
+    with span("extract"):
+        return ParsedSkill(
+            path=path,
+            sha256=sha256,
+            fence=fence,
+            frontmatter=frontmatter,
+            yaml_error=yaml_error,
+            body_offset=body_offset,
+            body_blank=not body.strip(),
+            headings=extract_headings(body),
+            code_blocks=count_code_blocks(body),
+            bp_bullets=extract_best_practices(body),
+        )
+
+
+class SkillParseCache:
+    """Persistent map of absolute path -> (mtime_ns, size, ParsedSkill)."""
+
+    def __init__(self, cache_dir: str | None = None, enabled: bool | None = None):
+        if enabled is None:
+            enabled = os.environ.get("SKILLS_NO_CACHE", "") in ("", "0")
+        self.enabled = enabled
+        self.cache_dir = cache_dir or os.environ.get("SKILLS_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.cache_path = os.path.join(self.cache_dir, CACHE_FILENAME)
+        self.entries: dict[str, tuple[int, int, ParsedSkill]] = {}
+        # Frontmatter-only entries from load_frontmatter(), keyed like entries
+        # but validated by stat alone since the whole file is never hashed.
+        self.headers: dict[str, SkillHeader] = {}
+        self.hits = 0
+        self.misses = 0
+        # get()/frontmatter() calls per absolute path in this process.
+        self.lookups: Counter[str] = Counter()
+        self._dirty = False
+        if self.enabled:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == PARSER_VERSION:
+            self.entries = payload.get("entries", {})
+            self.headers = payload.get("headers", {})
+
+    def get(self, path: str) -> ParsedSkill:
+        """Return the parsed skill at ``path``, parsing only if it changed."""
+        key = os.path.abspath(path)
+        self.lookups[key] += 1
+        st = os.stat(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            self.hits += 1
+            return entry[2]
+
+        with open(key, "rb") as f:
+            data = f.read()
+        count("files_read")
+        count("read_bytes", len(data))
+        digest = hashlib.sha256(data).hexdigest()
+        if entry is not None and entry[2].sha256 == digest:
+            # Touched but unchanged: refresh the stat key, skip the YAML parse.
+            parsed = entry[2]
+            self.hits += 1
+        else:
+            header = self.headers.get(key)
+            if header is not None and (header.mtime_ns, header.size) != (st.st_mtime_ns, st.st_size):
+                header = None
+            parsed = parse_text(key, decode_text(data), digest, header)
+            self.misses += 1
+        if self.enabled:
+            self.entries[key] = (st.st_mtime_ns, st.st_size, parsed)
+            self._dirty = True
+        return parsed
+
+    def peek(self, path: str) -> ParsedSkill | None:
+        """Return the cached parse for ``path`` if still fresh, without reading it."""
+        key = os.path.abspath(path)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        st = os.stat(key)
+        if entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            self.hits += 1
+            return entry[2]
+        return None
+
+    def frontmatter(self, path: str) -> FrontmatterView:
+        """Frontmatter-only lookup: a fresh cache entry, else a streamed header."""
+        self.lookups[os.path.abspath(path)] += 1
+        cached = self.peek(path)
+        if cached is not None:
+            return cached
+        key = os.path.abspath(path)
+        header = self.headers.get(key)
+        if header is not None:
+            st = os.stat(key)
+            if (header.mtime_ns, header.size) == (st.st_mtime_ns, st.st_size):
+                self.hits += 1
+                return header
+        header = read_frontmatter(key)
+        count("files_read")
+        count("read_bytes", header.fence_end if header.has_frontmatter else header.size)
+        self.misses += 1
+        if self.enabled:
+            self.headers[key] = header
+            self._dirty = True
+        return header
+
+    def entry(self, path: str):
+        """Return the raw (mtime_ns, size, ParsedSkill) entry for ``path``."""
+        return self.entries.get(os.path.abspath(path))
+
+    def header(self, path: str) -> SkillHeader | None:
+        """Return the cached streamed header for ``path``, if any."""
+        return self.headers.get(os.path.abspath(path))
+
+    def absorb_header(self, path: str, header: SkillHeader | None) -> None:
+        """Adopt a streamed header read by another process."""
+        if not self.enabled or header is None:
+            return
+        key = os.path.abspath(path)
+        if self.headers.get(key) != header:
+            self.headers[key] = header
+            self._dirty = True
+
+    def absorb(self, path: str, entry) -> None:
+        """Adopt an entry produced by another process (e.g. a pool worker)."""
+        if not self.enabled or entry is None:
+            return
+        key = os.path.abspath(path)
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically persist the cache if anything changed."""
+        if not self.enabled or not self._dirty:
+            return
+        # Drop entries for files that no longer exist.
+        live = {k: v for k, v in self.entries.items() if os.path.exists(k)}
+        live_headers = {k: v for k, v in self.headers.items() if os.path.exists(k)}
+        payload = {"version": PARSER_VERSION, "entries": live, "headers": live_headers}
+        atomic_write(self.cache_path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        self._dirty = False
+
+
+_default_cache: SkillParseCache | None = None
+
+
+def get_cache() -> SkillParseCache:
+    """Return the process-wide parse cache, loading it on first use."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SkillParseCache()
+    return _default_cache
+
+
+def load_skill(path: str) -> ParsedSkill:
+    """Parse a SKILL.md through the process-wide cache."""
+    return get_cache().get(path)
+
+
+def load_frontmatter(path: str) -> FrontmatterView:
+    """Frontmatter of a SKILL.md without loading its body when avoidable.
+
+    Returns the cached ParsedSkill if the file is unchanged, otherwise a
+    SkillHeader read by streaming up to the closing fence.
+    """
+    return get_cache().frontmatter(path)
+
+
+def save_cache() -> None:
+    """Persist the process-wide cache (no-op if it was never used)."""
+    if _default_cache is not None:
+        _default_cache.save()
+
+
+def parse_skill_md(path: str):
+    """Parse SKILL.md into (frontmatter_dict, body_str).
+
+    Returns (None, content) when the file has no frontmatter fences and an
+    empty dict when the YAML fails to parse.
+    """
+    parsed = load_skill(path)
+    return parsed.frontmatter_dict(), parsed.load_body()
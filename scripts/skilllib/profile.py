@@ -0,0 +1,221 @@
+"""Opt-in timing spans and I/O counters shared by the scripts.
+
+Scripts wrap each phase (discovery, parsing, rendering, writing, ...) in
+``span()`` and each skill in ``skill()``; skilllib counts files and bytes read
+and written as it goes. Everything is a no-op until ``enable()`` is called,
+which the scripts do for ``--profile [N]`` (print phase totals, counters and
+the N slowest skills to stderr) and ``--trace PATH`` (write a Chrome
+trace-event JSON that opens in chrome://tracing or Perfetto).
+
+Pools pass ``init_worker`` as their initializer so workers profile when the
+parent does; work done in a worker is recorded with ``capture()``, returned
+with the worker's result, and merged in the parent with ``merge()``. Timestamps come
+from ``time.perf_counter``, which is system-wide on Linux, so worker spans
+line up with the parent's on one timeline.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+_NULL = contextlib.nullcontext()
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        # (name, category, start, duration, pid, tid, args)
+        self.events: list[tuple] = []
+        self.counters: Counter[str] = Counter()
+
+    def enable(self) -> None:
+        self.enabled = True
+        self.origin = time.perf_counter()
+
+    def span(self, name: str, cat: str = "phase", **args):
+        """Context manager timing one phase; nests freely."""
+        if not self.enabled:
+            return _NULL
+        return self._span(name, cat, args)
+
+    def skill(self, rel: str):
+        """Span covering all work for one skill (reported by --profile)."""
+        if not self.enabled:
+            return _NULL
+        return self._span(rel, "skill", {})
+
+    @contextlib.contextmanager
+    def _span(self, name: str, cat: str, args: dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((name, cat, start, time.perf_counter() - start,
+                                os.getpid(), threading.get_ident(), args))
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] += n
+
+    @contextlib.contextmanager
+    def capture(self):
+        """Record into a fresh buffer; yields a dict filled with the events and
+        counters on exit (for returning from a pool worker)."""
+        payload = {}
+        if not self.enabled:
+            yield payload
+            return
+        saved = self.events, self.counters
+        self.events, self.counters = [], Counter()
+        try:
+            yield payload
+        finally:
+            payload["events"], payload["counters"] = self.events, dict(self.counters)
+            self.events, self.counters = saved
+
+    def merge(self, payload: dict | None) -> None:
+        """Adopt what ``capture()`` recorded, possibly in another process."""
+        if not self.enabled or not payload:
+            return
+        self.events.extend(payload["events"])
+        self.counters.update(payload["counters"])
+
+    def phase_totals(self) -> list[tuple[str, float, float, int]]:
+        """(name, total seconds, self seconds, calls) per phase span, in order
+        of first appearance. Self time excludes spans nested inside."""
+        nested = [0.0] * len(self.events)
+        by_thread: dict[tuple, list[int]] = {}
+        for i, event in enumerate(self.events):
+            by_thread.setdefault((event[4], event[5]), []).append(i)
+        for indices in by_thread.values():
+            indices.sort(key=lambda i: (self.events[i][2], -self.events[i][3]))
+            stack: list[tuple[float, int]] = []  # (end, index)
+            for i in indices:
+                start, duration = self.events[i][2], self.events[i][3]
+                while stack and stack[-1][0] <= start:
+                    stack.pop()
+                if stack:
+                    nested[stack[-1][1]] += duration
+                stack.append((start + duration, i))
+
+        totals: dict[str, list] = {}
+        for i, (name, cat, _, duration, *_) in enumerate(self.events):
+            if cat == "skill":
+                continue
+            entry = totals.setdefault(name, [0.0, 0.0, 0])
+            entry[0] += duration
+            entry[1] += duration - nested[i]
+            entry[2] += 1
+        return [(name, t, own, n) for name, (t, own, n) in totals.items()]
+
+    def slowest(self, n: int) -> list[tuple[str, float]]:
+        skills = [(name, duration) for name, cat, _, duration, *_ in self.events if cat == "skill"]
+        skills.sort(key=lambda item: (-item[1], item[0]))
+        return skills[:n]
+
+    def print_report(self, slowest: int, file=None) -> None:
+        from .output import format_bytes
+
+        file = file or sys.stderr
+        wall = time.perf_counter() - self.origin
+        print(f"\nProfile (wall {wall:.3f}s)", file=file)
+        print(f"{'Phase':<18} {'Total':>10} {'Self':>10} {'Calls':>7}", file=file)
+        for name, total, own, calls in self.phase_totals():
+            print(f"  {name:<16} {total:>9.3f}s {own:>9.3f}s {calls:>7}", file=file)
+        if self.counters:
+            print("Counters:", file=file)
+            for name in sorted(self.counters):
+                value = self.counters[name]
+                shown = format_bytes(value) if name.endswith("bytes") else str(value)
+                print(f"  {name:<16} {shown:>10}", file=file)
+        skills = self.slowest(slowest)
+        if skills:
+            print(f"Slowest {len(skills)} skills:", file=file)
+            for name, duration in skills:
+                print(f"  {duration * 1e3:>9.2f} ms  {name}", file=file)
+
+    def trace_events(self) -> list[dict]:
+        events = []
+        pids = set()
+        for name, cat, start, duration, pid, tid, args in self.events:
+            pids.add(pid)
+            events.append({
+                "name": name, "cat": cat, "ph": "X",
+                "ts": round((start - self.origin) * 1e6, 3),
+                "dur": round(duration * 1e6, 3),
+                "pid": pid, "tid": tid, "args": args,
+            })
+        main_pid = os.getpid()
+        for pid in sorted(pids | {main_pid}):
+            label = os.path.basename(sys.argv[0]) if pid == main_pid else f"worker {pid}"
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                           "args": {"name": label}})
+        if self.counters:
+            events.append({
+                "name": "io", "ph": "C", "pid": main_pid, "tid": 0,
+                "ts": round((time.perf_counter() - self.origin) * 1e6, 3),
+                "args": dict(sorted(self.counters.items())),
+            })
+        events.sort(key=lambda e: (e.get("ts", 0), -e.get("dur", 0)))
+        return events
+
+    def write_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+            f.write("\n")
+
+
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    return _profiler
+
+
+def span(name: str, cat: str = "phase", **args):
+    return _profiler.span(name, cat, **args)
+
+
+def skill(rel: str):
+    return _profiler.skill(rel)
+
+
+def count(name: str, n: int = 1) -> None:
+    _profiler.count(name, n)
+
+
+def init_worker(enabled: bool) -> None:
+    """ProcessPoolExecutor initializer: profile workers if the parent does."""
+    if enabled:
+        _profiler.enable()
+
+
+def add_arguments(parser) -> None:
+    """Add --profile [N] and --trace PATH to an argparse parser."""
+    parser.add_argument("--profile", metavar="N", type=int, nargs="?", const=20,
+                        help="print phase timings, I/O counters and the N slowest "
+                             "skills to stderr (default N: 20)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace-event JSON of every span to PATH")
+
+
+def configure(args) -> None:
+    """Enable profiling if --profile or --trace was given."""
+    if args.profile is not None or args.trace:
+        _profiler.enable()
+
+
+def finish(args) -> None:
+    """Print the --profile report and write the --trace file, if requested."""
+    if args.profile is not None:
+        _profiler.print_report(args.profile)
+    if args.trace:
+        _profiler.write_trace(args.trace)
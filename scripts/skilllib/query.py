@@ -0,0 +1,694 @@
+"""Columnar store of every rule and skill, queried with boolean filters.
+
+The store (``.cache/query-store.bin``) holds two tables, rules and skills,
+one column per field, read through mmap::
+
+    b"SKQSTO01" | u32 header length | header JSON | columns
+
+The header names each column with its byte range. String columns are a u32
+offset array plus the concatenated UTF-8 bytes; numeric columns are packed
+arrays. Rules are sorted by path (``python/cli/rules/cli-version-flag.md``,
+relative to skills/), so a skill's rules are one contiguous range. Rule
+titles, impacts and bodies come from each skill's ``rules/_index.json``
+(skilllib/rules_index.py) and the byte ranges it names. Tags are indexed once
+per skill: the tags generate-rules.py writes into every rule of the skill
+(``metadata.tags`` plus its name, parent directories and USE FOR keywords),
+or just ``metadata.tags`` for a skill without rules. Text columns are
+lower-cased, and each has a word index: the sorted distinct words (runs of
+ASCII letters, digits and ``_``) with the rows that contain each, and a pair
+index of adjacent words (``b"retry policy"``) built the same way.
+
+A query is a boolean expression over filters::
+
+    impact:HIGH tag:security path:dotnet text:token
+    (tag:azure OR tag:aws) AND NOT impact:LOW
+    impact:high+ -tag:deprecated "connection string"
+
+``tag:`` matches a tag exactly (``tag:azure*`` matches a prefix), ``impact:``
+a level (``impact:high+`` also matches more severe ones), ``path:`` a skill
+directory and everything under it (``path:python/cl*`` a raw prefix), and
+``text:`` or a bare word text that starts a word in the rule body (title
+included), or in a skill's name, description and tags: ``text:secur`` finds
+"security", ``text:"retry policy"`` the phrase, case-insensitively. Adjacent
+filters are ANDed;
+``OR``, ``AND``, ``NOT`` (or a leading ``-``) and parentheses combine them.
+
+Every filter evaluates to a row mask: a big integer holding one byte (0 or 1)
+per row, so AND, OR and NOT are single integer operations. Impact masks come
+from a byte translation of the impact column, path masks from a binary search
+of the sorted paths, and tag masks from slice assignments over each tagged
+skill's rule range. A one-word text filter is the union of the word index
+entries it prefixes; a phrase intersects the pair index entries of its
+adjacent words, which leaves only rows where those words follow one another,
+and then checks the phrase itself (punctuation included) on those rows. Text is matched last in an AND, so when
+the other filters leave few rows it is checked on those rows alone.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from itertools import compress, islice
+from dataclasses import dataclass, field
+
+from .index import SKILLS_ROOT, discover_skill_dirs
+from .metadata import clean_description
+from .output import atomic_write
+from .parsing import DEFAULT_CACHE_DIR, load_skill
+from .rules_index import IMPACT_ORDER, INDEX_FILENAME, impact_rank
+
+
+# Bump whenever the columns or their encoding change.
+STORE_VERSION = 2
+STORE_FILENAME = "query-store.bin"
+MAGIC = b"SKQSTO01"
+FIELDS = ("tag", "impact", "path", "text")
+TABLES = ("rules", "skills")
+
+# Candidate rows at or below 1/CANDIDATE_RATIO of a table are text-matched one
+# by one; above it, the word index is cheaper.
+CANDIDATE_RATIO = 16
+
+_U32 = struct.Struct("<I")
+_WORD_RE = re.compile(rb"\w+")
+_WORD_BYTES = frozenset(b"0123456789_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_TOKEN_RE = re.compile(r'\s*(?:(-?\()|(\))|(-)?(?:([A-Za-z]+):)?(?:"([^"]*)"|([^\s()"]+)))')
+
+
+class QueryError(ValueError):
+    """The query cannot be parsed or names an unknown field or level."""
+
+
+@dataclass
+class RuleRow:
+    path: str          # rule file, relative to skills/
+    title: str
+    impact: str
+    text: str          # lower-cased rule body
+
+
+@dataclass
+class SkillRow:
+    path: str          # skill directory, relative to skills/
+    name: str
+    description: str
+    tags: list[str]
+    signature: list[int]
+    rules: list[RuleRow] = field(default_factory=list)
+
+
+# --- building ---------------------------------------------------------------
+
+def _cache_dir() -> str:
+    return os.environ.get("SKILLS_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+
+def query_store_path(cache_dir: str | None = None) -> str:
+    return os.path.join(cache_dir or _cache_dir(), STORE_FILENAME)
+
+
+def _stat_signature(skill_dir: str) -> list[int]:
+    """[SKILL.md mtime_ns, SKILL.md size, rules/ mtime_ns or 0]."""
+    st = os.stat(os.path.join(skill_dir, "SKILL.md"))
+    try:
+        rules_mtime = os.stat(os.path.join(skill_dir, "rules")).st_mtime_ns
+    except OSError:
+        rules_mtime = 0
+    return [st.st_mtime_ns, st.st_size, rules_mtime]
+
+
+def read_skill(rel: str, skill_dir: str, signature: list[int]) -> SkillRow:
+    """Row for one skill, with its rules as listed in rules/_index.json."""
+    fm = load_skill(os.path.join(skill_dir, "SKILL.md")).frontmatter_dict() or {}
+    metadata = fm.get("metadata") if isinstance(fm.get("metadata"), dict) else {}
+    tags = metadata.get("tags")
+    row = SkillRow(rel, str(fm.get("name", os.path.basename(skill_dir))),
+                   clean_description(fm.get("description", "")),
+                   [str(t) for t in tags] if isinstance(tags, list) else [], signature)
+    rules_dir = os.path.join(skill_dir, "rules")
+    try:
+        with open(os.path.join(rules_dir, INDEX_FILENAME), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        entries = index["rules"]
+    except (OSError, ValueError, KeyError):
+        return row
+    row.tags = [str(t) for t in index.get("tags", row.tags)]
+    prefix = "" if rel == "." else rel + "/"
+    for e in entries:
+        try:
+            with open(os.path.join(rules_dir, e["file"]), "rb") as f:
+                f.seek(e["offset"])
+                body = f.read(e["length"]).decode("utf-8", errors="replace")
+        except OSError:
+            continue
+        row.rules.append(RuleRow(f"{prefix}rules/{e['file']}", e["title"], e["impact"],
+                                 body.lower()))
+    return row
+
+
+class _Writer:
+    def __init__(self):
+        self.blob = bytearray()
+        self.columns: dict[str, list[int]] = {}
+
+    def add(self, name: str, data: bytes) -> None:
+        self.blob += b"\0" * (-len(self.blob) % 8)
+        self.columns[name] = [len(self.blob), len(data)]
+        self.blob += data
+
+    def numbers(self, name: str, typecode: str, values) -> None:
+        self.add(name, array(typecode, values).tobytes())
+
+    def strings(self, name: str, values) -> None:
+        data = bytearray()
+        offsets = array("I", [0])
+        for value in values:
+            data += value.encode("utf-8") if isinstance(value, str) else value
+            offsets.append(len(data))
+        self.add(name + ".offsets", offsets.tobytes())
+        self.add(name, bytes(data))
+
+    def postings(self, name: str, keys: list, rows: dict) -> None:
+        """Sorted ``keys``, and for each the ascending row numbers in ``rows[key]``."""
+        self.strings(name, keys)
+        offsets = [0]
+        for key in keys:
+            offsets.append(offsets[-1] + len(rows[key]))
+        self.numbers(name + ".rows.offsets", "I", offsets)
+        self.numbers(name + ".rows", "I", (n for key in keys for n in rows[key]))
+
+    def text(self, name: str, texts) -> None:
+        """A lower-cased text column, its word index and its adjacent-word index."""
+        data = [text.encode("utf-8") for text in texts]
+        rows: dict[bytes, list[int]] = {}
+        pairs: dict[bytes, list[int]] = {}
+        for number, text in enumerate(data):
+            words = _WORD_RE.findall(text)
+            for word in set(words):
+                rows.setdefault(word, []).append(number)
+            for pair in set(map(b" ".join, zip(words, words[1:]))):
+                pairs.setdefault(pair, []).append(number)
+        self.strings(name, data)
+        self.postings(name + ".words", sorted(rows), rows)
+        self.postings(name + ".pairs", sorted(pairs), pairs)
+
+
+def pack_store(skills: list[SkillRow]) -> bytes:
+    """Pack skill rows (with their rules) into the store format."""
+    skills = sorted(skills, key=lambda s: s.path.encode("utf-8"))
+    rules = sorted(((rule, number) for number, skill in enumerate(skills) for rule in skill.rules),
+                   key=lambda pair: pair[0].path.encode("utf-8"))
+    levels = sorted({rule.impact for rule, _ in rules}, key=impact_rank)
+    codes = {level: code for code, level in enumerate(levels)}
+    ranges = [[0, 0] for _ in skills]
+    for i, (_, number) in enumerate(rules):
+        if ranges[number][1] == 0:
+            ranges[number][0] = i
+        ranges[number][1] = i + 1
+    tag_skills: dict[bytes, list[int]] = {}
+    for number, skill in enumerate(skills):
+        for tag in dict.fromkeys(t.lower().encode("utf-8") for t in skill.tags):
+            tag_skills.setdefault(tag, []).append(number)
+
+    w = _Writer()
+    w.strings("rules.path", (rule.path for rule, _ in rules))
+    w.strings("rules.title", (rule.title for rule, _ in rules))
+    w.text("rules.text", (rule.text for rule, _ in rules))
+    w.add("rules.impact", bytes(codes[rule.impact] for rule, _ in rules))
+    w.numbers("rules.skill", "I", (number for _, number in rules))
+    w.strings("skills.path", (s.path for s in skills))
+    w.strings("skills.name", (s.name for s in skills))
+    w.strings("skills.description", (s.description for s in skills))
+    w.strings("skills.tags", ("\n".join(s.tags) for s in skills))
+    w.text("skills.text", ("\n".join([s.name, s.description, *s.tags]).lower() for s in skills))
+    w.numbers("skills.rules", "I", (n for pair in ranges for n in pair))
+    w.numbers("skills.signature", "q", (n for s in skills for n in s.signature))
+    w.postings("tags", sorted(tag_skills), tag_skills)
+
+    header = json.dumps({
+        "version": STORE_VERSION,
+        "n_rules": len(rules),
+        "n_skills": len(skills),
+        "impacts": levels,
+        "columns": w.columns,
+    }, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+    return bytes(MAGIC + _U32.pack(len(header)) + header + w.blob)
+
+
+@dataclass
+class BuildStats:
+    skills: int = 0
+    rules: int = 0
+    reread: int = 0
+    written: bool = False
+
+
+def build_query_store(skills_root: str = SKILLS_ROOT, full: bool = False,
+                      cache_dir: str | None = None) -> BuildStats:
+    """Rewrite the store if the tree changed since it was built.
+
+    Skills whose stat signature matches the previous store are copied from
+    it; the rest are read again from SKILL.md and rules/ (all of them, with
+    ``full``).
+    """
+    path = query_store_path(cache_dir)
+    previous = None if full else open_store(path)
+    stats = BuildStats()
+    try:
+        old = previous.skill_numbers() if previous is not None else {}
+        rows = []
+        changed = previous is None
+        for skill_dir in discover_skill_dirs(skills_root):
+            rel = os.path.relpath(skill_dir, skills_root).replace("\\", "/")
+            signature = _stat_signature(skill_dir)
+            number = old.pop(rel, None)
+            if number is not None and previous.signature(number) == signature:
+                rows.append(previous.skill_row(number))
+                continue
+            rows.append(read_skill(rel, skill_dir, signature))
+            stats.reread += 1
+            changed = True
+        changed = changed or bool(old)
+    finally:
+        if previous is not None:
+            previous.close()
+    stats.skills = len(rows)
+    stats.rules = sum(len(row.rules) for row in rows)
+    if changed or not os.path.exists(path):
+        atomic_write(path, pack_store(rows))
+        stats.written = True
+    return stats
+
+
+# --- queries ----------------------------------------------------------------
+
+def parse_query(text: str):
+    """Parse a query into nested tuples.
+
+    Nodes are ``("and", [nodes])``, ``("or", [nodes])``, ``("not", node)``
+    and ``("filter", field, value)``; an empty query matches everything.
+    """
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise QueryError(f"cannot parse query at: {text[pos:]!r}")
+        pos = match.end()
+        lparen, rparen, minus, name, quoted, word = match.groups()
+        if lparen or rparen:
+            if lparen == "-(":
+                tokens.append("NOT")
+            tokens.append("(" if lparen else ")")
+        elif name is None and quoted is None and word in ("AND", "OR", "NOT"):
+            tokens.append(word)
+        else:
+            name = (name or "text").lower()
+            if name not in FIELDS:
+                raise QueryError(f"unknown field {name!r} (expected one of: {', '.join(FIELDS)})")
+            node = ("filter", name, quoted if quoted is not None else word)
+            if minus:
+                tokens.append("NOT")
+            tokens.append(node)
+
+    def parse_or(i):
+        node, i = parse_and(i)
+        children = [node]
+        while i < len(tokens) and tokens[i] == "OR":
+            node, i = parse_and(i + 1)
+            children.append(node)
+        return (children[0] if len(children) == 1 else ("or", children)), i
+
+    def parse_and(i):
+        node, i = parse_not(i)
+        children = [node]
+        while i < len(tokens) and tokens[i] not in ("OR", ")"):
+            if tokens[i] == "AND":
+                i += 1
+            node, i = parse_not(i)
+            children.append(node)
+        return (children[0] if len(children) == 1 else ("and", children)), i
+
+    def parse_not(i):
+        if i < len(tokens) and tokens[i] == "NOT":
+            node, i = parse_not(i + 1)
+            return ("not", node), i
+        if i >= len(tokens):
+            raise QueryError("query ends where a filter was expected")
+        token = tokens[i]
+        if token == "(":
+            node, i = parse_or(i + 1)
+            if i >= len(tokens) or tokens[i] != ")":
+                raise QueryError("missing ')'")
+            return node, i + 1
+        if isinstance(token, tuple):
+            return token, i + 1
+        raise QueryError(f"unexpected {token!r}")
+
+    if not tokens:
+        return ("and", [])
+    node, i = parse_or(0)
+    if i != len(tokens):
+        raise QueryError(f"unexpected {tokens[i]!r}")
+    return node
+
+
+class _Strings:
+    """A string column: ``column[i]`` is the UTF-8 bytes of row ``i``."""
+
+    def __init__(self, mm, offsets, start: int):
+        self.mm = mm
+        self.offsets = offsets
+        self.start = start
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return self.mm[self.start + self.offsets[i]:self.start + self.offsets[i + 1]]
+
+    def find(self, key: bytes, prefix: bool = False) -> tuple[int, int]:
+        """[start, end) of the rows equal to ``key`` (or starting with it, with
+        ``prefix``) in a sorted column."""
+        ids = range(len(self))
+        start = bisect.bisect_left(ids, key, key=self.__getitem__)
+        if prefix:
+            return start, bisect.bisect_right(ids, key, key=lambda i: self[i][:len(key)], lo=start)
+        return start, start + (start < len(self) and self[start] == key)
+
+
+class _Postings:
+    """Sorted keys, each with the ascending row numbers it occurs in."""
+
+    def __init__(self, keys: _Strings, offsets, rows):
+        self.keys = keys
+        self.offsets = offsets
+        self.rows = rows
+
+    def lookup(self, key: bytes, prefix: bool = False):
+        """Row numbers for ``key`` (or for every key it prefixes), key by key."""
+        start, end = self.keys.find(key, prefix)
+        return self.rows[self.offsets[start]:self.offsets[end]]
+
+
+class StoreError(ValueError):
+    """The file is not a readable query store."""
+
+
+class QueryStore:
+    """Read-only, memory-mapped view of the query store."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise StoreError(f"empty file: {path}") from None
+        mm = self._map
+        if mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise StoreError(f"not a query store: {path}")
+        (header_len,) = _U32.unpack_from(mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(mm[start:start + header_len])
+        if header.get("version") != STORE_VERSION:
+            self.close()
+            raise StoreError(f"query store version mismatch: {path}")
+        self.n_rules = header["n_rules"]
+        self.n_skills = header["n_skills"]
+        self.impacts: list[str] = header["impacts"]
+        self._base = start + header_len
+        self._columns = header["columns"]
+        self._views = []
+        try:
+            self.rule_path = self._strings("rules.path")
+            self.rule_title = self._strings("rules.title")
+            self.rule_text = self._strings("rules.text")
+            self.rule_words = self._postings("rules.text.words")
+            self.rule_pairs = self._postings("rules.text.pairs")
+            self.rule_impact = self._bytes("rules.impact")
+            self.rule_skill = self._numbers("rules.skill", "I")
+            self.skill_path = self._strings("skills.path")
+            self.skill_name = self._strings("skills.name")
+            self.skill_description = self._strings("skills.description")
+            self.skill_tags = self._strings("skills.tags")
+            self.skill_text = self._strings("skills.text")
+            self.skill_words = self._postings("skills.text.words")
+            self.skill_pairs = self._postings("skills.text.pairs")
+            self._skill_rules = self._numbers("skills.rules", "I")
+            self._signatures = self._numbers("skills.signature", "q")
+            self.tags = self._postings("tags")
+        except (KeyError, TypeError, ValueError):
+            self.close()
+            raise StoreError(f"corrupt query store: {path}") from None
+
+    def __enter__(self) -> "QueryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for view in self.__dict__.pop("_views", ()):
+            view.release()
+        self._map.close()
+        self._file.close()
+
+    def _bytes(self, name: str) -> bytes:
+        offset, size = self._columns[name]
+        return self._map[self._base + offset:self._base + offset + size]
+
+    def _numbers(self, name: str, typecode: str):
+        offset, size = self._columns[name]
+        view = memoryview(self._map)[self._base + offset:self._base + offset + size].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def _strings(self, name: str) -> _Strings:
+        offsets = self._numbers(name + ".offsets", "I")
+        return _Strings(self._map, offsets, self._base + self._columns[name][0])
+
+    def _postings(self, name: str) -> _Postings:
+        return _Postings(self._strings(name), self._numbers(name + ".rows.offsets", "I"),
+                         self._numbers(name + ".rows", "I"))
+
+    # -- rows --
+
+    def rule_range(self, skill: int) -> tuple[int, int]:
+        return self._skill_rules[2 * skill], self._skill_rules[2 * skill + 1]
+
+    def signature(self, skill: int) -> list[int]:
+        return list(self._signatures[3 * skill:3 * skill + 3])
+
+    def skill_numbers(self) -> dict[str, int]:
+        return {self.skill_path[i].decode("utf-8"): i for i in range(self.n_skills)}
+
+    def skill_tag_list(self, skill: int) -> list[str]:
+        text = self.skill_tags[skill].decode("utf-8")
+        return text.split("\n") if text else []
+
+    def skill_row(self, skill: int) -> SkillRow:
+        """A skill and its rules as stored, for rebuilding without re-reading."""
+        row = SkillRow(self.skill_path[skill].decode("utf-8"),
+                       self.skill_name[skill].decode("utf-8"),
+                       self.skill_description[skill].decode("utf-8"),
+                       self.skill_tag_list(skill), self.signature(skill))
+        start, end = self.rule_range(skill)
+        for i in range(start, end):
+            row.rules.append(RuleRow(self.rule_path[i].decode("utf-8"),
+                                     self.rule_title[i].decode("utf-8"),
+                                     self.impacts[self.rule_impact[i]],
+                                     self.rule_text[i].decode("utf-8")))
+        return row
+
+    def rule(self, i: int) -> dict:
+        skill = self.rule_skill[i]
+        return {"path": self.rule_path[i].decode("utf-8"),
+                "skill": self.skill_path[skill].decode("utf-8"),
+                "title": self.rule_title[i].decode("utf-8"),
+                "impact": self.impacts[self.rule_impact[i]],
+                "tags": self.skill_tag_list(skill)}
+
+    def skill(self, i: int) -> dict:
+        start, end = self.rule_range(i)
+        return {"path": self.skill_path[i].decode("utf-8"),
+                "name": self.skill_name[i].decode("utf-8"),
+                "description": self.skill_description[i].decode("utf-8"),
+                "tags": self.skill_tag_list(i),
+                "rules": end - start}
+
+    def is_current(self, skills_root: str = SKILLS_ROOT) -> bool:
+        """True if every stored skill's stat signature still matches the tree."""
+        dirs = discover_skill_dirs(skills_root)
+        if len(dirs) != self.n_skills:
+            return False
+        numbers = self.skill_numbers()
+        for skill_dir in dirs:
+            rel = os.path.relpath(skill_dir, skills_root).replace("\\", "/")
+            try:
+                if rel not in numbers or self.signature(numbers[rel]) != _stat_signature(skill_dir):
+                    return False
+            except OSError:
+                return False
+        return True
+
+    # -- queries --
+
+    def query(self, query, table: str = "rules", limit: int | None = None) -> list[int]:
+        """Row numbers of ``table`` matching ``query`` (text or parsed), in path order."""
+        if table not in TABLES:
+            raise QueryError(f"unknown table {table!r}")
+        node = parse_query(query) if isinstance(query, str) else query
+        n = self.n_rules if table == "rules" else self.n_skills
+        everything = int.from_bytes(b"\1" * n, "little")
+        mask = _Evaluator(self, table, n, everything).evaluate(node, everything)
+        rows = compress(range(n), (mask & everything).to_bytes(n, "little"))
+        return list(rows if limit is None else islice(rows, limit))
+
+
+def _starts_word(data: bytes, term: bytes) -> bool:
+    """True if ``term`` occurs in ``data`` at the start of a word."""
+    i = data.find(term)
+    while i != -1:
+        if i == 0 or data[i - 1] not in _WORD_BYTES:
+            return True
+        i = data.find(term, i + 1)
+    return False
+
+
+def _rows_mask(n: int, rows) -> int:
+    flags = bytearray(n)
+    for i in rows:
+        flags[i] = 1
+    return int.from_bytes(flags, "little")
+
+
+def _ranges_mask(n: int, ranges) -> int:
+    flags = bytearray(n)
+    ones = b"\1" * n
+    for start, end in ranges:
+        flags[start:end] = ones[:end - start]
+    return int.from_bytes(flags, "little")
+
+
+class _Evaluator:
+    """Turns a parsed query into a row mask for one table of a store.
+
+    ``evaluate(node, within)`` is exact on the rows set in ``within``; what it
+    returns for other rows is unspecified, and callers AND it with ``within``.
+    """
+
+    def __init__(self, store: QueryStore, table: str, n: int, everything: int):
+        self.store = store
+        self.rules = table == "rules"
+        self.n = n
+        self.everything = everything
+
+    def evaluate(self, node, within: int) -> int:
+        kind = node[0]
+        if kind == "and":
+            mask = within
+            # Text last, so it only has to look at rows the other filters kept.
+            for child in sorted(node[1], key=lambda c: c[0] == "filter" and c[1] == "text"):
+                mask &= self.evaluate(child, mask)
+            return mask
+        if kind == "or":
+            mask = 0
+            for child in node[1]:
+                mask |= self.evaluate(child, within)
+            return mask
+        if kind == "not":
+            return self.everything ^ self.evaluate(node[1], within)
+        _, name, value = node
+        if name == "text":
+            return self.text(value, within)
+        return getattr(self, name)(value)
+
+    def impact(self, value: str) -> int:
+        level = value.rstrip("+").upper()
+        levels = self.store.impacts
+        if level not in IMPACT_ORDER and level not in (lv.upper() for lv in levels):
+            raise QueryError(f"unknown impact {value!r} (expected one of: "
+                             f"{', '.join(dict.fromkeys((*IMPACT_ORDER, *levels)))})")
+        if value.endswith("+"):
+            codes = {c for c, lv in enumerate(levels) if impact_rank(lv) <= impact_rank(level)}
+        else:
+            codes = {c for c, lv in enumerate(levels) if lv.upper() == level}
+        table = bytes(1 if c in codes else 0 for c in range(256))
+        flags = self.store.rule_impact.translate(table)
+        if self.rules:
+            return int.from_bytes(flags, "little")
+        store = self.store
+        return _ranges_mask(self.n, ((i, i + 1) for i in range(self.n)
+                                     if flags.find(1, *store.rule_range(i)) != -1))
+
+    def path(self, value: str) -> int:
+        value = value.removeprefix("skills/")
+        if value.endswith("*"):
+            prefix, exact = value[:-1], ""
+        else:
+            exact = value.strip("/")
+            prefix = exact + "/" if exact not in ("", ".") else ""
+        column = self.store.rule_path if self.rules else self.store.skill_path
+        ranges = [column.find(prefix.encode("utf-8"), prefix=True)]
+        if exact and not self.rules:
+            ranges.append(column.find(exact.encode("utf-8")))
+        return _ranges_mask(self.n, ranges)
+
+    def tag(self, value: str) -> int:
+        value = value.lower()
+        prefix = value.endswith("*")
+        skills = self.store.tags.lookup((value[:-1] if prefix else value).encode("utf-8"), prefix)
+        if self.rules:
+            return _ranges_mask(self.n, map(self.store.rule_range, skills))
+        return _rows_mask(self.n, skills)
+
+    def text(self, value: str, within: int) -> int:
+        term = value.lower().encode("utf-8")
+        if not term.strip():
+            return self.everything
+        store = self.store
+        column, words, pairs = ((store.rule_text, store.rule_words, store.rule_pairs)
+                                if self.rules else
+                                (store.skill_text, store.skill_words, store.skill_pairs))
+        starts_word = _WORD_RE.match(term) is not None
+        if starts_word and within.bit_count() * CANDIDATE_RATIO > self.n:
+            if _WORD_RE.fullmatch(term):
+                return _rows_mask(self.n, words.lookup(term, prefix=True))
+            parts = _WORD_RE.findall(term)
+            if len(parts) == 1:
+                within &= _rows_mask(self.n, words.lookup(parts[0]))
+            # Every word but a trailing one is whole, and the phrase's words are
+            # adjacent in any row that contains it; the phrase is checked below.
+            for k in range(len(parts) - 1):
+                last = k + 1 == len(parts) - 1 and term.endswith(parts[-1])
+                within &= _rows_mask(self.n, pairs.lookup(parts[k] + b" " + parts[k + 1],
+                                                          prefix=last))
+        flags = bytearray(self.n)
+        mm, offsets, base = column.mm, column.offsets, column.start
+        for i in compress(range(self.n), within.to_bytes(self.n, "little")):
+            start, end = base + offsets[i], base + offsets[i + 1]
+            at = mm.find(term, start, end)
+            if at == -1:
+                continue
+            if not starts_word or at == start or mm[at - 1] not in _WORD_BYTES:
+                flags[i] = 1
+            elif _starts_word(mm[start:end], term):
+                flags[i] = 1
+        return int.from_bytes(flags, "little")
+
+
+def open_store(path: str) -> QueryStore | None:
+    try:
+        return QueryStore(path)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,262 @@
+"""Rule indexes: find rules by impact and skill path without reading rules/.
+
+generate-rules.py writes ``rules/_index.json`` next to each skill's rule
+files. It lists every rule with its title, impact, file name, the byte offset
+and length of the rule's markdown after the frontmatter, and the SHA-256 of
+the file, sorted by impact (``IMPACT_ORDER``) and then file name. ``impacts``
+maps each level to its ``[start, end)`` slice of ``rules``, so "the CRITICAL
+rules of this skill" is one read of one small file. Tags are the same for
+every rule of a skill and are stored once, at the top.
+
+With ``--global-index`` the same entries for every skill are packed into one
+file (``.cache/rules-index.bin`` by default), read through mmap like the
+search index::
+
+    b"SKRIDX01" | u32 header length | header JSON
+    | u32[n+1] path byte offsets | u32[n+1] title byte offsets
+    | rule records | path bytes | title bytes
+
+The header lists the skills (path, name, tags) and, per impact level, the
+``[start, end)`` range of its rules. Within a level, rules are sorted by
+path relative to skills/ (``python/cli/rules/cli-version-flag.md``), so
+"every CRITICAL rule under python/" is a binary search for the prefix inside
+the CRITICAL range followed by a contiguous scan. A record is ``<III32s``:
+skill index, body offset, body length and SHA-256 digest of the file.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+
+from .impact import IMPACT_DESCRIPTIONS
+
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "_index.json"
+GLOBAL_INDEX_FILENAME = "rules-index.bin"
+MAGIC = b"SKRIDX01"
+
+# Most severe first; levels from custom keyword tables sort after these.
+IMPACT_ORDER = tuple(IMPACT_DESCRIPTIONS)
+
+_U32 = struct.Struct("<I")
+_RECORD = struct.Struct("<III32s")
+
+
+def impact_rank(level: str) -> tuple:
+    try:
+        return (IMPACT_ORDER.index(level), "")
+    except ValueError:
+        return (len(IMPACT_ORDER), level)
+
+
+def rule_entry(filename: str, title: str, impact: str, content: str) -> dict:
+    """Index entry for one rendered rule file."""
+    data = content.encode("utf-8")
+    body = data.index(b"\n---\n", 3) + 5 if data.startswith(b"---\n") else 0
+    while data[body:body + 1] == b"\n":
+        body += 1
+    return {
+        "file": filename,
+        "title": title,
+        "impact": impact,
+        "offset": body,
+        "length": len(data) - body,
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def indexed_files(rules_dir: str) -> list[str]:
+    """Rule file names listed in ``rules_dir``'s _index.json, or [] if it is
+    missing or unreadable. The index is committed, so this is what the
+    generator wrote last even without a build cache."""
+    try:
+        with open(os.path.join(rules_dir, INDEX_FILENAME), "r", encoding="utf-8") as f:
+            entries = json.load(f)["rules"]
+        names = [e["file"] for e in entries]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+    return [name for name in names
+            if isinstance(name, str) and name and os.path.basename(name) == name]
+
+
+def impact_ranges(levels) -> dict[str, list[int]]:
+    """{level: [start, end)} for a sequence of levels already grouped by level."""
+    ranges: dict[str, list[int]] = {}
+    for i, level in enumerate(levels):
+        ranges.setdefault(level, [i, i])[1] = i + 1
+    return ranges
+
+
+def build_skill_index(skill: str, name: str, tags: list, entries: list[dict]) -> str:
+    """``rules/_index.json`` text for one skill (``skill`` is relative to skills/)."""
+    entries = sorted(entries, key=lambda e: (impact_rank(e["impact"]), e["file"]))
+    head = {
+        "version": INDEX_VERSION,
+        "skill": skill,
+        "name": name,
+        "tags": tags,
+        "impacts": impact_ranges(e["impact"] for e in entries),
+    }
+    # One rule per line keeps the file small and its diffs readable.
+    lines = [f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}," for key, value in head.items()]
+    rules = ",\n".join(f"    {json.dumps(e, ensure_ascii=False)}" for e in entries)
+    return "{\n" + "\n".join(lines) + '\n  "rules": [\n' + rules + "\n  ]\n}\n"
+
+
+def pack_rules_index(indexes: list[dict]) -> bytes:
+    """Pack parsed per-skill indexes into the global index.
+
+    Output depends only on the indexes, so an unchanged tree packs to
+    identical bytes.
+    """
+    skills = sorted(indexes, key=lambda ix: ix["skill"].encode("utf-8"))
+    rows = []
+    for number, ix in enumerate(skills):
+        prefix = "" if ix["skill"] == "." else ix["skill"] + "/"
+        for e in ix["rules"]:
+            rows.append((impact_rank(e["impact"]), f"{prefix}rules/{e['file']}".encode("utf-8"),
+                         number, e))
+    rows.sort(key=lambda row: row[:2])
+
+    path_blob = bytearray()
+    title_blob = bytearray()
+    path_offsets = [0]
+    title_offsets = [0]
+    records = bytearray()
+    for _, path, number, e in rows:
+        path_blob += path
+        path_offsets.append(len(path_blob))
+        title_blob += e["title"].encode("utf-8")
+        title_offsets.append(len(title_blob))
+        records += _RECORD.pack(number, e["offset"], e["length"], bytes.fromhex(e["sha256"]))
+
+    header = json.dumps({
+        "version": INDEX_VERSION,
+        "skills": [[ix["skill"], ix["name"], ix["tags"]] for ix in skills],
+        "impacts": impact_ranges(row[3]["impact"] for row in rows),
+        "n_rules": len(rows),
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 4)
+
+    out = bytearray(MAGIC)
+    out += _U32.pack(len(header))
+    out += header
+    out += struct.pack(f"<{len(rows) + 1}I", *path_offsets)
+    out += struct.pack(f"<{len(rows) + 1}I", *title_offsets)
+    out += records
+    out += path_blob
+    out += title_blob
+    return bytes(out)
+
+
+@dataclass
+class RuleRef:
+    path: str       # rule file, relative to skills/
+    skill: str      # skill directory, relative to skills/
+    title: str
+    impact: str
+    offset: int     # first byte of the rule body in the file
+    length: int
+    sha256: str
+
+
+class RulesIndexError(ValueError):
+    """The file is not a readable global rules index."""
+
+
+class RulesIndex:
+    """Read-only, memory-mapped view of the global rules index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise RulesIndexError(f"empty file: {path}") from None
+        mm = self._map
+        if mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise RulesIndexError(f"not a rules index: {path}")
+        (header_len,) = _U32.unpack_from(mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(mm[start:start + header_len])
+        if header.get("version") != INDEX_VERSION:
+            self.close()
+            raise RulesIndexError(f"rules index version mismatch: {path}")
+        self.skills: list[list] = header["skills"]
+        self.impacts: dict[str, list[int]] = header["impacts"]
+        self.n_rules = header["n_rules"]
+        view = memoryview(mm)
+        pos = start + header_len
+        width = (self.n_rules + 1) * 4
+        self._path_offsets = view[pos:pos + width].cast("I")
+        pos += width
+        self._title_offsets = view[pos:pos + width].cast("I")
+        pos += width
+        self._records_start = pos
+        self._paths_start = pos + _RECORD.size * self.n_rules
+        self._titles_start = self._paths_start + self._path_offsets[self.n_rules]
+
+    def __enter__(self) -> "RulesIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_rules
+
+    def close(self) -> None:
+        for attr in ("_path_offsets", "_title_offsets"):
+            view = self.__dict__.pop(attr, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def _path(self, i: int) -> bytes:
+        offsets = self._path_offsets
+        return self._map[self._paths_start + offsets[i]:self._paths_start + offsets[i + 1]]
+
+    def _rule(self, i: int, impact: str) -> RuleRef:
+        skill, offset, length, digest = _RECORD.unpack_from(
+            self._map, self._records_start + i * _RECORD.size)
+        offsets = self._title_offsets
+        title = self._map[self._titles_start + offsets[i]:self._titles_start + offsets[i + 1]]
+        return RuleRef(self._path(i).decode("utf-8"), self.skills[skill][0],
+                       title.decode("utf-8"), impact, offset, length, digest.hex())
+
+    def rules(self, impact: str | None = None, prefix: str = ""):
+        """Rules of one impact level (or all levels, most severe first) whose
+        path relative to skills/ starts with ``prefix``.
+
+        A bare skill path as ``prefix`` (``python``) is treated as a directory
+        (``python/``), so it does not also match ``python-web/``.
+        """
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        key = prefix.encode("utf-8")
+        levels = [impact] if impact is not None else list(self.impacts)
+        for level in levels:
+            start, end = self.impacts.get(level, (0, 0))
+            i = bisect.bisect_left(range(start, end), key, key=self._path) + start
+            while i < end and self._path(i).startswith(key):
+                yield self._rule(i, level)
+                i += 1
+
+    def levels(self) -> dict[str, int]:
+        """Rule count per impact level."""
+        return {level: end - start for level, (start, end) in self.impacts.items()}
+
+
+def global_index_path(cache_dir: str) -> str:
+    return os.path.join(cache_dir, GLOBAL_INDEX_FILENAME)
@@ -0,0 +1,377 @@
+"""Persistent BM25F full-text index over skills.
+
+Each skill is one document with five fields: name, description (cleaned as in
+the generated READMEs), ``metadata.tags``, rule titles from rules/*.md, and
+the SKILL.md body. Term frequencies per document are kept in a pickle in
+.cache/ so a rebuild only re-tokenizes skills whose SKILL.md hash or rules/
+directory changed; the packed index is then rewritten from those vectors.
+
+The packed index (``.cache/search-index.bin``) is read through mmap::
+
+    b"SKSIDX01" | u32 header length | header JSON
+    | u32[n+1] term byte offsets | u32[n+1] posting offsets
+    | term bytes (sorted UTF-8) | postings
+
+A posting is ``<I5H``: document id then the term's frequency in each field.
+Lookups binary-search the term table in place, so a query touches only the
+pages for its own terms plus the header.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import pickle
+import re
+import struct
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .frontmatter import read_frontmatter
+from .index import SKILLS_ROOT, discover_skill_dirs
+from .metadata import clean_description
+from .output import atomic_write
+from .parsing import DEFAULT_CACHE_DIR, load_skill
+
+
+# Bump whenever tokenization, fields or the file layout change.
+SEARCH_VERSION = 1
+
+INDEX_FILENAME = "search-index.bin"
+DOCS_FILENAME = "search-docs.pickle"
+MAGIC = b"SKSIDX01"
+
+FIELDS = ("name", "description", "tags", "rules", "body")
+FIELD_WEIGHTS = {"name": 4.0, "description": 2.0, "tags": 3.0, "rules": 1.5, "body": 1.0}
+K1 = 1.2
+B = 0.75
+
+_POSTING = struct.Struct("<I" + "H" * len(FIELDS))
+_U32 = struct.Struct("<I")
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the this "
+    "to was were will with use used using".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens; keeps "c#" and "c++", drops stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _cache_dir() -> str:
+    return os.environ.get("SKILLS_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+
+def _stat_signature(skill_dir: str) -> list[int]:
+    """[SKILL.md mtime_ns, SKILL.md size, rules/ mtime_ns or 0]."""
+    st = os.stat(os.path.join(skill_dir, "SKILL.md"))
+    try:
+        rules_mtime = os.stat(os.path.join(skill_dir, "rules")).st_mtime_ns
+    except OSError:
+        rules_mtime = 0
+    return [st.st_mtime_ns, st.st_size, rules_mtime]
+
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def rule_titles(skill_dir: str) -> list[str]:
+    """``title`` of every generated rule file (rules/_*.md excluded)."""
+    rules_dir = os.path.join(skill_dir, "rules")
+    try:
+        names = sorted(os.listdir(rules_dir))
+    except OSError:
+        return []
+    titles = []
+    for name in names:
+        if not name.endswith(".md") or name.startswith("_"):
+            continue
+        fm = read_frontmatter(os.path.join(rules_dir, name)).frontmatter_dict() or {}
+        if fm.get("title"):
+            titles.append(str(fm["title"]))
+    return titles
+
+
+@dataclass
+class DocTerms:
+    """Tokenized form of one skill, kept between rebuilds."""
+
+    path: str
+    name: str
+    description: str
+    sha256: str
+    signature: list[int]
+    rules_mtime: int
+    tf: dict[str, dict[str, int]] = field(default_factory=dict)  # field -> term -> count
+    lengths: dict[str, int] = field(default_factory=dict)
+
+
+def tokenize_skill(rel: str, skill_dir: str, signature: list[int]) -> DocTerms:
+    parsed = load_skill(os.path.join(skill_dir, "SKILL.md"))
+    fm = parsed.frontmatter_dict() or {}
+    metadata = fm.get("metadata") or {}
+    tags = metadata.get("tags") if isinstance(metadata, dict) else None
+    name = str(fm.get("name", os.path.basename(skill_dir)))
+    description = clean_description(fm.get("description", ""))
+    texts = {
+        "name": name.replace("-", " "),
+        "description": description,
+        "tags": " ".join(str(t) for t in tags) if isinstance(tags, list) else "",
+        "rules": "\n".join(rule_titles(skill_dir)),
+        "body": parsed.load_body(),
+    }
+    doc = DocTerms(rel, name, description, parsed.sha256, signature, signature[2])
+    for field_name, text in texts.items():
+        tokens = tokenize(text)
+        doc.tf[field_name] = dict(Counter(tokens))
+        doc.lengths[field_name] = len(tokens)
+    return doc
+
+
+class DocStore:
+    """Pickled {path: DocTerms} from the previous build."""
+
+    def __init__(self, cache_dir: str | None = None):
+        self.path = os.path.join(cache_dir or _cache_dir(), DOCS_FILENAME)
+        self.docs: dict[str, DocTerms] = {}
+        try:
+            with open(self.path, "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == SEARCH_VERSION:
+            self.docs = payload.get("docs", {})
+
+    def save(self) -> None:
+        atomic_write(self.path, pickle.dumps(
+            {"version": SEARCH_VERSION, "docs": self.docs}, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@dataclass
+class BuildStats:
+    documents: int = 0
+    tokenized: int = 0
+    removed: int = 0
+    terms: int = 0
+    written: bool = False
+
+
+def update_docs(store: DocStore, skills_root: str = SKILLS_ROOT, full: bool = False) -> BuildStats:
+    """Bring ``store`` in line with the tree, re-tokenizing only changed skills.
+
+    A skill is re-tokenized when its SKILL.md hash or its rules/ directory
+    mtime differs from the stored document (or always, with ``full``).
+    """
+    stats = BuildStats()
+    live = {}
+    for skill_dir in discover_skill_dirs(skills_root):
+        rel = os.path.relpath(skill_dir, skills_root).replace("\\", "/")
+        live[rel] = skill_dir
+    for rel in [r for r in store.docs if r not in live]:
+        del store.docs[rel]
+        stats.removed += 1
+    for rel, skill_dir in live.items():
+        signature = _stat_signature(skill_dir)
+        doc = store.docs.get(rel)
+        if not full and doc is not None:
+            if doc.signature == signature:
+                continue
+            if (doc.rules_mtime == signature[2]
+                    and doc.sha256 == _sha256(os.path.join(skill_dir, "SKILL.md"))):
+                doc.signature = signature
+                continue
+        store.docs[rel] = tokenize_skill(rel, skill_dir, signature)
+        stats.tokenized += 1
+    stats.documents = len(store.docs)
+    return stats
+
+
+def pack_index(docs: dict[str, DocTerms]) -> tuple[bytes, int]:
+    """Serialize documents into the packed index format. Returns (bytes, term count)."""
+    rels = sorted(docs)
+    postings: dict[str, list[tuple]] = {}
+    totals = [0] * len(FIELDS)
+    doc_rows = []
+    for doc_id, rel in enumerate(rels):
+        doc = docs[rel]
+        lengths = [doc.lengths.get(f, 0) for f in FIELDS]
+        for i, n in enumerate(lengths):
+            totals[i] += n
+        doc_rows.append([rel, doc.name, doc.description, doc.signature, lengths])
+        per_term: dict[str, list[int]] = {}
+        for i, f in enumerate(FIELDS):
+            for term, count in doc.tf.get(f, {}).items():
+                per_term.setdefault(term, [0] * len(FIELDS))[i] = min(count, 0xFFFF)
+        for term, counts in per_term.items():
+            postings.setdefault(term, []).append((doc_id, *counts))
+
+    terms = sorted(postings)
+    term_blob = bytearray()
+    term_offsets = [0]
+    posting_offsets = [0]
+    posting_blob = bytearray()
+    for term in terms:
+        term_blob += term.encode("utf-8")
+        term_offsets.append(len(term_blob))
+        for row in postings[term]:
+            posting_blob += _POSTING.pack(*row)
+        posting_offsets.append(posting_offsets[-1] + len(postings[term]))
+
+    n_docs = len(rels)
+    header = json.dumps({
+        "version": SEARCH_VERSION,
+        "fields": list(FIELDS),
+        "avg_lengths": [t / n_docs if n_docs else 0.0 for t in totals],
+        "docs": doc_rows,
+        "n_terms": len(terms),
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % 4)
+
+    out = bytearray(MAGIC)
+    out += _U32.pack(len(header))
+    out += header
+    out += struct.pack(f"<{len(terms) + 1}I", *term_offsets)
+    out += struct.pack(f"<{len(terms) + 1}I", *posting_offsets)
+    out += term_blob
+    out += posting_blob
+    return bytes(out), len(terms)
+
+
+def build_search_index(skills_root: str = SKILLS_ROOT, full: bool = False,
+                cache_dir: str | None = None) -> BuildStats:
+    """Refresh the document store and rewrite the packed index if anything changed."""
+    cache_dir = cache_dir or _cache_dir()
+    index_path = search_index_path(cache_dir)
+    store = DocStore(cache_dir)
+    before = {rel: list(doc.signature) for rel, doc in store.docs.items()}
+    stats = update_docs(store, skills_root, full)
+    after = {rel: doc.signature for rel, doc in store.docs.items()}
+    if full or before != after or not os.path.exists(index_path):
+        data, stats.terms = pack_index(store.docs)
+        atomic_write(index_path, data)
+        store.save()
+        stats.written = True
+    return stats
+
+
+@dataclass
+class Hit:
+    path: str
+    name: str
+    description: str
+    score: float
+
+
+class SearchIndex:
+    """Read-only, memory-mapped view of the packed index."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise
+        mm = self._map
+        if mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"not a skills search index: {path}")
+        (header_len,) = _U32.unpack_from(mm, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(mm[start:start + header_len])
+        if header.get("version") != SEARCH_VERSION or header.get("fields") != list(FIELDS):
+            self.close()
+            raise ValueError(f"search index version mismatch: {path}")
+        self.docs = header["docs"]
+        self.avg_lengths = header["avg_lengths"]
+        self.n_terms = header["n_terms"]
+        view = memoryview(mm)
+        pos = start + header_len
+        width = (self.n_terms + 1) * 4
+        self._term_offsets = view[pos:pos + width].cast("I")
+        pos += width
+        self._posting_offsets = view[pos:pos + width].cast("I")
+        pos += width
+        self._terms_start = pos
+        self._postings_start = pos + self._term_offsets[self.n_terms]
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for attr in ("_term_offsets", "_posting_offsets"):
+            view = self.__dict__.pop(attr, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+
+    def is_current(self, skills_root: str = SKILLS_ROOT) -> bool:
+        """True if every indexed skill's stat signature still matches the tree."""
+        indexed = {row[0]: row[3] for row in self.docs}
+        dirs = discover_skill_dirs(skills_root)
+        if len(dirs) != len(indexed):
+            return False
+        for skill_dir in dirs:
+            rel = os.path.relpath(skill_dir, skills_root).replace("\\", "/")
+            try:
+                if indexed.get(rel) != _stat_signature(skill_dir):
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _term(self, i: int) -> bytes:
+        offsets = self._term_offsets
+        return self._map[self._terms_start + offsets[i]:self._terms_start + offsets[i + 1]]
+
+    def postings(self, term: str):
+        """Iterate (doc id, per-field frequencies) for ``term``."""
+        key = term.encode("utf-8")
+        lo = bisect.bisect_left(range(self.n_terms), key, key=self._term)
+        if lo == self.n_terms or self._term(lo) != key:
+            return
+        first, last = self._posting_offsets[lo], self._posting_offsets[lo + 1]
+        start = self._postings_start + first * _POSTING.size
+        end = self._postings_start + last * _POSTING.size
+        for row in _POSTING.iter_unpack(self._map[start:end]):
+            yield row[0], row[1:]
+
+    def search(self, query: str, limit: int = 10) -> list[Hit]:
+        """BM25F ranking: field-weighted, length-normalized tf, saturated once."""
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        norms = [(FIELD_WEIGHTS[f], self.avg_lengths[i] or 1.0) for i, f in enumerate(FIELDS)]
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            rows = list(self.postings(term))
+            if not rows:
+                continue
+            idf = math.log(1 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            for doc_id, freqs in rows:
+                lengths = self.docs[doc_id][4]
+                tf = 0.0
+                for i, count in enumerate(freqs):
+                    if count:
+                        weight, avg = norms[i]
+                        tf += weight * count / (1 - B + B * lengths[i] / avg)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (K1 + 1) / (tf + K1)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [Hit(self.docs[i][0], self.docs[i][1], self.docs[i][2], score) for i, score in best]
+
+
+def search_index_path(cache_dir: str | None = None) -> str:
+    return os.path.join(cache_dir or _cache_dir(), INDEX_FILENAME)
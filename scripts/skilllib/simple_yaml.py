@@ -0,0 +1,252 @@
+"""Restricted YAML parser for the frontmatter shapes this repository uses.
+
+SKILL.md frontmatter is almost always a small block mapping: plain or quoted
+one-line scalars, ``|``/``>`` block scalars, a nested ``metadata`` mapping and
+a ``references`` list of mappings. ``parse_simple_yaml`` handles exactly that
+subset and returns None for anything else (flow collections, anchors, tags,
+comments, escapes, multi-line plain or quoted scalars, non-string scalars such
+as numbers, booleans and dates), so the caller can fall back to a full loader.
+
+Whenever it does return a value it must equal ``yaml.safe_load`` on the same
+text; scripts/verify-frontmatter-loader.py checks this on every SKILL.md.
+"""
+
+from __future__ import annotations
+
+import re
+
+import yaml
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+
+_KEY_RE = re.compile(r"([A-Za-z0-9_][A-Za-z0-9_.-]*):(?: +(.*))?$")
+_BLOCK_RE = re.compile(r"([|>])([+-]?)$")
+# First characters that make a plain scalar something other than a string
+# (indicators, quotes, flow collections, anchors, tags, comments, directives).
+_PLAIN_START = frozenset("-?:,[]{}#&*!|>'\"%@`")
+# Characters safe_load rejects or treats specially; bail out on any of them.
+# NEL (U+0085), LS (U+2028) and PS (U+2029) are line breaks to YAML.
+_UNSUPPORTED_RE = re.compile(
+    "[^\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff]")
+_STR_TAG = "tag:yaml.org,2002:str"
+_resolver = Resolver()
+
+
+class _Unsupported(Exception):
+    """The document uses YAML outside the supported subset."""
+
+
+def parse_simple_yaml(text: str):
+    """Parse ``text`` if it is a block mapping in the supported subset.
+
+    Returns the mapping, or None when the full loader must be used instead.
+    """
+    if _UNSUPPORTED_RE.search(text):
+        return None
+    lines = text.split("\n")
+    # Every line ends in a break except, possibly, the last one.
+    final_break = lines[-1] == ""
+    if final_break:
+        lines.pop()
+    try:
+        parser = _Parser(lines, final_break)
+        parser.skip_blank()
+        if parser.pos == len(lines) or parser.indent() != 0:
+            return None
+        data = parser.mapping(0)
+        parser.skip_blank()
+        if parser.pos != len(lines):
+            return None
+        return data
+    except _Unsupported:
+        return None
+
+
+def _plain(value: str) -> str:
+    """A one-line plain scalar that safe_load would construct as this string."""
+    value = value.rstrip(" ")
+    if (not value or value[0] in _PLAIN_START or ": " in value or " #" in value
+            or value.endswith(":")):
+        raise _Unsupported
+    if _resolver.resolve(ScalarNode, value, (True, False)) != _STR_TAG:
+        raise _Unsupported
+    return value
+
+
+def _scalar(value: str) -> str:
+    """A one-line plain, single- or double-quoted scalar."""
+    value = value.rstrip(" ")
+    if value[:1] == '"':
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != '"' or '"' in inner or "\\" in inner:
+            raise _Unsupported
+        return inner
+    if value[:1] == "'":
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != "'" or "'" in inner.replace("''", ""):
+            raise _Unsupported
+        return inner.replace("''", "'")
+    return _plain(value)
+
+
+class _Parser:
+    def __init__(self, lines: list[str], final_break: bool):
+        self.lines = lines
+        self.final_break = final_break
+        self.pos = 0
+        # A "- key: value" item is re-read as "key: value" at a deeper indent.
+        self.virtual: tuple[int, str] | None = None
+
+    def skip_blank(self) -> None:
+        if self.virtual is not None:
+            return
+        while self.pos < len(self.lines) and not self.lines[self.pos].strip(" "):
+            self.pos += 1
+
+    def indent(self) -> int:
+        if self.virtual is not None:
+            return self.virtual[0]
+        line = self.lines[self.pos]
+        return len(line) - len(line.lstrip(" "))
+
+    def content(self) -> str:
+        if self.virtual is not None:
+            return self.virtual[1]
+        return self.lines[self.pos].lstrip(" ")
+
+    def advance(self) -> None:
+        if self.virtual is not None:
+            self.virtual = None
+        else:
+            self.pos += 1
+
+    def at_end(self) -> bool:
+        self.skip_blank()
+        return self.virtual is None and self.pos >= len(self.lines)
+
+    def mapping(self, indent: int) -> dict:
+        data = {}
+        while not self.at_end():
+            current = self.indent()
+            if current < indent:
+                break
+            if current > indent:
+                raise _Unsupported
+            match = _KEY_RE.match(self.content())
+            if match is None:
+                break
+            key = _plain(match.group(1))
+            value = match.group(2)
+            self.advance()
+            if value is None or not value.strip(" "):
+                data[key] = self.nested(indent)
+            elif _BLOCK_RE.match(value.rstrip(" ")):
+                data[key] = self.block_scalar(indent, value.rstrip(" "))
+            else:
+                data[key] = _scalar(value)
+                self.no_continuation(indent)
+        return data
+
+    def no_continuation(self, indent: int) -> None:
+        """A deeper line after a one-line scalar would continue it; bail."""
+        if not self.at_end() and self.indent() > indent:
+            raise _Unsupported
+
+    def nested(self, indent: int):
+        """Value of ``key:`` with nothing after the colon."""
+        if self.at_end():
+            return None
+        current = self.indent()
+        if current > indent:
+            if self.content().startswith("- ") or self.content() == "-":
+                return self.sequence(current)
+            return self.mapping(current)
+        if current == indent and self.content().startswith("- "):
+            # "key:" followed by a sequence at the same indent is valid YAML.
+            return self.sequence(current)
+        return None
+
+    def sequence(self, indent: int) -> list:
+        items = []
+        while not self.at_end():
+            if self.indent() != indent or not self.content().startswith("- "):
+                if self.indent() > indent:
+                    raise _Unsupported
+                break
+            item = self.content()[2:]
+            stripped = item.lstrip(" ")
+            item_indent = indent + 2 + (len(item) - len(stripped))
+            self.advance()
+            if _KEY_RE.match(stripped):
+                self.virtual = (item_indent, stripped)
+                items.append(self.mapping(item_indent))
+            elif stripped.startswith("- ") or _BLOCK_RE.match(stripped.rstrip(" ")):
+                raise _Unsupported
+            else:
+                items.append(_scalar(stripped))
+                self.no_continuation(indent)
+        return items
+
+    def block_scalar(self, indent: int, header: str) -> str:
+        style, chomp = _BLOCK_RE.match(header).groups()
+        if self.virtual is not None:
+            raise _Unsupported
+        lines = self.lines
+        # The content indent is set by the first non-blank line.
+        start = self.pos
+        if start < len(lines) and not lines[start].strip(" "):
+            raise _Unsupported  # leading blank lines: leave to the full loader
+        if start >= len(lines):
+            raise _Unsupported
+        content_indent = len(lines[start]) - len(lines[start].lstrip(" "))
+        if content_indent <= indent:
+            raise _Unsupported
+        body = []
+        end = start
+        while end < len(lines):
+            line = lines[end]
+            if not line.strip(" "):
+                if len(line) > content_indent:
+                    raise _Unsupported
+                body.append("")
+            elif len(line) - len(line.lstrip(" ")) < content_indent:
+                break
+            else:
+                body.append(line[content_indent:])
+            end += 1
+        trailing = 0
+        while body and body[-1] == "":
+            body.pop()
+            trailing += 1
+        self.pos = end
+        # The last line of the document has no break to keep or clip.
+        unbroken = end == len(lines) and not self.final_break
+        if unbroken and trailing:
+            raise _Unsupported
+
+        if style == "|":
+            text = "\n".join(body)
+        else:
+            if any(line[:1] == " " for line in body):
+                raise _Unsupported  # more-indented lines are not folded
+            text = ""
+            blanks = 0
+            for i, line in enumerate(body):
+                if line == "":
+                    blanks += 1
+                    continue
+                if i:
+                    text += "\n" * blanks if blanks else " "
+                text += line
+                blanks = 0
+        if chomp == "-" or unbroken:
+            return text
+        if chomp == "+":
+            return text + "\n" + "\n" * trailing
+        return text + "\n"
+
+
+def safe_load_reference(text: str):
+    """The pure-Python ``yaml.safe_load``, the reference for the fast path."""
+    return yaml.load(text, Loader=yaml.SafeLoader)
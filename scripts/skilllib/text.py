@@ -0,0 +1,51 @@
+"""Markdown chunking shared by duplicate analysis and token accounting.
+
+A file is cut at the frontmatter fence and at every level-1/2 heading outside
+fenced code. Chunks are exact byte slices, so a file is the concatenation of
+its chunks, and AGENTS.md (a copy of the SKILL.md body) splits at the same
+boundaries as its SKILL.md.
+"""
+
+from __future__ import annotations
+
+import re
+
+
+_FRONTMATTER_RE = re.compile(rb"\A---[ \t]*\r?\n.*?\r?\n---[ \t]*(?:\r?\n|\Z)", re.DOTALL)
+_SECTION_RE = re.compile(rb"#{1,2}[ \t]")
+
+
+def split_chunks(data: bytes, markdown: bool = True) -> list[bytes]:
+    """Cut a file into chunks that concatenate back to ``data``."""
+    if not markdown:
+        return [data] if data else []
+    chunks = []
+    start = 0
+    match = _FRONTMATTER_RE.match(data)
+    if match:
+        chunks.append(data[:match.end()])
+        start = match.end()
+    pos = start
+    in_fence = False
+    for line in data[start:].splitlines(keepends=True):
+        stripped = line.lstrip()
+        if stripped.startswith(b"```"):
+            in_fence = not in_fence
+        elif not in_fence and _SECTION_RE.match(line) and pos > start:
+            chunks.append(data[start:pos])
+            start = pos
+        pos += len(line)
+    if start < len(data):
+        chunks.append(data[start:])
+    return chunks
+
+
+def chunk_title(chunk: bytes) -> str:
+    """A short label for reports: the heading, or the chunk's first line."""
+    text = chunk.decode("utf-8", "replace")
+    if text.startswith("---"):
+        return "(frontmatter)"
+    for line in text.splitlines():
+        if line.strip():
+            return line.strip()[:80]
+    return "(blank)"
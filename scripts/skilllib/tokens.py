@@ -0,0 +1,142 @@
+"""Local token estimates and per-section token accounting for skill bodies.
+
+``count_tokens`` needs no model files or network: it splits text with the
+same pre-tokenization pattern as OpenAI's cl100k encoding (words with their
+leading space, digit runs of up to three, punctuation runs, whitespace) and
+charges each piece by length, since BPE keeps common words whole and cuts
+long identifiers and punctuation runs into a few tokens. Expect an estimate
+good enough to compare skills and measure savings, not an exact bill.
+
+``TokenLedger`` totals tokens per section (split by skilllib/text.py),
+per skill and per top-level category, and by content kind (prose, code,
+tables), which is what AGENTS.md costs an agent that loads the skill.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .text import chunk_title, split_chunks
+
+
+_PIECE_RE = re.compile(
+    r"'(?:[sdmt]|ll|ve|re)"
+    r"|[^\r\n\w]?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?[^\s\w]+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+    r"|_+",
+    re.IGNORECASE,
+)
+_FENCE = "```"
+
+
+def count_tokens(text: str) -> int:
+    """Estimated token count of ``text``."""
+    tokens = 0
+    for piece in _PIECE_RE.findall(text):
+        size = len(piece.strip())
+        if size <= 1 or piece[-1].isspace():
+            tokens += 1
+        elif piece[-1].isalpha():
+            # Common words are one token; longer runs split every ~6 letters.
+            tokens += 1 if size <= 10 else 1 + (size - 5) // 6
+        else:
+            tokens += (size + 2) // 3
+    return tokens
+
+
+def kind_tokens(text: str) -> Counter:
+    """Tokens of ``text`` by kind: fenced code, table rows, and prose."""
+    kinds: Counter = Counter()
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        stripped = line.lstrip()
+        if stripped.startswith(_FENCE):
+            in_fence = not in_fence
+            kind = "code"
+        elif in_fence:
+            kind = "code"
+        elif stripped.startswith("|"):
+            kind = "tables"
+        else:
+            kind = "prose"
+        kinds[kind] += count_tokens(line)
+    return kinds
+
+
+def category_of(rel: str) -> str:
+    return rel.split("/", 1)[0] if rel not in ("", ".") else "."
+
+
+@dataclass
+class SkillTokens:
+    path: str
+    tokens: int = 0
+    kinds: Counter = field(default_factory=Counter)
+    sections: list[tuple[str, int]] = field(default_factory=list)   # (heading, tokens)
+
+
+class TokenLedger:
+    """Token totals for skill bodies, by section, skill and category."""
+
+    def __init__(self):
+        self.skills: dict[str, SkillTokens] = {}
+
+    def add(self, rel: str, body: str) -> SkillTokens:
+        entry = SkillTokens(rel)
+        for chunk in split_chunks(body.lstrip("\n").encode("utf-8")):
+            text = chunk.decode("utf-8")
+            kinds = kind_tokens(text)
+            tokens = sum(kinds.values())
+            entry.kinds.update(kinds)
+            entry.tokens += tokens
+            entry.sections.append((chunk_title(chunk), tokens))
+        self.skills[rel] = entry
+        return entry
+
+    @property
+    def total(self) -> int:
+        return sum(entry.tokens for entry in self.skills.values())
+
+    def kinds(self) -> Counter:
+        totals: Counter = Counter()
+        for entry in self.skills.values():
+            totals.update(entry.kinds)
+        return totals
+
+    def categories(self) -> list[tuple[str, int, int]]:
+        """(category, skills, tokens), largest first."""
+        tokens: Counter = Counter()
+        skills: Counter = Counter()
+        for rel, entry in self.skills.items():
+            category = category_of(rel)
+            tokens[category] += entry.tokens
+            skills[category] += 1
+        return [(category, skills[category], total) for category, total in tokens.most_common()]
+
+    def largest_skills(self, n: int) -> list[SkillTokens]:
+        return sorted(self.skills.values(), key=lambda e: (-e.tokens, e.path))[:n]
+
+    def largest_sections(self, n: int) -> list[tuple[str, str, int]]:
+        """(skill, heading, tokens) of the ``n`` costliest sections."""
+        sections = [(rel, title, tokens) for rel, entry in self.skills.items()
+                    for title, tokens in entry.sections]
+        sections.sort(key=lambda s: (-s[2], s[0], s[1]))
+        return sections[:n]
+
+    def to_json(self) -> dict:
+        return {
+            "total": self.total,
+            "kinds": dict(self.kinds()),
+            "categories": [{"category": c, "skills": s, "tokens": t}
+                           for c, s, t in self.categories()],
+            "skills": [{"path": e.path, "tokens": e.tokens, "kinds": dict(e.kinds),
+                        "sections": [{"title": title, "tokens": tokens}
+                                     for title, tokens in e.sections]}
+                       for e in sorted(self.skills.values(), key=lambda e: e.path)],
+        }
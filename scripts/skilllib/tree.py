@@ -0,0 +1,120 @@
+"""In-memory model of the skills hierarchy, built once per run.
+
+Each ``SkillNode`` parses its SKILL.md on first use and keeps the result, so a
+generator that needs a skill's frontmatter both for its own files and for its
+parent's sub-skill table reads it once. Parent/children follow the nearest
+ancestor skill, as in skills-index.json; ``sub_skills`` narrows that to the
+immediate child directories a README lists.
+
+``SkillTree.parse_counts`` reports how often each skill's SKILL.md went through
+the process-wide parse cache (by the tree or anything else), and
+``assert_parsed_once`` checks that every skill was parsed exactly once.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+
+from .index import SKILLS_ROOT, nearest_parent
+from .parsing import ParsedSkill, get_cache, load_skill
+from .profile import span
+
+
+class SkillNode:
+    """One skill directory in a ``SkillTree``."""
+
+    def __init__(self, tree: "SkillTree", rel: str, path: str):
+        self.tree = tree
+        self.rel = rel
+        self.path = path
+        self.parent: SkillNode | None = None
+        self.children: list[SkillNode] = []
+        self._skill: ParsedSkill | None = None
+
+    def __repr__(self) -> str:
+        return f"SkillNode({self.rel!r})"
+
+    @property
+    def dirname(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def skill(self) -> ParsedSkill:
+        """The parsed SKILL.md, loaded on first access."""
+        if self._skill is None:
+            with span("parse"):
+                self._skill = load_skill(os.path.join(self.path, "SKILL.md"))
+        return self._skill
+
+    @property
+    def frontmatter(self) -> dict | None:
+        """Frontmatter as the generators expect it (see FrontmatterView)."""
+        return self.skill.frontmatter_dict()
+
+    @property
+    def sub_skills(self) -> list["SkillNode"]:
+        """Children that sit directly in this skill's directory."""
+        return [c for c in self.children if os.path.dirname(c.path) == self.path]
+
+
+class SkillTree:
+    """Every skill under ``root``, linked parent to children."""
+
+    def __init__(self, skill_dirs, root: str = SKILLS_ROOT):
+        self.root = os.path.abspath(root)
+        self.nodes: dict[str, SkillNode] = {}
+        for skill_dir in skill_dirs:
+            path = os.path.abspath(skill_dir)
+            rel = os.path.relpath(path, self.root).replace("\\", "/")
+            self.nodes[rel] = SkillNode(self, rel, path)
+        self.roots: list[SkillNode] = []
+        for rel in sorted(self.nodes):
+            node = self.nodes[rel]
+            parent = nearest_parent(rel, self.nodes)
+            if parent is None:
+                self.roots.append(node)
+            else:
+                node.parent = self.nodes[parent]
+                node.parent.children.append(node)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def node(self, skill_dir: str) -> SkillNode:
+        rel = os.path.relpath(os.path.abspath(skill_dir), self.root).replace("\\", "/")
+        return self.nodes[rel]
+
+    def walk_top_down(self):
+        """Yield every node before its children (pre-order)."""
+        stack = list(reversed(self.roots))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def walk_bottom_up(self):
+        """Yield every node after all of its children (post-order)."""
+        stack = [(node, False) for node in reversed(self.roots)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children))
+
+    @property
+    def parse_counts(self) -> Counter[str]:
+        """{skill rel path: SKILL.md parse-cache lookups so far in this process}."""
+        lookups = get_cache().lookups
+        return Counter({rel: lookups[os.path.join(node.path, "SKILL.md")]
+                        for rel, node in self.nodes.items()})
+
+    def assert_parsed_once(self) -> None:
+        """Raise AssertionError unless every skill's SKILL.md was parsed exactly once."""
+        counts = self.parse_counts
+        wrong = {rel: n for rel, n in counts.items() if n != 1}
+        if wrong:
+            sample = ", ".join(f"{rel} ({n}x)" for rel, n in sorted(wrong.items())[:5])
+            raise AssertionError(f"{len(wrong)} SKILL.md files not parsed exactly once: {sample}")
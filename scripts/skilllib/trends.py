@@ -0,0 +1,192 @@
+"""Append-only store of audit metrics per commit (SQLite).
+
+Metrics are content-addressed: ``metrics`` holds one row per distinct
+SKILL.md blob (keyed by its git object id), and ``snapshots`` maps each
+recorded commit's skill paths to those blobs. Recording a commit reads the
+SKILL.md blob ids from ``git ls-tree`` and only measures blobs the store has
+never seen, so consecutive commits cost little more than the files that
+changed. Nothing is ever updated or deleted.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+
+from .audit import COLUMNS, measure_body
+from .changes import GitError, git_output, resolve_commit
+from .frontmatter import decode_text
+from .parsing import DEFAULT_CACHE_DIR, FRONTMATTER_RE, REPO_ROOT
+
+
+DB_FILENAME = "audit-trends.sqlite"
+SCHEMA_VERSION = 1
+
+# Metric columns stored per blob (everything except the path).
+METRIC_COLUMNS = [name for name, _ in COLUMNS if name != "path"]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS commits (
+    commit_hash TEXT PRIMARY KEY,
+    recorded_at INTEGER NOT NULL,
+    skills INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    blob TEXT PRIMARY KEY,
+    has_frontmatter INTEGER NOT NULL,
+    {", ".join(f"{name} {'TEXT' if name == 'generic_found' else 'INTEGER'}" for name in METRIC_COLUMNS)}
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshots (
+    commit_hash TEXT NOT NULL,
+    path TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    PRIMARY KEY (commit_hash, path)
+) WITHOUT ROWID;
+"""
+
+
+def default_db_path() -> str:
+    cache_dir = os.environ.get("SKILLS_CACHE_DIR") or DEFAULT_CACHE_DIR
+    return os.path.join(cache_dir, DB_FILENAME)
+
+
+def skill_blobs(commit: str, cwd: str = REPO_ROOT) -> dict[str, str]:
+    """{skill path relative to skills/: SKILL.md blob id} at ``commit``."""
+    blobs = {}
+    for record in git_output(["ls-tree", "-r", "-z", commit, "--", "skills"], cwd):
+        meta, _, path = record.partition("\t")
+        _, kind, blob = meta.split()
+        if kind != "blob" or not (path == "skills/SKILL.md" or path.endswith("/SKILL.md")):
+            continue
+        rel = os.path.dirname(path)[len("skills"):].lstrip("/") or "."
+        blobs[rel] = blob
+    return blobs
+
+
+def read_blobs(blob_ids, cwd: str = REPO_ROOT):
+    """Yield (blob id, bytes) for each id using one ``git cat-file --batch``."""
+    blob_ids = list(blob_ids)
+    if not blob_ids:
+        return
+    proc = subprocess.Popen(["git", "cat-file", "--batch"], cwd=cwd,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def feed():
+        # Written from a thread so a full stdout pipe cannot deadlock us.
+        try:
+            proc.stdin.write("".join(f"{b}\n" for b in blob_ids).encode("ascii"))
+        finally:
+            proc.stdin.close()
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        for blob in blob_ids:
+            header = proc.stdout.readline().split()
+            if len(header) != 3:
+                raise GitError(f"git cat-file: unexpected header for {blob}: {header!r}")
+            data = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)  # trailing newline
+            yield blob, data
+    finally:
+        proc.stdout.close()
+        proc.wait()
+        writer.join()
+
+
+def measure_blob(data: bytes) -> dict | None:
+    """Metrics for SKILL.md contents, or None without frontmatter (as the audit skips those)."""
+    match = FRONTMATTER_RE.match(decode_text(data))
+    if not match:
+        return None
+    return measure_body(match.group(2))
+
+
+class TrendStore:
+    def __init__(self, path: str | None = None):
+        self.path = path or default_db_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise RuntimeError(f"{self.path}: unsupported trend store version {version}")
+        self.db.executescript(_SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "TrendStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def has_commit(self, commit: str) -> bool:
+        row = self.db.execute("SELECT 1 FROM commits WHERE commit_hash = ?", (commit,)).fetchone()
+        return row is not None
+
+    def record(self, ref: str = "HEAD", cwd: str = REPO_ROOT) -> tuple[str, int, int]:
+        """Record metrics for every skill at ``ref``.
+
+        Returns (commit hash, skills recorded, blobs newly measured). Recording
+        a commit twice is a no-op.
+        """
+        commit = resolve_commit(ref, cwd)
+        if self.has_commit(commit):
+            count = self.db.execute(
+                "SELECT skills FROM commits WHERE commit_hash = ?", (commit,)).fetchone()[0]
+            return commit, count, 0
+
+        blobs = skill_blobs(commit, cwd)
+        known = set()
+        unique = sorted(set(blobs.values()))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            known.update(row[0] for row in self.db.execute(
+                f"SELECT blob FROM metrics WHERE blob IN ({marks})", chunk))
+
+        rows = []
+        for blob, data in read_blobs([b for b in unique if b not in known], cwd):
+            metrics = measure_blob(data)
+            if metrics is None:
+                rows.append((blob, 0) + (None,) * len(METRIC_COLUMNS))
+                continue
+            metrics["generic_found"] = ";".join(metrics["generic_found"])
+            rows.append((blob, 1) + tuple(int(metrics[c]) if c != "generic_found" else metrics[c]
+                                          for c in METRIC_COLUMNS))
+
+        with self.db:
+            marks = ",".join("?" * (2 + len(METRIC_COLUMNS)))
+            self.db.executemany(
+                f"INSERT INTO metrics (blob, has_frontmatter, {', '.join(METRIC_COLUMNS)}) "
+                f"VALUES ({marks})", rows)
+            self.db.executemany(
+                "INSERT INTO snapshots (commit_hash, path, blob) VALUES (?, ?, ?)",
+                [(commit, path, blob) for path, blob in sorted(blobs.items())])
+            self.db.execute(
+                "INSERT INTO commits (commit_hash, recorded_at, skills) VALUES (?, ?, ?)",
+                (commit, int(time.time()), len(blobs)))
+        return commit, len(blobs), len(rows)
+
+    def scores(self, commit: str) -> dict[str, int]:
+        """{path: score} for audited skills (with frontmatter) at ``commit``."""
+        return dict(self.db.execute(
+            "SELECT s.path, m.score FROM snapshots s JOIN metrics m ON m.blob = s.blob "
+            "WHERE s.commit_hash = ? AND m.has_frontmatter = 1", (commit,)))
+
+    def deltas(self, old: str, new: str) -> list[tuple[str, int | None, int | None]]:
+        """(path, old score, new score) for every skill whose score differs,
+        including skills added (old None) or removed (new None)."""
+        before = self.scores(old)
+        after = self.scores(new)
+        changed = []
+        for path in sorted(set(before) | set(after)):
+            a, b = before.get(path), after.get(path)
+            if a != b:
+                changed.append((path, a, b))
+        return changed
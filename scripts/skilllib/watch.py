@@ -0,0 +1,200 @@
+"""Detect SKILL.md edits under the skill roots, for long-running watch mode.
+
+``open_watcher`` returns an inotify watcher on Linux (through libc via ctypes,
+so no extra dependency) and a polling watcher elsewhere, or when inotify is
+unavailable or out of watches. Both report changed SKILL.md paths relative to
+the repository root; generated files (README.md, rules/, ...) are ignored, so
+regenerating them never triggers another round.
+
+``next_batch`` blocks for the first change, then keeps collecting until the
+tree has been quiet for the debounce interval, so an editor's save (write,
+rename, chmod) or a ``git checkout`` arrives as one batch.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+
+from .parsing import REPO_ROOT
+
+
+SKILL_FILE = "SKILL.md"
+
+# inotify(7) event bits.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct("iIII")
+
+
+def _rel(path: str, base: str) -> str:
+    return os.path.relpath(path, base).replace("\\", "/")
+
+
+def _skill_files(top: str):
+    """Every SKILL.md at or below directory ``top``."""
+    for dirpath, _, filenames in os.walk(top):
+        if SKILL_FILE in filenames:
+            yield os.path.join(dirpath, SKILL_FILE)
+
+
+class PollingWatcher:
+    """Rescan the roots every ``interval`` seconds and diff SKILL.md stats."""
+
+    kind = "polling"
+
+    def __init__(self, roots, base: str = REPO_ROOT, interval: float = 0.5):
+        self.base = base
+        self.roots = [os.path.join(base, root) for root in roots]
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for path in _skill_files(root):
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                snapshot[_rel(path, self.base)] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Sleep ``timeout`` (or one interval) and return what changed meanwhile."""
+        time.sleep(self.interval if timeout is None else timeout)
+        current = self._scan()
+        previous, self.snapshot = self.snapshot, current
+        return {path for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)}
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """One inotify watch per directory under the roots; new ones are added
+    as directories appear."""
+
+    kind = "inotify"
+
+    def __init__(self, roots, base: str = REPO_ROOT):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.base = base
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, str] = {}
+        try:
+            for root in roots:
+                self.add_tree(os.path.join(base, root))
+        except OSError:
+            self.close()
+            raise
+
+    def add_tree(self, top: str) -> None:
+        """Watch ``top`` and every directory below it."""
+        for dirpath, _, _ in os.walk(top):
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # removed while walking
+                raise OSError(err, f"inotify_add_watch {dirpath}: {os.strerror(err)}")
+            self.dirs[wd] = dirpath
+
+    def wait(self, timeout: float | None) -> set[str]:
+        """Block up to ``timeout`` seconds (forever if None) for changes."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            changed |= self._decode(data)
+        return changed
+
+    def _decode(self, data: bytes) -> set[str]:
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: rescan every watched directory.
+                for directory in list(self.dirs.values()):
+                    changed.update(_rel(p, self.base) for p in _skill_files(directory))
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.dirs[wd]
+                continue
+            if not name:
+                continue  # event on the watched directory itself
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_tree(path)
+                    changed.update(_rel(p, self.base) for p in _skill_files(path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    # Its parent skill's README lists it; report its SKILL.md.
+                    changed.add(_rel(os.path.join(path, SKILL_FILE), self.base))
+            elif name == SKILL_FILE:
+                changed.add(_rel(path, self.base))
+        return changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(roots, base: str = REPO_ROOT, poll: bool = False, interval: float = 0.5):
+    """An inotify watcher when possible, else a polling one."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots, base)
+        except (OSError, AttributeError) as exc:
+            print(f"inotify unavailable ({exc}); polling every {interval}s", file=sys.stderr)
+    return PollingWatcher(roots, base, interval)
+
+
+def next_batch(watcher, debounce: float) -> set[str]:
+    """Wait for changes, then return them once ``debounce`` seconds pass quietly."""
+    changed: set[str] = set()
+    while not changed:
+        changed = watcher.wait(None)
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
@@ -8,13 +8,28 @@ can validate the actual marketplace contract.
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
 import re
 import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
-import yaml
+from skilllib import (
+    FENCE_MISSING,
+    FENCE_UNTERMINATED,
+    FrontmatterView,
+    SkillHeader,
+    get_cache,
+    load_frontmatter,
+    profile,
+    save_cache,
+)
+from skilllib.changes import GitError, affected_skill_dirs, git_changed_files
+from skilllib.index import discover_skill_dirs as indexed_skill_dirs
 
 
 ALLOWED_FIELDS = {
@@ -28,23 +43,26 @@ ALLOWED_FIELDS = {
 }
 NAME_PATTERN = re.compile(r"^[a-z0-9](?:[a-z0-9-]{0,62}[a-z0-9])?$")
 ROOTS = (Path("skills"), Path(".agents") / "skills")
+# Changes here can alter the verdict for any skill, so they trigger a full run.
+VALIDATOR_PATHS = ("scripts/validate-skills.py", "scripts/skilllib/")
 
 
-def parse_skill(path: Path) -> tuple[dict[str, Any], str]:
-    content = path.read_text(encoding="utf-8")
-    if not content.startswith("---\n"):
+def parse_skill(path: Path) -> tuple[dict[str, Any], FrontmatterView]:
+    # Only the frontmatter is parsed; the body is checked lazily via mmap.
+    with profile.span("parse"):
+        parsed = load_frontmatter(str(path))
+    if parsed.fence == FENCE_MISSING:
         raise ValueError("missing YAML frontmatter")
+    if parsed.fence == FENCE_UNTERMINATED:
+        raise ValueError("frontmatter must be delimited by --- fences")
+    if parsed.yaml_error is not None:
+        raise ValueError(parsed.yaml_error)
 
-    try:
-        _, frontmatter, body = content.split("---", 2)
-    except ValueError as exc:
-        raise ValueError("frontmatter must be delimited by --- fences") from exc
-
-    data = yaml.safe_load(frontmatter) or {}
+    data = parsed.frontmatter or {}
     if not isinstance(data, dict):
         raise ValueError("frontmatter must be a mapping")
 
-    return data, body
+    return data, parsed
 
 
 def validate_metadata(metadata: Any) -> list[str]:
@@ -98,7 +116,7 @@ def validate_skill_dir(skill_dir: Path) -> list[str]:
     skill_path = skill_dir / "SKILL.md"
 
     try:
-        frontmatter, body = parse_skill(skill_path)
+        frontmatter, parsed = parse_skill(skill_path)
     except Exception as exc:
         return [str(exc)]
 
@@ -137,7 +155,7 @@ def validate_skill_dir(skill_dir: Path) -> list[str]:
     errors.extend(validate_references(frontmatter.get("references")))
     errors.extend(validate_allowed_tools(frontmatter.get("allowed-tools")))
 
-    if not body.strip():
+    if parsed.body_blank:
         errors.append("SKILL.md body must not be empty")
 
     return errors
@@ -148,35 +166,206 @@ def discover_skill_dirs() -> list[Path]:
     for root in ROOTS:
         if not root.exists():
             continue
+        if root == ROOTS[0]:
+            skill_dirs.extend(Path(path) for path in indexed_skill_dirs(str(root)))
+            continue
         for skill_file in root.rglob("SKILL.md"):
             skill_dirs.append(skill_file.parent)
     return sorted(skill_dirs)
 
 
-def main(argv: list[str]) -> int:
-    os.chdir(Path(__file__).resolve().parents[1])
-    targets = [Path(arg) for arg in argv] if argv else discover_skill_dirs()
-
-    passed = 0
-    failures: list[tuple[Path, list[str]]] = []
-    for target in targets:
-        errors = validate_skill_dir(target)
-        if errors:
-            failures.append((target, errors))
-        else:
-            passed += 1
+def changed_skill_dirs(ref: str) -> list[Path] | None:
+    """Skill dirs affected by changes since ``ref``, or None if everything is."""
+    changed = git_changed_files(ref)
+    if any(path.startswith(VALIDATOR_PATHS) for path in changed):
+        return None
+    return [Path(path) for path in affected_skill_dirs(changed, [root.as_posix() for root in ROOTS])]
+
 
-    for target, errors in failures:
-        print(f"Validation failed for {target}:")
-        for error in errors:
-            print(f"  - {error}")
+def check_target(target: Path) -> tuple[list[str], SkillHeader | None, dict]:
+    """Validate one skill dir; also return the streamed header for the parent's
+    cache and any profiling data recorded while checking it."""
+    with profile.get_profiler().capture() as captured, profile.skill(target.as_posix()):
+        with profile.span("check"):
+            errors = validate_skill_dir(target)
+    return errors, get_cache().header(str(target / "SKILL.md")), captured
 
-    print("")
-    print("=== Validation Summary ===")
-    print(f"Passed: {passed}")
-    print(f"Failed: {len(failures)}")
 
-    return 1 if failures else 0
+def check_batch(targets: list[Path]) -> list[tuple[list[str], SkillHeader | None, dict]]:
+    return [check_target(target) for target in targets]
+
+
+Results = list[tuple[Path, list[str]]]
+
+
+def count_failed(results: Results) -> int:
+    return sum(1 for _, errors in results if errors)
+
+
+class TextReporter:
+    """The original human-readable report: failures in path order, then a summary."""
+
+    def result(self, target: Path, errors: list[str]) -> None:
+        pass
+
+    def finish(self, results: Results, skipped: list[Path]) -> None:
+        for target, errors in results:
+            if errors:
+                print(f"Validation failed for {target}:")
+                for error in errors:
+                    print(f"  - {error}")
+        failed = count_failed(results)
+        passed = len(results) - failed
+        print("")
+        print("=== Validation Summary ===")
+        print(f"Passed: {passed}")
+        print(f"Failed: {failed}")
+        if skipped:
+            print(f"Skipped: {len(skipped)} (stopped by --fail-fast)")
+
+
+def json_record(target: Path, errors: list[str]) -> dict:
+    return {"path": target.as_posix(), "status": "failed" if errors else "passed",
+            "errors": errors}
+
+
+class JsonReporter:
+    """JSON Lines: one object per skill as it completes (so in completion order
+    under --jobs), then a final object with the summary and every result in
+    path order, which is the same for serial and parallel runs."""
+
+    def result(self, target: Path, errors: list[str]) -> None:
+        print(json.dumps(json_record(target, errors)), flush=True)
+
+    def finish(self, results: Results, skipped: list[Path]) -> None:
+        failed = count_failed(results)
+        summary = {"passed": len(results) - failed, "failed": failed, "skipped": len(skipped)}
+        print(json.dumps({"summary": summary,
+                          "results": [json_record(target, errors) for target, errors in results],
+                          "skipped": [target.as_posix() for target in skipped]}), flush=True)
+
+
+class JUnitReporter:
+    """JUnit XML, written once at the end because the suite carries the totals."""
+
+    def result(self, target: Path, errors: list[str]) -> None:
+        pass
+
+    def finish(self, results: Results, skipped: list[Path]) -> None:
+        cases = results + [(target, None) for target in skipped]
+        failed = count_failed(results)
+        suites = ET.Element("testsuites")
+        suite = ET.SubElement(suites, "testsuite", {
+            "name": "validate-skills",
+            "tests": str(len(cases)),
+            "failures": str(failed),
+            "errors": "0",
+            "skipped": str(len(skipped)),
+        })
+        for target, errors in cases:
+            case = ET.SubElement(suite, "testcase", {
+                "classname": target.parent.as_posix().replace("/", "."),
+                "name": target.as_posix(),
+            })
+            if errors is None:
+                ET.SubElement(case, "skipped", {"message": "stopped by --fail-fast"})
+            elif errors:
+                failure = ET.SubElement(case, "failure", {"message": errors[0]})
+                failure.text = "\n".join(errors)
+        ET.indent(suites)
+        sys.stdout.write(ET.tostring(suites, encoding="unicode", xml_declaration=True) + "\n")
+
+
+REPORTERS = {"text": TextReporter, "json": JsonReporter, "junit": JUnitReporter}
+
+
+def run_checks(targets: list[Path], jobs: int, fail_fast: bool):
+    """Yield (index, errors, header, profile data) per target as checks finish.
+
+    With jobs > 1, batches run in a process pool and each batch is yielded as
+    soon as it completes, so a slow skill does not hold back later results;
+    callers sort by index where they need path order. With ``fail_fast`` the
+    run stops at the first failure (under --jobs, after the batch holding it)
+    and pending work is cancelled.
+    """
+    if jobs <= 1 or len(targets) <= 1:
+        for index, target in enumerate(targets):
+            errors, header, captured = check_target(target)
+            yield index, errors, header, captured
+            if errors and fail_fast:
+                return
+        return
+
+    size = max(1, min(32, len(targets) // (jobs * 8)))
+    batches = [(start, targets[start:start + size]) for start in range(0, len(targets), size)]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=profile.init_worker,
+                             initargs=(profile.get_profiler().enabled,)) as pool:
+        futures = {pool.submit(check_batch, batch): start for start, batch in batches}
+        try:
+            for future in as_completed(futures):
+                start = futures[future]
+                batch = future.result()
+                for offset, (errors, header, captured) in enumerate(batch):
+                    yield start + offset, errors, header, captured
+                if fail_fast and any(errors for errors, _, _ in batch):
+                    return
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Validate skill frontmatter and directory contracts.")
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help="skill directories to validate (default: every skill)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="worker processes to use (0 = one per CPU, default: 1)")
+    parser.add_argument("--changed-since", metavar="REF",
+                        help="only validate skills affected by changes since a git ref")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="stop at the first skill that fails validation")
+    parser.add_argument("--format", choices=sorted(REPORTERS), default="text",
+                        help="output format (json streams one line per skill; default: text)")
+    profile.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profile.configure(args)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    os.chdir(Path(__file__).resolve().parents[1])
+    if args.changed_since:
+        try:
+            changed = changed_skill_dirs(args.changed_since)
+        except GitError as exc:
+            print(f"ERROR: --changed-since {args.changed_since}: {exc}", file=sys.stderr)
+            return 2
+        if changed is None:
+            print(f"Validator changed since {args.changed_since}; validating all skills",
+                  file=sys.stderr)
+            targets = discover_skill_dirs()
+        else:
+            print(f"Validating {len(changed)} skill(s) affected by changes since "
+                  f"{args.changed_since}", file=sys.stderr)
+            targets = sorted(set(changed) | set(args.paths))
+    else:
+        with profile.span("discovery"):
+            targets = args.paths or discover_skill_dirs()
+    reporter = REPORTERS[args.format]()
+
+    found: dict[int, list[str]] = {}
+    cache = get_cache()
+    profiler = profile.get_profiler()
+    for index, errors, header, captured in run_checks(targets, jobs, args.fail_fast):
+        profiler.merge(captured)
+        cache.absorb_header(str(targets[index] / "SKILL.md"), header)
+        reporter.result(targets[index], errors)
+        found[index] = errors
+    with profile.span("save"):
+        save_cache()
+
+    results = [(targets[index], found[index]) for index in sorted(found)]
+    skipped = [target for index, target in enumerate(targets) if index not in found]
+    reporter.finish(results, skipped)
+    profile.finish(args)
+    return 1 if count_failed(results) else 0
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ set -euo pipefail
 # Usage:
 #   bash scripts/validate.sh                # validate all skills
 #   bash scripts/validate.sh skills/dotnet/aspnet-core  # validate one skill
+#   bash scripts/validate.sh --jobs 0 --format junit    # parallel, JUnit XML
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 python "$SCRIPT_DIR/validate-skills.py" "$@"
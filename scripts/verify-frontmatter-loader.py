@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Differential test: the fast frontmatter loader must match yaml.safe_load.
+
+For every SKILL.md under skills/ and .agents/skills/, plus a set of tricky
+hand-written documents, compares against the pure-Python ``yaml.safe_load``:
+
+  - the restricted parser (skilllib/simple_yaml.py), whenever it accepts a
+    document, must produce an identical value (types included);
+  - libyaml's CSafeLoader, when available, must produce the same value;
+  - skilllib's ``load_yaml`` must return the same value or the same error.
+
+Also reports how many documents the fast path handled. Exits 1 on any
+mismatch.
+
+Usage:
+    python scripts/verify-frontmatter-loader.py [--verbose]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import yaml
+
+from skilllib.frontmatter import decode_text, load_yaml
+from skilllib.parsing import FRONTMATTER_RE, REPO_ROOT
+from skilllib.simple_yaml import parse_simple_yaml, safe_load_reference
+
+
+ROOTS = ("skills", os.path.join(".agents", "skills"))
+
+# Documents at the edges of the supported subset. Each must either be
+# declined by the fast path or parsed exactly as safe_load parses it.
+CASES = [
+    "name: demo\ndescription: plain text",
+    "name: yes\n",
+    "name: 'on'\nversion: 1.0\ncount: 3\nempty:\nnull_value: ~\n",
+    "date: 2024-01-01\nwhen: 12:30\n",
+    "title: 'it''s quoted'\nother: \"double # not a comment\"\n",
+    "title: \"escaped \\\" quote\"\n",
+    "url: https://example.com/a:b\nmixed: a: b\n",
+    "text: value # trailing comment\n",
+    "description: |\n  line one\n  line two\n\n  after blank\n",
+    "description: |-\n  stripped\n\n",
+    "description: |+\n  kept\n\n\nnext: x\n",
+    "description: >\n  folded one\n  folded two\n\n  new paragraph\n",
+    "description: >-\n  folded\n    more indented\n  back\n",
+    "description: |\n    deeper indent\n      nested\n    end\nname: x\n",
+    "description: |\n\n  leading blank\n",
+    "description: |2\n   explicit indent\n",
+    "metadata:\n  displayName: \"Thing\"\n  tags:\n    - a\n    - b\n  version: '1.0'\n",
+    "references:\n  - title: \"Docs\"\n    url: \"https://example.com\"\n  - title: Other\n    url: https://example.org\n",
+    "tags:\n- same-indent\n- items\nname: after\n",
+    "tags: [flow, list]\n",
+    "meta: {a: 1}\n",
+    "anchor: &a value\nalias: *a\n",
+    "tagged: !!str 123\n",
+    "plain: multi\n  line plain\n",
+    "quoted: \"multi\n  line\"\n",
+    "# comment\nname: x\n",
+    "name: x\n  bad: indent\n",
+    "- not\n- a mapping\n",
+    "",
+    "name: \"unterminated\n",
+    "key: value\nkey: duplicate\n",
+    "unicode: café — über\n",
+    "a: b\u2028c\n",
+    "a: b\u2029c\n",
+    "a: b\x85c\n",
+    "tab:\tvalue\n",
+    "1.5: float key\n",
+    "true: bool key\n",
+    "nested:\n  deeper:\n    deepest: value\n  back: x\n",
+    "list:\n  - - nested\n",
+    "list:\n  - |\n    block item\n",
+    "list:\n  -\n  - x\n",
+    "windows: value\r\nother: x\r\n",
+    "description: >\n  trailing spaces   \n  next\n",
+    "description: |\n  trailing spaces   \n  next\n",
+    "description: |\n  no final break",
+    "description: |+\n  kept at end\n\n",
+    "description: |+\n  kept at end\n  ",
+    "description: >\n  folded\n  at end",
+    "description: >-\n  a\n\n  b\n\n",
+]
+
+
+def typed_equal(a, b) -> bool:
+    """Equality that also requires matching types (so True != 1)."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(typed_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(typed_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def reference(text: str):
+    try:
+        return safe_load_reference(text), None
+    except yaml.YAMLError as exc:
+        return None, str(exc)
+
+
+def documents():
+    for label, text in enumerate(CASES):
+        yield f"case {label}", text
+    for root in ROOTS:
+        base = os.path.join(REPO_ROOT, root)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            if "SKILL.md" not in filenames:
+                continue
+            path = os.path.join(dirpath, "SKILL.md")
+            with open(path, "rb") as f:
+                match = FRONTMATTER_RE.match(decode_text(f.read()))
+            if match:
+                yield os.path.relpath(path, REPO_ROOT).replace("\\", "/"), match.group(1)
+
+
+def check(label: str, text: str, stats: dict, verbose: bool) -> list[str]:
+    problems = []
+    ref, ref_error = reference(text)
+
+    fast = parse_simple_yaml(text)
+    if fast is not None:
+        stats["fast"] += 1
+        if ref_error is not None:
+            problems.append(f"fast path accepted a document safe_load rejects: {ref_error}")
+        elif not typed_equal(fast, ref):
+            problems.append(f"fast path differs:\n      fast: {fast!r}\n       ref: {ref!r}")
+    elif verbose:
+        print(f"  full loader: {label}")
+
+    if hasattr(yaml, "CSafeLoader") and ref_error is None:
+        try:
+            c_value = yaml.load(text, Loader=yaml.CSafeLoader)
+        except yaml.YAMLError as exc:
+            problems.append(f"CSafeLoader rejects a document safe_load accepts: {exc}")
+        else:
+            if not typed_equal(c_value, ref):
+                problems.append(f"CSafeLoader differs:\n      c: {c_value!r}\n    ref: {ref!r}")
+
+    value, error = load_yaml(text)
+    if error != ref_error or not typed_equal(value, ref):
+        problems.append(f"load_yaml differs: {(value, error)!r} vs {(ref, ref_error)!r}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="list documents that needed the full loader")
+    args = parser.parse_args()
+
+    stats = {"fast": 0}
+    total = 0
+    failures = 0
+    skill_texts = []
+    for label, text in documents():
+        total += 1
+        if not label.startswith("case "):
+            skill_texts.append(text)
+        problems = check(label, text, stats, args.verbose)
+        if problems:
+            failures += 1
+            print(f"MISMATCH {label}:")
+            for problem in problems:
+                print(f"    {problem}")
+
+    started = time.perf_counter()
+    for text in skill_texts:
+        safe_load_reference(text)
+    ref_time = time.perf_counter() - started
+    started = time.perf_counter()
+    for text in skill_texts:
+        load_yaml(text)
+    new_time = time.perf_counter() - started
+
+    print(f"Checked {total} documents ({len(CASES)} edge cases, {len(skill_texts)} SKILL.md): "
+          f"{stats['fast']} via fast path, {failures} mismatches")
+    print(f"SKILL.md frontmatter: safe_load {ref_time * 1e3:.1f} ms, "
+          f"load_yaml {new_time * 1e3:.1f} ms "
+          f"(libyaml {'available' if hasattr(yaml, 'CSafeLoader') else 'not available'})")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
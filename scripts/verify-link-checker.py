@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Check skilllib/links.py against a local stub HTTP server.
+
+Starts a threaded HTTP/1.1 server on 127.0.0.1 and checks that:
+
+  - statuses, redirects, redirect loops, HEAD-rejecting servers, timeouts,
+    dropped connections and refused connections are reported correctly;
+  - a URL cited many times is requested once;
+  - no more requests than the per-host limit reach the server at once, and
+    kept-alive connections are reused;
+  - a warm cache makes no requests, and stale ETag/Last-Modified results are
+    renewed by a 304;
+  - a warm pass over --urls distinct URLs is fast.
+
+Uses a temporary cache directory. Exits 1 on any failed check.
+
+Usage:
+    python scripts/verify-link-checker.py [--urls 2000] [--verbose]
+"""
+
+import argparse
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from skilllib.links import DEFAULT_TTL, LinkCache, LinkChecker, check_links
+
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 02 Feb 2026 00:00:00 GMT"
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.peers: set = set()
+        self.active = 0
+        self.max_active = 0
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def reset(self) -> None:
+        with self.lock:
+            self.hits.clear()
+            self.peers.clear()
+            self.max_active = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.respond(head=True)
+
+    def do_GET(self) -> None:
+        self.respond(head=False)
+
+    def respond(self, head: bool) -> None:
+        server = self.server
+        path, _, _ = self.path.partition("?")
+        with server.lock:
+            server.hits[path] += 1
+            server.peers.add(self.client_address)
+        self.route(path, head)
+
+    def work(self, seconds: float) -> None:
+        """Sleep, counting how many requests are being worked on at once."""
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(seconds)
+        with server.lock:
+            server.active -= 1
+
+    def send(self, status: int, headers: dict | None = None, body: bytes = b"", head: bool = True):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def route(self, path: str, head: bool) -> None:
+        if path in ("/ok", "/page"):
+            self.send(200, body=b"ok", head=head)
+        elif path == "/missing":
+            self.send(404, head=head)
+        elif path == "/moved":
+            self.send(301, {"Location": "/ok"}, head=head)
+        elif path == "/loop":
+            self.send(302, {"Location": "/loop"}, head=head)
+        elif path == "/no-head":
+            self.send(405 if head else 200, body=b"ok", head=head)
+        elif path == "/slow":
+            time.sleep(1.0)
+            self.send(200, head=head)
+        elif path == "/busy":
+            self.work(0.05)
+            self.send(200, head=head)
+        elif path == "/drop":
+            self.close_connection = True
+        elif path == "/etag":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.send(304, {"ETag": ETAG}, head=True)
+            else:
+                self.send(200, {"ETag": ETAG}, body=b"ok", head=head)
+        elif path == "/modified":
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                self.send(304, head=True)
+            else:
+                self.send(200, {"Last-Modified": LAST_MODIFIED}, body=b"ok", head=head)
+        else:
+            self.send(404, head=head)
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Checks:
+    def __init__(self, verbose: bool):
+        self.verbose = verbose
+        self.failed = 0
+
+    def expect(self, name: str, condition: bool, detail="") -> None:
+        if not condition:
+            self.failed += 1
+            print(f"FAIL {name}: {detail}")
+        elif self.verbose:
+            print(f"ok   {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the link checker against a stub server.")
+    parser.add_argument("--urls", type=int, default=2000,
+                        help="distinct URLs for the warm-cache timing (default: 2000)")
+    parser.add_argument("--verbose", action="store_true", help="list passing checks too")
+    args = parser.parse_args()
+
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = server.base
+    checks = Checks(args.verbose)
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = LinkCache(cache_dir, enabled=True)
+        checker = LinkChecker(per_host=4, timeout=0.5)
+        urls = [f"{base}/ok", f"{base}/missing", f"{base}/moved", f"{base}/loop",
+                f"{base}/no-head", f"{base}/slow", f"{base}/drop", f"{base}/etag",
+                f"{base}/modified", f"http://127.0.0.1:{closed_port()}/", "ftp://example.com/x"]
+        results = check_links(urls + [f"{base}/ok"] * 5, cache, checker, now=now)
+        r = {url.rsplit("/", 1)[-1] or "refused": results[url] for url in urls}
+        checks.expect("ok", r["ok"].ok and r["ok"].status == 200, r["ok"])
+        checks.expect("dedup", server.hits["/ok"] == 2, f"/ok hit {server.hits['/ok']} times")
+        checks.expect("404", r["missing"].broken and r["missing"].status == 404, r["missing"])
+        checks.expect("redirect", r["moved"].ok and r["moved"].final_url == f"{base}/ok", r["moved"])
+        checks.expect("loop", r["loop"].error is not None and "redirects" in r["loop"].error, r["loop"])
+        checks.expect("head fallback", r["no-head"].ok and checker.stats["get_fallbacks"] == 1,
+                      r["no-head"])
+        checks.expect("timeout", r["slow"].error is not None and "timed out" in r["slow"].error,
+                      r["slow"])
+        checks.expect("dropped", r["drop"].error is not None, r["drop"])
+        checks.expect("refused", r["refused"].error is not None, r["refused"])
+        checks.expect("scheme", r["x"].error is not None and "unsupported" in r["x"].error, r["x"])
+        checks.expect("etag stored", r["etag"].etag == ETAG, r["etag"])
+        cache.save()
+
+        # Warm: everything is fresh (failures included), so nothing is requested.
+        server.reset()
+        cache = LinkCache(cache_dir, enabled=True)
+        warm = LinkChecker(timeout=0.5)
+        results = check_links(urls, cache, warm, now=now + 60)
+        checks.expect("warm cache", warm.stats["requests"] == 0 and sum(server.hits.values()) == 0,
+                      dict(warm.stats))
+        checks.expect("warm source", all(res.source == "cache" for res in results.values()))
+
+        # Stale: validators turn into conditional requests answered with 304.
+        server.reset()
+        stale = LinkChecker(timeout=0.5)
+        results = check_links([f"{base}/etag", f"{base}/modified"], cache, stale,
+                              now=now + DEFAULT_TTL + 1)
+        checks.expect("revalidated", stale.stats["revalidated"] == 2
+                      and all(res.source == "revalidated" and res.ok for res in results.values()),
+                      results)
+        checks.expect("renewed", cache.get(f"{base}/etag").checked == now + DEFAULT_TTL + 1)
+
+        # Per-host limit and keep-alive reuse.
+        server.reset()
+        busy = LinkChecker(per_host=4, timeout=5)
+        check_links([f"{base}/busy?{i}" for i in range(40)], LinkCache(cache_dir, enabled=False),
+                    busy, now=now)
+        checks.expect("per-host limit", server.max_active <= 4,
+                      f"{server.max_active} requests in flight")
+        checks.expect("keep-alive", busy.stats["connections"] <= 8 and len(server.peers) <= 8,
+                      f"{busy.stats['connections']} connections for 40 requests")
+
+        # Scale: a cold pass (all on one host) and then a warm one.
+        server.reset()
+        many = [f"{base}/page?{i}" for i in range(args.urls)]
+        cache = LinkCache(cache_dir, enabled=True)
+        cold = LinkChecker(per_host=8, timeout=10)
+        started = time.perf_counter()
+        results = check_links(many, cache, cold, now=now)
+        cold_s = time.perf_counter() - started
+        checks.expect("cold pass", all(res.ok for res in results.values()),
+                      sum(not res.ok for res in results.values()))
+        cache.save()
+        started = time.perf_counter()
+        cache = LinkCache(cache_dir, enabled=True)
+        check_links(many, cache, LinkChecker(), now=now + 60)
+        warm_s = time.perf_counter() - started
+        checks.expect("warm pass", warm_s < 2.0, f"{warm_s:.2f}s")
+        print(f"{args.urls} URLs: cold {cold_s:.2f}s ({cold.stats['requests']} requests over "
+              f"{cold.stats['connections']} connections), warm {warm_s * 1000:.0f} ms")
+
+    server.shutdown()
+    print(f"{'FAILED' if checks.failed else 'OK'}: {checks.failed} failed checks")
+    sys.exit(1 if checks.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Check the rule indexes written by generate-rules.py against the rules/ files.
+
+For every skill with a rules/_index.json, checks that:
+
+  - each entry's SHA-256 matches its file, and the byte range it names is the
+    rule body (``## <title>`` to the end of the file);
+  - entries are sorted by impact and file name, ``impacts`` ranges match, and
+    every rule file in the directory is listed;
+
+then packs the indexes into a global index in a temporary directory and checks
+that every impact/prefix lookup through skilllib.rules_index.RulesIndex returns
+what a walk over the rules/ directories would, timing both.
+
+Usage:
+    python scripts/verify-rules-index.py [--verbose]
+
+Run generate-rules.py first. Exits 1 on any failed check.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from skilllib.index import SKILLS_ROOT
+from skilllib.manifest import sha256_bytes
+from skilllib.rules_index import (INDEX_FILENAME, IMPACT_ORDER, RulesIndex, impact_rank,
+                                  pack_rules_index)
+
+
+class Checks:
+    def __init__(self, verbose: bool):
+        self.verbose = verbose
+        self.failed = 0
+
+    def expect(self, name: str, condition: bool, detail="") -> None:
+        if not condition:
+            self.failed += 1
+            print(f"FAIL {name}: {detail}")
+        elif self.verbose:
+            print(f"ok   {name}")
+
+
+def read_indexes() -> list[tuple[str, dict]]:
+    """(rules/ directory, parsed _index.json) for every skill that has one."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(SKILLS_ROOT):
+        dirnames.sort()
+        if os.path.basename(dirpath) == "rules" and INDEX_FILENAME in filenames:
+            with open(os.path.join(dirpath, INDEX_FILENAME), "r", encoding="utf-8") as f:
+                found.append((dirpath, json.load(f)))
+    return found
+
+
+def walk_rules(impact: str, prefix: str) -> list[str]:
+    """What an agent without the index does: list and read every rule file."""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(os.path.join(SKILLS_ROOT, prefix)):
+        dirnames.sort()
+        if os.path.basename(dirpath) != "rules":
+            continue
+        for name in filenames:
+            if name.startswith("_") or not name.endswith(".md"):
+                continue
+            with open(os.path.join(dirpath, name), "r", encoding="utf-8") as f:
+                if f"\nimpact: {impact}\n" in f.read(1024):
+                    rel = os.path.relpath(os.path.join(dirpath, name), SKILLS_ROOT)
+                    paths.append(rel.replace("\\", "/"))
+    return sorted(paths)
+
+
+def check_skill(checks: Checks, rules_dir: str, index: dict) -> None:
+    skill = index["skill"]
+    entries = index["rules"]
+    for e in entries:
+        with open(os.path.join(rules_dir, e["file"]), "rb") as f:
+            data = f.read()
+        body = data[e["offset"]:e["offset"] + e["length"]]
+        checks.expect(f"{skill}/{e['file']} hash", sha256_bytes(data) == e["sha256"])
+        checks.expect(f"{skill}/{e['file']} range",
+                      body.startswith(f"## {e['title']}\n".encode("utf-8"))
+                      and e["offset"] + e["length"] == len(data),
+                      body[:40])
+    order = [(impact_rank(e["impact"]), e["file"]) for e in entries]
+    checks.expect(f"{skill} sorted", order == sorted(order))
+    ranges = {level: [i for i, e in enumerate(entries) if e["impact"] == level]
+              for level in index["impacts"]}
+    checks.expect(f"{skill} impacts", all(
+        rows == list(range(*index["impacts"][level])) for level, rows in ranges.items())
+        and sum(map(len, ranges.values())) == len(entries), index["impacts"])
+    listed = {e["file"] for e in entries}
+    on_disk = {name for name in os.listdir(rules_dir)
+               if name.endswith(".md") and not name.startswith("_")}
+    checks.expect(f"{skill} complete", listed == on_disk, sorted(listed ^ on_disk))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check rules/_index.json and the global index.")
+    parser.add_argument("--verbose", action="store_true", help="list passing checks too")
+    args = parser.parse_args()
+    checks = Checks(args.verbose)
+
+    indexes = read_indexes()
+    if not indexes:
+        print("ERROR: no rules/_index.json found; run generate-rules.py first", file=sys.stderr)
+        sys.exit(1)
+    for rules_dir, index in indexes:
+        check_skill(checks, rules_dir, index)
+
+    prefixes = [""] + sorted({ix["skill"].split("/", 1)[0] for _, ix in indexes})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rules-index.bin")
+        with open(path, "wb") as f:
+            f.write(pack_rules_index([ix for _, ix in indexes]))
+        walk_s = lookup_s = 0.0
+        with RulesIndex(path) as rules_index:
+            checks.expect("rule count", len(rules_index) == sum(len(ix["rules"]) for _, ix in indexes))
+            for impact in IMPACT_ORDER:
+                for prefix in prefixes:
+                    started = time.perf_counter()
+                    expected = walk_rules(impact, prefix)
+                    walk_s += time.perf_counter() - started
+                    started = time.perf_counter()
+                    found = [ref.path for ref in rules_index.rules(impact, prefix)]
+                    lookup_s += time.perf_counter() - started
+                    checks.expect(f"lookup {impact} {prefix or '*'}", found == expected,
+                                  f"{len(found)} found, {len(expected)} expected")
+        lookups = len(IMPACT_ORDER) * len(prefixes)
+        print(f"{len(indexes)} skills, {len(rules_index)} rules, {lookups} impact/prefix lookups: "
+              f"directory walk {walk_s * 1000:.0f} ms, global index {lookup_s * 1000:.1f} ms")
+
+    print(f"{'FAILED' if checks.failed else 'OK'}: {checks.failed} failed checks")
+    sys.exit(1 if checks.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Watch SKILL.md files and revalidate and regenerate only what an edit affects.
+
+Runs until interrupted. Each burst of SKILL.md changes (debounced) is mapped to
+the skills it affects, the edited skills plus the parents whose README lists
+them (skilllib/changes.py), and for those skills only:
+  - validate-skills.py checks run (skills/ and .agents/skills/);
+  - generate-rules.py rebuilds rules/ through its rule manifest;
+  - generate-skill-files.py rewrites metadata.json, AGENTS.md and README.md
+    through its incremental manifest.
+
+Everything runs in this process with the parse cache and manifests kept warm
+between edits, so a typical save is handled in well under 100 ms. The
+manifests are the ones the generators use, so a later full run picks up where
+watch mode left off.
+
+Usage:
+    python scripts/watch-skills.py [--poll] [--interval SECONDS] [--debounce MS]
+                                   [--profile [N]] [--trace trace.json]
+
+inotify is used on Linux; --poll (or a platform without inotify) rescans the
+skill roots every --interval seconds instead.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+from skilllib import profile, save_cache
+from skilllib.changes import affected_skill_dirs
+from skilllib.index import SKILLS_ROOT, discover_skill_dirs
+from skilllib.manifest import BuildManifest
+from skilllib.output import WriteStats
+from skilllib.parsing import REPO_ROOT
+from skilllib.tree import SkillTree
+from skilllib.watch import next_batch, open_watcher
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOTS = ("skills", ".agents/skills")
+
+
+def load_script(filename: str):
+    """Import a hyphenated script from scripts/ as a module."""
+    name = filename[:-3].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class WatchSession:
+    """Generator state that outlives a single edit."""
+
+    def __init__(self):
+        self.validator = load_script("validate-skills.py")
+        self.rules = load_script("generate-rules.py")
+        self.files = load_script("generate-skill-files.py")
+        self.rules_manifest = BuildManifest(self.rules.MANIFEST_NAME,
+                                            {"version": self.rules.MANIFEST_VERSION})
+        self.files_manifest = BuildManifest(self.files.MANIFEST_NAME,
+                                            {"version": self.files.MANIFEST_VERSION,
+                                             "date": self.files.DATE})
+        self.skill_dirs = discover_skill_dirs(SKILLS_ROOT)
+        self.known = {self.key(sd) for sd in self.skill_dirs}
+        self.dirty = False
+
+    @staticmethod
+    def key(skill_dir: str) -> str:
+        return os.path.relpath(skill_dir, SKILLS_ROOT).replace("\\", "/")
+
+    def refresh_layout(self, changed: set[str]) -> None:
+        """Rediscover skills if a SKILL.md under skills/ appeared or vanished."""
+        for path in changed:
+            if not path.startswith("skills/") or os.path.basename(path) != "SKILL.md":
+                continue
+            key = self.key(os.path.join(REPO_ROOT, os.path.dirname(path)))
+            if os.path.isfile(os.path.join(REPO_ROOT, path)) != (key in self.known):
+                break
+        else:
+            return
+        self.skill_dirs = discover_skill_dirs(SKILLS_ROOT)
+        self.known = {self.key(sd) for sd in self.skill_dirs}
+        self.rules_manifest.prune(self.known)
+        self.files_manifest.prune(self.known)
+        self.dirty = True
+
+    def validate(self, affected: list[str]) -> int:
+        """Check each affected skill; print failures like validate-skills.py."""
+        reporter = self.validator.TextReporter()
+        failed = 0
+        for rel in affected:
+            target = Path(rel)
+            with profile.skill(rel):
+                errors = self.validator.validate_skill_dir(target)
+            reporter.result(target, errors)
+            failed += bool(errors)
+        return failed
+
+    def regenerate(self, affected: list[str]) -> tuple[int, WriteStats]:
+        """Rebuild rules/ and then the other generated files (the README counts
+        rules) for the affected skills under skills/."""
+        keys = [self.key(os.path.join(REPO_ROOT, rel)) for rel in affected
+                if rel.startswith("skills/") or rel == "skills"]
+        disk = WriteStats()
+        for key in keys:
+            skill_dir = os.path.join(SKILLS_ROOT, key)
+            result = self.rules.process_skill(skill_dir, False, None, self.rules_manifest.get(key))
+            profile.get_profiler().merge(result["profile"])
+            disk.add(result["disk"])
+            if result["manifest_entry"] is not None:
+                self.rules_manifest.set(key, **result["manifest_entry"])
+            else:
+                self.rules_manifest.entries.pop(key, None)
+
+        # A fresh tree per batch: nodes parse lazily, through the warm cache.
+        tree = SkillTree(self.skill_dirs, SKILLS_ROOT)
+        regenerated = 0
+        for key in keys:
+            with profile.skill(key):
+                result = self.files.process_skill(tree.nodes[key], False, self.files_manifest)
+            if "disk" in result:
+                regenerated += 1
+                disk.add(result["disk"])
+        self.dirty = self.dirty or bool(keys)
+        return regenerated, disk
+
+    def flush(self) -> None:
+        """Persist the manifests; done after reporting, off the per-edit path."""
+        if self.dirty:
+            with profile.span("save"):
+                self.rules_manifest.save()
+                self.files_manifest.save()
+            self.dirty = False
+
+    def handle(self, changed: set[str]) -> str:
+        started = time.perf_counter()
+        self.refresh_layout(changed)
+        affected = affected_skill_dirs(changed, ROOTS)
+        with profile.span("validate"):
+            failed = self.validate(affected)
+        with profile.span("generate"):
+            regenerated, disk = self.regenerate(affected)
+        elapsed = (time.perf_counter() - started) * 1e3
+        return (f"{len(changed)} changed, {len(affected)} affected: {failed} failed validation, "
+                f"{regenerated} regenerated ({disk.summary()}) in {elapsed:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Revalidate and regenerate affected skills whenever a SKILL.md changes.")
+    parser.add_argument("--poll", action="store_true",
+                        help="poll for changes instead of using inotify")
+    parser.add_argument("--interval", type=float, default=0.5, metavar="SECONDS",
+                        help="polling interval (default: 0.5)")
+    parser.add_argument("--debounce", type=float, default=50, metavar="MS",
+                        help="wait this long after the last change before acting (default: 50)")
+    profile.add_arguments(parser)
+    args = parser.parse_args()
+    profile.configure(args)
+
+    if not os.path.isdir(SKILLS_ROOT):
+        print(f"ERROR: skills root not found: {SKILLS_ROOT}", file=sys.stderr)
+        sys.exit(1)
+    # validate-skills.py checks paths relative to the repository root.
+    os.chdir(REPO_ROOT)
+
+    session = WatchSession()
+    roots = [root for root in ROOTS if os.path.isdir(os.path.join(REPO_ROOT, root))]
+    watcher = open_watcher(roots, REPO_ROOT, args.poll, args.interval)
+    print(f"Watching {len(session.skill_dirs)} skills under {', '.join(roots)} "
+          f"({watcher.kind}); Ctrl-C to stop", flush=True)
+    try:
+        while True:
+            changed = next_batch(watcher, args.debounce / 1000)
+            summary = session.handle(changed)
+            print(f"[{time.strftime('%H:%M:%S')}] {summary}", flush=True)
+            session.flush()
+    except KeyboardInterrupt:
+        print("")
+    finally:
+        watcher.close()
+        session.flush()
+        save_cache()
+    profile.finish(args)
+
+
+if __name__ == "__main__":
+    main()